@@ -1,7 +1,7 @@
 {
     "name": "Import Bandec Bank Statement",
     "category": "Banking addons",
-    "version": "16.0.1.0.0",
+    "version": "16.0.1.1.0",
     "license": "AGPL-3",
     "author": "Javier",
     "depends": ["account_statement_import_file"],
@@ -43,52 +43,46 @@ class AccountStatementImport(models.TransientModel):
         
         return result_text
 
-    def get_partner(self, value):
+    def _get_partner_maps(self, values):
+        # Precargamos de una vez los partners por nombre, por titular de cuenta
+        # y por número de cuenta de todas las líneas del extracto
         Partner = self.env['res.partner']
         BankAcc = self.env['res.partner.bank']
+        names = {value['name'] for value in values if value.get('name')}
+        acc_numbers = {value['acc_number'] for value in values
+                       if not value.get('name') and value.get('acc_number')}
+        partner_maps = {'name': {}, 'acc_holder_name': {}, 'acc_number': {}}
+
+        if names:
+            for partner in Partner.search([('name', 'in', list(names))]):
+                partner_maps['name'].setdefault(partner.name, partner.id)
+            holder_names = names - set(partner_maps['name'])
+            if holder_names:
+                for bank_account in BankAcc.search([('acc_holder_name', 'in', list(holder_names))]):
+                    partner_maps['acc_holder_name'].setdefault(
+                        bank_account.acc_holder_name, bank_account.partner_id.id)
+
+        if acc_numbers:
+            for bank_account in BankAcc.search([('acc_number', 'in', list(acc_numbers))]):
+                partner_maps['acc_number'].setdefault(bank_account.acc_number, bank_account.partner_id.id)
+
+        return partner_maps
+
+    def get_partner(self, value, partner_maps=None):
+        if partner_maps is None:
+            partner_maps = self._get_partner_maps([value])
         name = value.get('name')
         acc_number = value.get('acc_number')
-        partner = None
-    
-        if acc_number:
-            # Buscar por número de cuenta bancaria
-            bank_account = BankAcc.search([('acc_number', '=', acc_number)], limit=1)
-            if bank_account:
-                partner = bank_account.partner_id
-    
-        if not partner and name:
-            # Buscar por nombre
-            partners = Partner.search([('name', '=', name)])
-            if partners:
-                partner = partners[0]  # Tomar el primer registro si hay varios
-            else:
-                # Buscar por titular de cuenta bancaria
-                bank_account = BankAcc.search([('acc_holder_name', '=', name)], limit=1)
-                partner = bank_account.partner_id
-    
-        # Devolver el ID si se encuentra un partner, o False si no
-        return partner.id if partner else False
-
-    
-    def get_partner(self, value):
-        Partner = self.env['res.partner']
-        BankAcc = self.env['res.partner.bank']
-        name = value.get('name')
-        acc_number = value.get('acc_number')
-        partner = None
-        
+        partner_id = False
+
         if name:
-            #looking by name        
-            partner = Partner.search([('name', '=', name)])
-            
-            #looking by acc titular
-            if not partner:
-                partner = BankAcc.search([('acc_holder_name', '=', name)], limit=1).partner_id
+            #looking by name, then by acc titular
+            partner_id = partner_maps['name'].get(name) or partner_maps['acc_holder_name'].get(name)
 
         elif acc_number:
-            partner = BankAcc.search([('acc_number', '=', acc_number)], limit=1).partner_id
-            
-        return partner.id if partner else False
+            partner_id = partner_maps['acc_number'].get(acc_number)
+
+        return partner_id or False
 
     @api.model
     def _prepare_bandec_transaction_line(self, transaction):
@@ -126,6 +120,7 @@ class AccountStatementImport(models.TransientModel):
 
             statements = []
             transactions = []
+            search_params_list = []
             balance_start = None
             balance_end_real = None
             currency_code = 'CUP'  # Asumimos CUP como la moneda por defecto
@@ -178,15 +173,21 @@ class AccountStatementImport(models.TransientModel):
                         'payment_ref': observ,
                         'date': date_obj,
                         'amount': amount * signo,
-                        'partner_id': self.get_partner(search_params),
+                        'partner_id': False,
                         'ref': ref,
                         'narration': f"{partner_name} / {notes} / {acc_num}" if partner_name else notes,
                         'unique_import_id': f"{date_str}-{observ}.....",
                     })
+                    search_params_list.append(search_params)
 
             if not transactions:
                 raise UserError(_("El archivo de BANDEC no contiene transacciones válidas."))
 
+            # Buscamos los partners de todas las transacciones a la vez
+            partner_maps = self._get_partner_maps(search_params_list)
+            for transaction, search_params in zip(transactions, search_params_list):
+                transaction['partner_id'] = self.get_partner(search_params, partner_maps)
+
             # Modificar el nombre del estado de cuenta para incluir el nombre del archivo importado
             statement_name = f"Estado de Cuenta BANDEC - {transactions[0]['date']}"
             
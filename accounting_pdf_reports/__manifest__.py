@@ -2,7 +2,7 @@
 
 {
     'name': 'Odoo 16 Accounting Financial Reports',
-    'version': '16.0.2.0.4',
+    'version': '16.0.2.0.7',
     'category': 'Invoicing Management',
     'description': 'Accounting Reports For Odoo 16, Accounting Financial Reports, '
                    'Odoo 16 Financial Reports',
@@ -12,6 +12,60 @@ class ReportAgedPartnerBalance(models.AbstractModel):
     _name = 'report.accounting_pdf_reports.report_agedpartnerbalance'
     _description = 'Aged Partner Balance Report'
 
+    def _get_aged_move_lines(self, account_type, partner_ids, date_from, move_state, periods, company_ids):
+        ''' returns the journal items of ``partner_ids`` (and the ones without partner) aged as of
+            ``date_from`` in a single query. The residual amount of each item as of that date is its
+            balance corrected by the partial reconciliations done until then, and its period is 6 when
+            it is not due yet or i + 1 when it falls in ``periods[str(i)]``. Settled items are left out.
+            :return: a list of dictionaries with the keys id, partner_id, currency_id (of the company),
+                     balance, amount (the residual amount) and period'''
+        params = {
+            'account_type': tuple(account_type),
+            'partner_ids': tuple(partner_ids),
+            'date_from': date_from,
+            'move_state': tuple(move_state),
+            'company_ids': tuple(company_ids),
+        }
+        period_clause = 'WHEN COALESCE(l.date_maturity, l.date) >= %(date_from)s THEN 6'
+        for i in range(5)[::-1]:
+            if periods[str(i)]['start']:
+                params['start_%s' % i] = periods[str(i)]['start']
+                period_clause += '\n                         WHEN COALESCE(l.date_maturity, l.date) >= %%(start_%s)s THEN %s' % (i, i + 1)
+            else:
+                period_clause += '\n                         ELSE %s' % (i + 1)
+        query = '''
+            SELECT aged.id, aged.partner_id, aged.currency_id, aged.balance, aged.amount, aged.period
+            FROM (
+                SELECT l.id, l.partner_id, company.currency_id, l.balance,
+                       l.balance + matched_debit.amount - matched_credit.amount AS amount,
+                       CASE ''' + period_clause + '''
+                       END AS period
+                FROM account_move_line AS l
+                JOIN account_move am ON (l.move_id = am.id)
+                JOIN account_account ON (l.account_id = account_account.id)
+                JOIN res_company company ON (l.company_id = company.id)
+                CROSS JOIN LATERAL (
+                    SELECT COALESCE(SUM(part.amount), 0) AS amount
+                    FROM account_partial_reconcile part
+                    WHERE part.credit_move_id = l.id AND part.max_date <= %(date_from)s
+                ) matched_debit
+                CROSS JOIN LATERAL (
+                    SELECT COALESCE(SUM(part.amount), 0) AS amount
+                    FROM account_partial_reconcile part
+                    WHERE part.debit_move_id = l.id AND part.max_date <= %(date_from)s
+                ) matched_credit
+                WHERE (am.state IN %(move_state)s)
+                    AND (account_account.account_type IN %(account_type)s)
+                    AND ((l.partner_id IN %(partner_ids)s) OR (l.partner_id IS NULL))
+                    AND (l.date <= %(date_from)s)
+                    AND l.company_id IN %(company_ids)s
+                    AND l.balance != 0
+            ) AS aged
+            WHERE aged.amount != 0
+            ORDER BY aged.period = 6 DESC, aged.period, aged.id'''
+        self.env.cr.execute(query, params)
+        return self.env.cr.dictfetchall()
+
     def _get_partner_move_lines(self, account_type, partner_ids,
                                 date_from, target_move, period_length):
         # This method can receive the context key 'include_nullified_amount' {Boolean}
@@ -53,17 +107,7 @@ class ReportAgedPartnerBalance(models.AbstractModel):
 
         if target_move == 'posted':
             move_state = ['posted']
-        arg_list = (tuple(move_state), tuple(account_type))
-
-        reconciliation_clause = '(l.reconciled IS FALSE)'
-        cr.execute('SELECT debit_move_id, credit_move_id FROM account_partial_reconcile where max_date > %s', (date_from,))
-        reconciled_after_date = []
-        for row in cr.fetchall():
-            reconciled_after_date += [row[0], row[1]]
-        if reconciled_after_date:
-            reconciliation_clause = '(l.reconciled IS FALSE OR l.id IN %s)'
-            arg_list += (tuple(reconciled_after_date),)
-        arg_list += (date_from, tuple(company_ids))
+        arg_list = (tuple(move_state), tuple(account_type), date_from, date_from, tuple(company_ids))
         query = '''
             SELECT DISTINCT l.partner_id, UPPER(res_partner.name)
             FROM account_move_line AS l left join res_partner on l.partner_id = res_partner.id, account_account, account_move am
@@ -71,7 +115,9 @@ class ReportAgedPartnerBalance(models.AbstractModel):
                 AND (l.move_id = am.id)
                 AND (am.state IN %s)
                 AND (account_account.account_type IN %s)
-                AND ''' + reconciliation_clause + '''
+                AND (l.reconciled IS FALSE OR EXISTS (
+                    SELECT 1 FROM account_partial_reconcile part
+                    WHERE part.max_date > %s AND l.id IN (part.debit_move_id, part.credit_move_id)))
                 AND (l.date <= %s)
                 AND l.company_id IN %s
             ORDER BY UPPER(res_partner.name)'''
@@ -90,106 +136,34 @@ class ReportAgedPartnerBalance(models.AbstractModel):
 
         # This dictionary will store the not due amount of all partners
         undue_amounts = {}
-        query = '''SELECT l.id
-                FROM account_move_line AS l, account_account, account_move am
-                WHERE (l.account_id = account_account.id) AND (l.move_id = am.id)
-                    AND (am.state IN %s)
-                    AND (account_account.account_type IN %s)
-                    AND (COALESCE(l.date_maturity,l.date) >= %s)\
-                    AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                AND (l.date <= %s)
-                AND l.company_id IN %s'''
-        cr.execute(query, (tuple(move_state), tuple(account_type), date_from,
-                           tuple(partner_ids), date_from, tuple(company_ids)))
-        aml_ids = cr.fetchall()
-        aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-        for line in self.env['account.move.line'].browse(aml_ids):
-            partner_id = line.partner_id.id or False
-            if partner_id not in undue_amounts:
-                undue_amounts[partner_id] = 0.0
-            line_amount = line.company_id.currency_id._convert(line.balance,
-                                                               user_currency,
-                                                               company, date)
-            if user_currency.is_zero(line_amount):
+        # history[i] = {'<partner_id>': <partner_debit-credit>} for the period i
+        history = [{} for i in range(5)]
+        aged_lines = self._get_aged_move_lines(account_type, partner_ids, date_from, move_state,
+                                               periods, company_ids)
+        move_lines = self.env['account.move.line'].browse([aged_line['id'] for aged_line in aged_lines])
+        rates = {}
+        for aged_line, line in zip(aged_lines, move_lines):
+            partner_id = aged_line['partner_id'] or False
+            line_currency = self.env['res.currency'].browse(aged_line['currency_id'])
+            if line_currency not in rates:
+                rates[line_currency] = line_currency._get_conversion_rate(line_currency, user_currency,
+                                                                          company, date)
+            if user_currency.is_zero(aged_line['balance'] * rates[line_currency]):
                 continue
-            for partial_line in line.matched_debit_ids:
-                if partial_line.max_date <= date_from:
-                    line_currency = partial_line.company_id.currency_id
-                    line_amount += line_currency._convert(partial_line.amount,
-                                                          user_currency,
-                                                          company, date)
-            for partial_line in line.matched_credit_ids:
-                if partial_line.max_date <= date_from:
-                    line_currency = partial_line.company_id.currency_id
-                    line_amount -= line_currency._convert(partial_line.amount,
-                                                          user_currency,
-                                                          company, date)
+            line_amount = user_currency.round(aged_line['amount'] * rates[line_currency])
+            if aged_line['period'] == 6:
+                partners_amount = undue_amounts
+            else:
+                partners_amount = history[aged_line['period'] - 1]
+            partners_amount.setdefault(partner_id, 0.0)
             if not self.env.user.company_id.currency_id.is_zero(line_amount):
-                undue_amounts[partner_id] += line_amount
-                lines[partner_id].append({
+                partners_amount[partner_id] += line_amount
+                lines.setdefault(partner_id, []).append({
                     'line': line,
                     'amount': line_amount,
-                    'period': 6,
+                    'period': aged_line['period'],
                 })
 
-        # Use one query per period and store results in history (a list variable)
-        # Each history will contain: history[1] = {'<partner_id>': <partner_debit-credit>}
-        history = []
-        for i in range(5):
-            args_list = (tuple(move_state), tuple(account_type), tuple(partner_ids),)
-            dates_query = '(COALESCE(l.date_maturity,l.date)'
-
-            if periods[str(i)]['start'] and periods[str(i)]['stop']:
-                dates_query += ' BETWEEN %s AND %s)'
-                args_list += (periods[str(i)]['start'], periods[str(i)]['stop'])
-            elif periods[str(i)]['start']:
-                dates_query += ' >= %s)'
-                args_list += (periods[str(i)]['start'],)
-            else:
-                dates_query += ' <= %s)'
-                args_list += (periods[str(i)]['stop'],)
-            args_list += (date_from, tuple(company_ids))
-
-            query = '''SELECT l.id
-                    FROM account_move_line AS l, account_account, account_move am
-                    WHERE (l.account_id = account_account.id) AND (l.move_id = am.id)
-                        AND (am.state IN %s)
-                        AND (account_account.account_type IN %s)
-                        AND ((l.partner_id IN %s) OR (l.partner_id IS NULL))
-                        AND ''' + dates_query + '''
-                    AND (l.date <= %s)
-                    AND l.company_id IN %s'''
-            cr.execute(query, args_list)
-            partners_amount = {}
-            aml_ids = cr.fetchall()
-            aml_ids = aml_ids and [x[0] for x in aml_ids] or []
-            for line in self.env['account.move.line'].browse(aml_ids):
-                partner_id = line.partner_id.id or False
-                if partner_id not in partners_amount:
-                    partners_amount[partner_id] = 0.0
-                line_currency_id = line.company_id.currency_id
-                line_amount = line_currency_id._convert(line.balance, user_currency, company, date)
-                if user_currency.is_zero(line_amount):
-                    continue
-                for partial_line in line.matched_debit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_currency_id = partial_line.company_id.currency_id
-                        line_amount += line_currency_id._convert(
-                            partial_line.amount, user_currency, company, date)
-                for partial_line in line.matched_credit_ids:
-                    if partial_line.max_date <= date_from:
-                        line_currency_id = partial_line.company_id.currency_id
-                        line_amount -= line_currency_id._convert(
-                            partial_line.amount, user_currency, company, date)
-                if not self.env.user.company_id.currency_id.is_zero(line_amount):
-                    partners_amount[partner_id] += line_amount
-                    lines[partner_id].append({
-                        'line': line,
-                        'amount': line_amount,
-                        'period': i + 1,
-                        })
-            history.append(partners_amount)
-
         for partner in partners:
             if partner['partner_id'] is None:
                 partner['partner_id'] = False
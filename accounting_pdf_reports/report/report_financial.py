@@ -39,6 +39,76 @@ class ReportFinancial(models.AbstractModel):
                 res[row['id']] = row
         return res
 
+    def _get_report_tree(self, reports):
+        ''' returns all the financial reports the balance of ``reports`` depends on:
+            the children of the 'sum' records and the linked 'account_report' ones'''
+        tree = reports.browse()
+        todo = reports
+        while todo:
+            tree |= todo
+            todo = (todo.filtered(lambda r: r.type == 'sum').children_ids |
+                    todo.filtered(lambda r: r.type == 'account_report').account_report_id) - tree
+        return tree
+
+    def _get_report_accounts(self, reports):
+        ''' returns a dictionary with key=the ID of an 'accounts' or 'account_type' record
+            and value=the accounts it sums. The accounts of all the account types are
+            searched at once.'''
+        res = {}
+        type_reports = reports.filtered(lambda r: r.type == 'account_type')
+        for report in reports.filtered(lambda r: r.type == 'accounts'):
+            res[report.id] = report.account_ids
+        account_types = type_reports.account_type_ids.mapped('type')
+        if account_types:
+            accounts = self.env['account.account'].search([('account_type', 'in', account_types)])
+            for report in type_reports:
+                report_types = report.account_type_ids.mapped('type')
+                res[report.id] = accounts.filtered(lambda a: a.account_type in report_types)
+        else:
+            for report in type_reports:
+                res[report.id] = self.env['account.account']
+        return res
+
+    def _compute_report_balances(self, reports, contexts):
+        ''' returns, for each context of ``contexts``, the result of _compute_report_balance
+            for ``reports`` computed in that context. The accounts of the whole report tree
+            are collected first, so that each period costs a single grouped query on the
+            journal items, the values being then rolled up the tree in memory.'''
+        fields = ['credit', 'debit', 'balance']
+        report_accounts = self._get_report_accounts(self._get_report_tree(reports))
+        accounts = self.env['account.account'].union(*report_accounts.values())
+        results = []
+        for context in contexts:
+            balances = self.with_context(context)._compute_account_balance(accounts)
+            res = {}
+
+            def _roll_up(report):
+                if report.id in res:
+                    return res[report.id]
+                res[report.id] = dict((fn, 0.0) for fn in fields)
+                if report.id in report_accounts:
+                    # it's the sum of the linked accounts or of the leaf accounts with such an account type
+                    res[report.id]['account'] = dict(
+                        (account_id, dict(balances[account_id])) for account_id in report_accounts[report.id].ids)
+                    values = list(res[report.id]['account'].values())
+                elif report.type == 'account_report' and report.account_report_id:
+                    # it's the amount of the linked report
+                    values = [_roll_up(report.account_report_id)]
+                elif report.type == 'sum':
+                    # it's the sum of the children of this account.report
+                    values = [_roll_up(child) for child in report.children_ids]
+                else:
+                    values = []
+                for value in values:
+                    for field in fields:
+                        res[report.id][field] += value.get(field)
+                return res[report.id]
+
+            for report in reports:
+                _roll_up(report)
+            results.append(res)
+        return results
+
     def _compute_report_balance(self, reports):
         '''returns a dictionary with key=the ID of a record and value=the credit, debit and balance amount
            computed for this record. If the record is of type :
@@ -46,51 +116,20 @@ class ReportFinancial(models.AbstractModel):
                'account_type' : it's the sum of leaf accoutns with such an account_type
                'account_report' : it's the amount of the related report
                'sum' : it's the sum of the children of this record (aka a 'view' record)'''
-        res = {}
-        fields = ['credit', 'debit', 'balance']
-        for report in reports:
-            if report.id in res:
-                continue
-            res[report.id] = dict((fn, 0.0) for fn in fields)
-            if report.type == 'accounts':
-                # it's the sum of the linked accounts
-                res[report.id]['account'] = self._compute_account_balance(report.account_ids)
-                for value in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == 'account_type':
-                # it's the sum the leaf accounts with such an account type
-                accounts = self.env['account.account'].search(
-                    [('account_type', 'in', report.account_type_ids.mapped('type'))])
-
-                res[report.id]['account'] = self._compute_account_balance(accounts)
-                for value in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == 'account_report' and report.account_report_id:
-                # it's the amount of the linked report
-                res2 = self._compute_report_balance(report.account_report_id)
-                for key, value in res2.items():
-                    for field in fields:
-                        res[report.id][field] += value[field]
-            elif report.type == 'sum':
-                # it's the sum of the children of this account.report
-                res2 = self._compute_report_balance(report.children_ids)
-                for key, value in res2.items():
-                    for field in fields:
-                        res[report.id][field] += value[field]
-        return res
+        return self._compute_report_balances(reports, [self.env.context])[0]
 
     def get_account_lines(self, data):
         lines = []
         account_report = self.env['account.financial.report'].search(
             [('id', '=', data['account_report_id'][0])])
         child_reports = account_report._get_children_by_order()
-        res = self.with_context(data.get('used_context'))._compute_report_balance(child_reports)
+        contexts = [data.get('used_context')]
+        if data['enable_filter']:
+            contexts.append(data.get('comparison_context'))
+        balances = self._compute_report_balances(child_reports, contexts)
+        res = balances[0]
         if data['enable_filter']:
-            comparison_res = self.with_context(
-                data.get('comparison_context'))._compute_report_balance(
-                child_reports)
+            comparison_res = balances[1]
             for report_id, value in comparison_res.items():
                 res[report_id]['comp_bal'] = value['balance']
                 report_acc = res[report_id].get('account')
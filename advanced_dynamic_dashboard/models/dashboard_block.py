@@ -19,11 +19,21 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
+import logging
+import time
 from ast import literal_eval
 from datetime import datetime
 from odoo import fields, models, api
 from odoo.osv import expression
 
+_logger = logging.getLogger(__name__)
+
+# Seconds during which the values of a block are kept
+BLOCK_CACHE_TIMEOUT = 300
+# Cached values: {(block id, start date, end date, company ids, lang):
+# (expiration time, values)}
+_BLOCK_CACHE = {}
+
 
 class DashboardBlock(models.Model):
     """Class is used to create charts and tiles in dashboard"""
@@ -91,28 +101,10 @@ class DashboardBlock(models.Model):
     def get_dashboard_vals(self, action_id, start_date=None, end_date=None):
         """Fetch block values from js and create chart"""
         block_id = []
-        for rec in self.env['dashboard.block'].sudo().search(
-                [('client_action_id', '=', int(action_id))]):
-            if rec.filter is False:
-                rec.filter = "[]"
-
-            filter_list = literal_eval(rec.filter)
-
-            # Remove existing date filters if they exist
-            filter_list = [filter_item for filter_item in filter_list if not (
-                    isinstance(filter_item, tuple) and filter_item[0] == 'create_date')]
-
-            if start_date and start_date != 'null':
-                start_date_obj = datetime.strptime(start_date, '%Y-%m-%d')
-                filter_list.append(
-                    ('create_date', '>=', start_date_obj.strftime('%Y-%m-%d')))
-
-            if end_date and end_date != 'null':
-                end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-                filter_list.append(
-                    ('create_date', '<=', end_date_obj.strftime('%Y-%m-%d')))
-
-            rec.filter = repr(filter_list)
+        blocks = self.env['dashboard.block'].sudo().search(
+            [('client_action_id', '=', int(action_id))])
+        values = blocks._evaluate_blocks(start_date, end_date)
+        for rec in blocks:
             vals = {'id': rec.id, 'name': rec.name, 'type': rec.type,
                     'graph_type': rec.graph_type, 'icon': rec.fa_icon,
                     'color': 'background-color: %s;' % rec.tile_color if rec.tile_color else '#1f6abb;',
@@ -122,46 +114,132 @@ class DashboardBlock(models.Model):
                     'x_pos': rec.x_pos, 'y_pos': rec.y_pos,
                     'height': rec.height,
                     'width': rec.width}
-            domain = []
-            if rec.filter:
-                domain = expression.AND([literal_eval(rec.filter)])
-            if rec.model_name:
-                if rec.type == 'graph' and rec.model_id == rec.group_by_id.model_id:
-                    m= self._cr.execute(self.env[rec.model_name].get_query(domain,
-                                                                        rec.operation,
-                                                                        rec.measured_field_id,
-                                                                        group_by=rec.group_by_id))
-                    records = self._cr.dictfetchall()
-                    x_axis = []
-                    for record in records:
-                        if record.get('name') and type(
-                                record.get('name')) == dict:
-                            x_axis.append(record.get('name')[self._context.get(
-                                'lang') or 'en_US'])
-                        else:
-                            x_axis.append(record.get(rec.group_by_id.name))
-                    y_axis = []
-                    for record in records:
-                        y_axis.append(record.get('value'))
-                    vals.update({'x_axis': x_axis, 'y_axis': y_axis})
-                else:
-                    self._cr.execute(self.env[rec.model_name].get_query(domain,
-                                                                        rec.operation,
-                                                                        rec.measured_field_id))
-                    records = self._cr.dictfetchall()
-                    magnitude = 0
-                    total = records[0].get('value')
-                    while abs(total) >= 1000:
-                        magnitude += 1
-                        total /= 1000.0
-                    # add more suffixes if you need them
-                    val = '%.2f%s' % (
-                        total, ['', 'K', 'M', 'G', 'T', 'P'][magnitude])
-                    records[0]['value'] = val
-                    vals.update(records[0])
+            vals.update(values.get(rec.id, {}))
             block_id.append(vals)
         return block_id
 
+    def _get_block_domain(self, start_date=None, end_date=None):
+        """Domain of the block restricted to the selected dates. The stored
+        filter is left untouched."""
+        self.ensure_one()
+        filter_list = literal_eval(self.filter or "[]")
+        # Remove existing date filters if they exist
+        filter_list = [filter_item for filter_item in filter_list if not (
+                isinstance(filter_item, tuple) and filter_item[0] == 'create_date')]
+        if start_date and start_date != 'null':
+            start_date_obj = datetime.strptime(start_date, '%Y-%m-%d')
+            filter_list.append(
+                ('create_date', '>=', start_date_obj.strftime('%Y-%m-%d')))
+        if end_date and end_date != 'null':
+            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
+            filter_list.append(
+                ('create_date', '<=', end_date_obj.strftime('%Y-%m-%d')))
+        return expression.AND([filter_list])
+
+    def _evaluate_blocks(self, start_date=None, end_date=None):
+        """Computes the values of the blocks. The values are cached per
+        block, dates, companies and language for BLOCK_CACHE_TIMEOUT
+        seconds; the other blocks are merged by model, domain and group by
+        so that each merge needs a single query.
+
+        :return: {block id: values}, the values holding the evaluation time
+         of the block in milliseconds and whether it came from the cache
+        """
+        cache_context = (start_date if start_date != 'null' else None,
+                         end_date if end_date != 'null' else None,
+                         tuple(self.env.companies.ids),
+                         self._context.get('lang') or 'en_US')
+        values = {}
+        groups = {}
+        now = time.monotonic()
+        for rec in self:
+            if not rec.model_name or not rec.operation or \
+                    not rec.measured_field_id:
+                continue
+            cached = _BLOCK_CACHE.get((rec.id,) + cache_context)
+            if cached and cached[0] > now:
+                values[rec.id] = dict(cached[1], eval_time=0.0, cached=True)
+                continue
+            domain = rec._get_block_domain(start_date, end_date)
+            group_by = rec.group_by_id if rec.type == 'graph' and \
+                rec.model_id == rec.group_by_id.model_id else False
+            group_key = (rec.model_name, repr(domain),
+                         group_by.id if group_by else False)
+            groups.setdefault(group_key, [domain, group_by, []])[2].append(
+                rec.id)
+        for group_key, (domain, group_by, block_ids) in groups.items():
+            blocks = self.browse(block_ids)
+            start = time.perf_counter()
+            group_values = blocks._evaluate_block_group(
+                group_key[0], domain, group_by)
+            eval_time = (time.perf_counter() - start) * 1000
+            expiration = time.monotonic() + BLOCK_CACHE_TIMEOUT
+            for rec in blocks:
+                _BLOCK_CACHE[(rec.id,) + cache_context] = (
+                    expiration, group_values[rec.id])
+                values[rec.id] = dict(group_values[rec.id],
+                                      eval_time=round(eval_time, 2),
+                                      cached=False)
+        for block_id, block_values in values.items():
+            _logger.debug("Dashboard block %s evaluated in %.2f ms%s",
+                          block_id, block_values['eval_time'],
+                          ' (cached)' if block_values['cached'] else '')
+        return values
+
+    def _evaluate_block_group(self, model_name, domain, group_by):
+        """Computes with a single query the values of blocks sharing the
+        same model, domain and group by.
+
+        :return: {block id: values}
+        """
+        query, params = self.env[model_name].get_grouped_query(
+            domain, [('value_%s' % rec.id, rec.operation,
+                      rec.measured_field_id) for rec in self],
+            group_by=group_by)
+        self._cr.execute(query, params)
+        records = self._cr.dictfetchall()
+        values = {}
+        for rec in self:
+            value_key = 'value_%s' % rec.id
+            if group_by:
+                x_axis = []
+                for record in records:
+                    if record.get('name') and type(
+                            record.get('name')) == dict:
+                        x_axis.append(record.get('name')[self._context.get(
+                            'lang') or 'en_US'])
+                    else:
+                        x_axis.append(record.get(group_by.name))
+                y_axis = [record.get(value_key) for record in records]
+                values[rec.id] = {'x_axis': x_axis, 'y_axis': y_axis}
+            else:
+                magnitude = 0
+                total = records[0].get(value_key)
+                while abs(total) >= 1000:
+                    magnitude += 1
+                    total /= 1000.0
+                # add more suffixes if you need them
+                val = '%.2f%s' % (
+                    total, ['', 'K', 'M', 'G', 'T', 'P'][magnitude])
+                values[rec.id] = {'value': val}
+        return values
+
+    def write(self, vals):
+        """Drops the cached values of the blocks"""
+        self._clear_block_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        """Drops the cached values of the blocks"""
+        self._clear_block_cache()
+        return super().unlink()
+
+    def _clear_block_cache(self):
+        """Drops the cached values of the blocks"""
+        for key in list(_BLOCK_CACHE):
+            if key[0] in self.ids:
+                _BLOCK_CACHE.pop(key, None)
+
     @api.onchange('model_id')
     def _onchange_model_id(self):
         self.group_by_id = self.measured_field_id = self.filter = self.operation = ''
@@ -22,6 +22,27 @@
 from odoo import models
 
 
+def get_group_by_clause(self, group_by):
+    """Dashboard block group by: selected column, join and group by clause"""
+    if group_by.ttype == 'many2one':
+        relation_model = group_by.relation.replace('.', '_')
+        join = 'INNER JOIN %s ON "%s".id = "%s".%s' % (
+            relation_model, relation_model, self._table, group_by.name)
+        if relation_model == 'product_product':
+            additional_join = ' INNER JOIN product_template ON product_template.id = product_product.product_tmpl_id'
+            join = join + additional_join
+            relation_model = 'product_template'
+        rec_name = self.env[group_by.relation]._rec_name_fallback()
+        data = ',"%s".%s AS name' % (relation_model, rec_name)
+        group_by_str = ' Group by "%s".%s' % (relation_model, rec_name)
+    else:
+        join = ''
+        data = ',"%s".%s' % (self._table, group_by.name)
+        group_by_str = ' Group by "%s".%s' % (
+            self._table, str(group_by.name))
+    return data, join, group_by_str
+
+
 def get_query(self, args, operation, field, group_by=False,
               apply_ir_rules=False):
     """Dashboard block Query Creation"""
@@ -34,22 +55,9 @@ def get_query(self, args, operation, field, group_by=False,
         join = ''
         group_by_str = ''
         if group_by:
-            if group_by.ttype == 'many2one':
-                relation_model = group_by.relation.replace('.', '_')
-                join = 'INNER JOIN %s ON "%s".id = "%s".%s' % (
-                    relation_model, relation_model, self._table, group_by.name)
-                if relation_model == 'product_product':
-                    additional_join = ' INNER JOIN product_template ON product_template.id = product_product.product_tmpl_id'
-                    join = join + additional_join
-                    relation_model = 'product_template'
-                rec_name = self.env[group_by.relation]._rec_name_fallback()
-                data = data + ',"%s".%s AS name' % (
-                    relation_model, rec_name)
-                group_by_str = ' Group by "%s".%s' % (relation_model, rec_name)
-            else:
-                data = data + ',"%s".%s' % (self._table, group_by.name)
-                group_by_str = ' Group by "%s".%s' % (
-                    self._table, str(group_by.name))
+            group_by_data, join, group_by_str = self.get_group_by_clause(
+                group_by)
+            data = data + group_by_data
     else:
         data = '"%s".id' % self._table
     from_clause, where_clause, where_clause_params = query.get_sql()
@@ -68,4 +76,32 @@ def get_query(self, args, operation, field, group_by=False,
     return exact_query
 
 
+def get_grouped_query(self, args, aggregates, group_by=False,
+                      apply_ir_rules=False):
+    """Dashboard blocks Query Creation: computes the aggregates of several
+    blocks sharing the same domain and group by in a single query.
+
+    :param aggregates: list of (alias, operation, field) of the blocks
+    :return: the query and its parameters
+    """
+    query = self._where_calc(args)
+    if apply_ir_rules:
+        self._apply_ir_rules(query, 'read')
+    data = ','.join(
+        'COALESCE(%s("%s".%s),0) AS %s' % (
+            operation.upper(), self._table, field.name, alias)
+        for alias, operation, field in aggregates)
+    join = ''
+    group_by_str = ''
+    if group_by:
+        group_by_data, join, group_by_str = self.get_group_by_clause(group_by)
+        data = data + group_by_data
+    from_clause, where_clause, where_clause_params = query.get_sql()
+    where_str = where_clause and (" WHERE %s" % where_clause) or ''
+    query_str = 'SELECT %s FROM ' % data + from_clause + ' ' + join + where_str + group_by_str
+    return query_str, where_clause_params
+
+
+models.BaseModel.get_group_by_clause = get_group_by_clause
 models.BaseModel.get_query = get_query
+models.BaseModel.get_grouped_query = get_grouped_query
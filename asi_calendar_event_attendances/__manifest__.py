@@ -3,7 +3,7 @@
 
 {
     'name': 'Participación en Eventos de Calendario',
-    'version': '3.0',
+    'version': '3.1',
     'category': 'Productivity/Calendar',
     'summary': 'Permite a los asistentes marcar su participación en eventos',
     'description': """
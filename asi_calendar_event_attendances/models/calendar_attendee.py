@@ -4,6 +4,7 @@
 from odoo import api, fields, models, _
 from datetime import date
 from odoo import SUPERUSER_ID
+from odoo.tools.sql import column_exists, create_column, create_index
 import logging
 from dateutil.relativedelta import relativedelta
 
@@ -45,6 +46,40 @@ class Attendee(models.Model):
         index=True,
         help='Año del evento')
 
+    # Copia de los campos del evento usados por el filtro de "Mi Asistencia a
+    # Eventos", para no tener que unir calendar_event en cada búsqueda
+    event_start = fields.Datetime(
+        string='Inicio del evento',
+        related='event_id.start',
+        store=True,
+        index=True)
+
+    event_active = fields.Boolean(
+        string='Evento activo',
+        related='event_id.active',
+        store=True,
+        index=True)
+
+    def _auto_init(self):
+        """Crea y rellena con SQL las columnas copiadas del evento, para no
+        calcularlas registro a registro al instalar el módulo"""
+        if not column_exists(self.env.cr, 'calendar_attendee', 'event_start'):
+            create_column(self.env.cr, 'calendar_attendee', 'event_start', 'timestamp')
+            create_column(self.env.cr, 'calendar_attendee', 'event_active', 'boolean')
+            self.env.cr.execute("""
+                UPDATE calendar_attendee attendee
+                   SET event_start = event.start,
+                       event_active = event.active
+                  FROM calendar_event event
+                 WHERE event.id = attendee.event_id
+            """)
+        return super()._auto_init()
+
+    def init(self):
+        super().init()
+        create_index(self.env.cr, 'calendar_attendee_partner_event_start_index',
+                     self._table, ['partner_id', 'event_start'])
+
     @api.depends('event_id.start')
     def _compute_event_date(self):
         """Calcula la fecha, mes y año del evento"""
@@ -54,7 +89,6 @@ class Attendee(models.Model):
                 attendee.event_date = event_date
                 attendee.event_month = event_date.month
                 attendee.event_year = event_date.year
-                _logger.info(f"Asistente {attendee.id} - Evento {attendee.event_id.name}: fecha={event_date}, mes={event_date.month}, año={event_date.year}")
             else:
                 attendee.event_date = False
                 attendee.event_month = False
@@ -153,9 +187,3 @@ class Attendee(models.Model):
         today = fields.Date.today()
         last_month_date = today - relativedelta(months=1)
         return last_month_date.month, last_month_date.year
-        
-    @api.model
-    def search(self, args, offset=0, limit=None, order=None, count=False):
-        """Extiende el método de búsqueda para aplicar filtros personalizados"""
-        # Ya no necesitamos este método, ya que estamos usando dominios directos
-        return super(Attendee, self).search(args, offset, limit, order, count)
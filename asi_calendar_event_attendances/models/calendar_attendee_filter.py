@@ -32,15 +32,17 @@ class AttendeeFilter(models.Model):
             first_day_of_month = date(today.year, today.month, 1)
         
             # Crear el dominio para filtrar eventos del mes actual o con participación
-            # Incluimos todos los eventos del día actual, independientemente de la hora
+            # Incluimos todos los eventos del día actual, independientemente de la hora.
+            # Se usan los campos del evento copiados en el asistente, que están
+            # indexados y evitan unir calendar_event en cada búsqueda
             month_domain = [
                 '&',
-                ('event_id.active', '=', True),
+                ('event_active', '=', True),
                 '|',
                 ('has_participated', '=', True),
                 '&',
-                ('event_id.start', '>=', first_day_of_month.strftime('%Y-%m-%d 00:00:00')),
-                ('event_id.start', '<=', today.strftime('%Y-%m-%d 23:59:59'))
+                ('event_start', '>=', first_day_of_month.strftime('%Y-%m-%d 00:00:00')),
+                ('event_start', '<=', today.strftime('%Y-%m-%d 23:59:59'))
             ]
         
             # Añadir este dominio a los argumentos existentes
@@ -75,7 +75,6 @@ class Meeting(models.Model):
                 event.event_date = event_date
                 event.event_month = event_date.month
                 event.event_year = event_date.year
-                _logger.info(f"Evento {event.id} - {event.name}: fecha={event_date}, mes={event_date.month}, año={event_date.year}")
             else:
                 event.event_date = False
                 event.event_month = False
@@ -116,12 +115,30 @@ class Meeting(models.Model):
             else:
                 event.event_date_display = False
 
-    @api.depends('attendee_ids.has_participated')
+    @api.depends('attendee_ids', 'attendee_ids.has_participated')
     def _compute_participation_count(self):
-        """Calcula el número y porcentaje de asistentes"""
+        """Calcula el número y porcentaje de asistentes. Para los eventos ya
+        guardados se cuentan en una sola consulta agrupada"""
+        counts = {}
+        saved_events = self.filtered('id')
+        if saved_events:
+            groups = self.env['calendar.attendee']._read_group(
+                [('event_id', 'in', saved_events.ids)],
+                ['event_id', 'has_participated'],
+                ['event_id', 'has_participated'],
+                lazy=False)
+            for group in groups:
+                total, participants = counts.get(group['event_id'][0], (0, 0))
+                total += group['__count']
+                if group['has_participated']:
+                    participants += group['__count']
+                counts[group['event_id'][0]] = (total, participants)
         for event in self:
-            total_attendees = len(event.attendee_ids)
-            participants = len(event.attendee_ids.filtered('has_participated'))
+            if event.id:
+                total_attendees, participants = counts.get(event.id, (0, 0))
+            else:
+                total_attendees = len(event.attendee_ids)
+                participants = len(event.attendee_ids.filtered('has_participated'))
             
             event.participation_count = participants
             event.participation_percentage = (participants / total_attendees) if total_attendees else 0
@@ -157,9 +174,3 @@ class Meeting(models.Model):
         today = fields.Date.today()
         last_month_date = today - relativedelta(months=1)
         return last_month_date.month, last_month_date.year
-        
-    @api.model
-    def search(self, args, offset=0, limit=None, order=None, count=False):
-        """Extiende el método de búsqueda para aplicar filtros personalizados"""
-        # Ya no necesitamos este método, ya que estamos usando dominios directos
-        return super(Meeting, self).search(args, offset, limit, order, count)
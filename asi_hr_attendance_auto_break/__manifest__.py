@@ -2,7 +2,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 {
     'name': 'ASI HR Attendance Lunch Break',
-    'version': '1.8',
+    'version': '1.9',
     'category': 'Human Resources/Attendances',
     'summary': 'Automaticamente gestiona los registros de asistencia durante la hora del almuerzo',
     'description': """
@@ -3,8 +3,9 @@
 
 import pytz
 import logging
-from datetime import datetime
-from odoo import models, fields, api, _
+import time
+from collections import defaultdict
+from odoo import models, api, _
 
 _logger = logging.getLogger(__name__)
 
@@ -16,56 +17,6 @@ class HrAttendanceLunch(models.Model):
     """
     _inherit = 'hr.attendance'
 
-    def _get_datetime_with_user_tz(self, dt, employee_tz):
-        """
-        Convierte una fecha y hora UTC a la zona horaria del empleado.
-        
-        Converts a UTC datetime to the employee's timezone.
-        
-        :param dt: Datetime en UTC / UTC datetime
-        :param employee_tz: Zona horaria del empleado / Employee timezone
-        :return: Datetime en la zona horaria del empleado / Datetime in employee's timezone
-        """
-        try:
-            tz = pytz.timezone(employee_tz or 'UTC')
-            dt_utc = pytz.utc.localize(dt)
-            return dt_utc.astimezone(tz)
-        except Exception as e:
-            _logger.error("Error al convertir datetime a zona horaria del empleado: %s", e)
-            # En caso de error, devolver el datetime original
-            # In case of error, return the original datetime
-            return dt
-    
-    def _get_utc_datetime_from_user_tz(self, dt, hour, minute, employee_tz):
-        """
-        Crea un datetime UTC a partir de una fecha, hora y zona horaria del empleado.
-        
-        Creates a UTC datetime from a date, time and employee timezone.
-        
-        :param dt: Fecha base / Base date
-        :param hour: Hora / Hour
-        :param minute: Minuto / Minute
-        :param employee_tz: Zona horaria del empleado / Employee timezone
-        :return: Datetime en UTC / UTC datetime
-        """
-        try:
-            tz = pytz.timezone(employee_tz or 'UTC')
-            # Crear datetime en zona horaria del empleado
-            # Create datetime in employee timezone
-            local_dt = datetime(dt.year, dt.month, dt.day, hour, minute, 0)
-            _logger.debug("Datetime local creado: %s en zona horaria %s", local_dt, employee_tz)
-            local_dt = tz.localize(local_dt)
-            # Convertir a UTC
-            # Convert to UTC
-            utc_dt = local_dt.astimezone(pytz.utc).replace(tzinfo=None)
-            _logger.debug("Datetime convertido a UTC: %s", utc_dt)
-            return utc_dt
-        except Exception as e:
-            _logger.error("Error al crear datetime UTC desde zona horaria del empleado: %s", e)
-            # En caso de error, crear un datetime UTC directamente
-            # In case of error, create a UTC datetime directly
-            return datetime(dt.year, dt.month, dt.day, hour, minute, 0)
-    
     @api.model
     def process_lunch_break_attendances_manual(self):
         """
@@ -73,7 +24,7 @@ class HrAttendanceLunch(models.Model):
         
         Method to manually execute lunch break processing from the user interface.
         """
-        _logger.error("EJECUTANDO MANUALMENTE EL PROCESO DE PAUSA DE ALMUERZO")
+        _logger.info("Ejecutando manualmente el proceso de pausa de almuerzo")
         result = self._process_lunch_break_attendances()
         return {
             'type': 'ir.actions.client',
@@ -85,7 +36,65 @@ class HrAttendanceLunch(models.Model):
                 'type': 'success' if result else 'danger',
             }
         }
-    
+
+    @api.model
+    def _get_lunch_break_timezone_groups(self):
+        """
+        Agrupa las zonas horarias de los empleados con asistencias abiertas.
+        Las zonas horarias vacías o desconocidas se tratan como UTC.
+
+        Groups the time zones of the employees with open attendances. Empty or
+        unknown time zones are handled as UTC.
+
+        :return: {zona horaria / time zone: [valores de tz / tz values]}
+        """
+        self.env.cr.execute("""
+            SELECT DISTINCT COALESCE(resource.tz, '')
+              FROM hr_attendance attendance
+              JOIN hr_employee employee ON employee.id = attendance.employee_id
+              JOIN resource_resource resource ON resource.id = employee.resource_id
+             WHERE attendance.check_out IS NULL
+        """)
+        groups = {}
+        for tz_name, in self.env.cr.fetchall():
+            tz = tz_name if tz_name in pytz.all_timezones_set else 'UTC'
+            groups.setdefault(tz, []).append(tz_name)
+        return groups
+
+    @api.model
+    def _get_lunch_break_candidates(self, tz, tz_names):
+        """
+        Selecciona con una sola consulta las asistencias abiertas de una zona
+        horaria cuyo check-in local está entre las 7:00 y las 11:30, con las
+        horas UTC de salida (12:00) y de nueva entrada (12:30) de ese día.
+
+        Selects with a single query the open attendances of a time zone whose
+        local check-in is between 7:00 and 11:30, with the UTC check-out
+        (12:00) and new check-in (12:30) times of that day.
+
+        :return: lista de (id, employee_id, check_out, check_in)
+        """
+        self.env.cr.execute("""
+            WITH attendance AS (
+                SELECT attendance.id, attendance.employee_id,
+                       attendance.check_in AT TIME ZONE 'UTC' AT TIME ZONE %(tz)s
+                           AS local_check_in
+                  FROM hr_attendance attendance
+                  JOIN hr_employee employee ON employee.id = attendance.employee_id
+                  JOIN resource_resource resource ON resource.id = employee.resource_id
+                 WHERE attendance.check_out IS NULL
+                   AND COALESCE(resource.tz, '') IN %(tz_names)s
+            )
+            SELECT id, employee_id,
+                   (local_check_in::date + TIME '12:00') AT TIME ZONE %(tz)s AT TIME ZONE 'UTC',
+                   (local_check_in::date + TIME '12:30') AT TIME ZONE %(tz)s AT TIME ZONE 'UTC'
+              FROM attendance
+             WHERE local_check_in::time >= TIME '07:00'
+               AND local_check_in::time < TIME '11:31'
+          ORDER BY id
+        """, {'tz': tz, 'tz_names': tuple(tz_names)})
+        return self.env.cr.fetchall()
+
     @api.model
     def _process_lunch_break_attendances(self):
         """
@@ -94,156 +103,53 @@ class HrAttendanceLunch(models.Model):
         - Busca usuarios con registros abiertos desde la mañana (7:00-11:30 AM)
         - Les cierra ese registro con hora de salida a las 12:00 PM
         - Les crea un nuevo registro con entrada a las 12:30 PM
-        
+        Las asistencias se seleccionan por zona horaria en SQL, se cierran
+        agrupadas por hora de salida y se crean en una sola operación.
+
         Process attendance records for lunch break:
         - Runs at 3:00 PM and 5:00 PM (server time)
         - Finds users with open records from the morning (7:00-11:30 AM)
         - Closes those records with a check-out time at 12:00 PM
         - Creates a new record with check-in time at 12:30 PM
+        The attendances are selected per time zone in SQL, closed grouped by
+        check-out time and created in a single operation.
         """
-        # Forzar un log de error para asegurarnos de que se está ejecutando el método
-        # Force an error log to make sure the method is being executed
-        _logger.error("=== INICIANDO PROCESO DE PAUSA DE ALMUERZO AUTOMÁTICA ===")
-        _logger.error("Hora del servidor: %s", fields.Datetime.now())
-        
+        start = time.perf_counter()
+        self.flush_model(['employee_id', 'check_in', 'check_out'])
+        self.env['resource.resource'].flush_model(['tz'])
         try:
-            today = fields.Date.today()
-            now = fields.Datetime.now()
-            
-            _logger.error("Fecha actual: %s", today)
-            
-            # Buscar todos los registros de asistencia abiertos (sin check_out)
-            # Find all open attendance records (without check_out)
-            domain = [
-                ('check_out', '=', False),
-            ]
-            
-            _logger.error("Dominio de búsqueda: %s", domain)
-            
-            open_attendances = self.search(domain)
-            
-            _logger.error("Registros de asistencia abiertos encontrados: %d", len(open_attendances))
-            
-            if not open_attendances:
-                _logger.error("No se encontraron registros de asistencia abiertos para procesar.")
-                return True
-            
-            # Forzar un log con los IDs de los registros encontrados
-            # Force a log with the IDs of the records found
-            attendance_ids = open_attendances.mapped('id')
-            _logger.error("IDs de registros abiertos: %s", attendance_ids)
-            
-            employees_to_process = []
-            
-            # Verificar cada registro abierto
-            # Check each open record
-            for attendance in open_attendances:
-                employee = attendance.employee_id
-                employee_tz = employee.tz or 'UTC'
-                
-                _logger.error("Procesando empleado: %s (ID: %s), Zona horaria: %s, Check-in: %s", 
-                             employee.name, employee.id, employee_tz, attendance.check_in)
-                
-                try:
-                    # Convertir check_in a la zona horaria del empleado
-                    # Convert check_in to employee timezone
-                    check_in_employee_tz = self._get_datetime_with_user_tz(attendance.check_in, employee_tz)
-                    
-                    _logger.error("Check-in (Zona horaria del empleado): %s", check_in_employee_tz)
-                    _logger.error("Hora: %d, Minuto: %d", check_in_employee_tz.hour, check_in_employee_tz.minute)
-                    
-                    # Verificar si el check_in está entre 7:00 AM y 11:30 AM
-                    # Check if check_in is between 7:00 AM and 11:30 AM
-                    if (7 <= check_in_employee_tz.hour < 11 or 
-                        (check_in_employee_tz.hour == 11 and check_in_employee_tz.minute <= 30)):
-                        _logger.error("Empleado %s califica para procesamiento de pausa de almuerzo", employee.name)
-                        employees_to_process.append({
-                            'employee': employee,
-                            'attendance': attendance,
-                            'employee_tz': employee_tz
-                        })
-                    else:
-                        _logger.error("Empleado %s no califica: check-in fuera del rango 7:00-11:30 AM (hora: %d, minuto: %d)", 
-                                     employee.name, check_in_employee_tz.hour, check_in_employee_tz.minute)
-                except Exception as e:
-                    _logger.error("Error al procesar el empleado %s: %s", employee.name, e)
-                    import traceback
-                    _logger.error(traceback.format_exc())
-            
-            _logger.error("Empleados que califican para procesamiento: %d", len(employees_to_process))
-            
-            # Procesar los empleados identificados
-            # Process the identified employees
-            for emp_data in employees_to_process:
-                try:
-                    employee = emp_data['employee']
-                    attendance = emp_data['attendance']
-                    employee_tz = emp_data['employee_tz']
-                    
-                    _logger.error("Procesando pausa de almuerzo para: %s", employee.name)
-                    
-                    # Obtener la fecha del check_in
-                    # Get the date of check_in
-                    check_in_date = self._get_datetime_with_user_tz(attendance.check_in, employee_tz).date()
-                    
-                    _logger.error("Fecha del check-in: %s", check_in_date)
-                    
-                    # Crear la hora de salida a las 12:00 PM en la zona horaria del empleado
-                    # Create the checkout time at 12:00 PM in the employee's timezone
-                    checkout_time_utc = self._get_utc_datetime_from_user_tz(check_in_date, 12, 0, employee_tz)
-                    
-                    _logger.error("Hora de salida (UTC): %s", checkout_time_utc)
-                    
-                    # Crear la hora de entrada a las 12:30 PM en la zona horaria del empleado
-                    # Create the checkin time at 12:30 PM in the employee's timezone
-                    checkin_time_utc = self._get_utc_datetime_from_user_tz(check_in_date, 12, 30, employee_tz)
-                    
-                    _logger.error("Hora de entrada (UTC): %s", checkin_time_utc)
-                    
-                    # Actualizar el registro de asistencia existente con la hora de salida
-                    # Update the existing attendance record with the checkout time
-                    _logger.error("Actualizando registro de asistencia ID: %s con check-out: %s", 
-                                attendance.id, checkout_time_utc)
-                    
-                    attendance.write({
-                        'check_out': checkout_time_utc
-                    })
-                    
-                    # Crear un nuevo registro de asistencia con la hora de entrada
-                    # Create a new attendance record with the checkin time
-                    _logger.error("Creando nuevo registro de asistencia para empleado ID: %s con check-in: %s", 
-                                employee.id, checkin_time_utc)
-                    
-                    new_attendance = self.create({
-                        'employee_id': employee.id,
-                        'check_in': checkin_time_utc
-                    })
-                    
-                    _logger.error("Nuevo registro de asistencia creado con ID: %s", new_attendance.id)
-                    
+            with self.env.cr.savepoint():
+                timezone_groups = self._get_lunch_break_timezone_groups()
+                candidates = []
+                for tz, tz_names in timezone_groups.items():
+                    candidates += self._get_lunch_break_candidates(tz, tz_names)
+                if candidates:
+                    # Cerrar las asistencias agrupadas por hora de salida
+                    # Close the attendances grouped by check-out time
+                    by_check_out = defaultdict(list)
+                    for attendance_id, employee_id, check_out, check_in in candidates:
+                        by_check_out[check_out].append(attendance_id)
+                    for check_out, attendance_ids in by_check_out.items():
+                        self.browse(attendance_ids).write({'check_out': check_out})
+                    # Crear las nuevas asistencias
+                    # Create the new attendances
+                    self.create([{
+                        'employee_id': employee_id,
+                        'check_in': check_in,
+                    } for attendance_id, employee_id, check_out, check_in in candidates])
                     # Registrar mensaje en el log para fines de auditoría
                     # Log message for audit purposes
-                    self.env['mail.message'].create({
+                    body = _('Automatic lunch break: Check-out created at 12:00 PM and new check-in at 12:30 PM')
+                    self.env['mail.message'].create([{
                         'model': 'hr.attendance',
-                        'res_id': attendance.id,
+                        'res_id': attendance_id,
                         'message_type': 'notification',
-                        'body': _('Automatic lunch break: Check-out created at 12:00 PM and new check-in at 12:30 PM')
-                    })
-                    
-                    _logger.error("Procesamiento completado para empleado: %s", employee.name)
-                except Exception as e:
-                    _logger.error("Error al procesar pausa de almuerzo para empleado %s: %s", 
-                                 emp_data['employee'].name, e)
-                    import traceback
-                    _logger.error(traceback.format_exc())
-            
-            _logger.error("=== PROCESO DE PAUSA DE ALMUERZO AUTOMÁTICA COMPLETADO ===")
-            return True
-            
-        except Exception as e:
-            _logger.error("Error general en el proceso de pausa de almuerzo: %s", e)
-            # Registrar la traza completa del error
-            import traceback
-            _logger.error(traceback.format_exc())
+                        'body': body,
+                    } for attendance_id, employee_id, check_out, check_in in candidates])
+        except Exception:
+            _logger.exception("Error en el proceso de pausa de almuerzo")
             return False
-
+        _logger.info(
+            "Pausa de almuerzo: %d asistencias divididas en %d zonas horarias en %.2f s",
+            len(candidates), len(timezone_groups), time.perf_counter() - start)
+        return True
@@ -2,7 +2,7 @@
 
 {
     'name': 'Odoo Local IA Integration',
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.1.0',
     'license': 'AGPL-3',
     'summary': 'Odoo ChatGPT Integration',
     'description': 'Odoo-IA connection',
@@ -1,5 +1,6 @@
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 from odoo import models, _
 from odoo.exceptions import UserError
@@ -8,77 +9,118 @@ import json
 
 _logger = logging.getLogger(__name__)
 
+DEFAULT_LOCALAI_MODEL = 'qwen2-0.5b-instruct'
+DEFAULT_PARALLEL_REQUESTS = 4
+
+
+def _request_ai_response(settings, prompt):
+    """
+    Envía el prompt a la IA configurada en ``settings`` (ver
+    ``IaService._get_ai_settings``). No usa el entorno de Odoo, por lo que
+    puede llamarse desde varios hilos a la vez.
+    """
+    if settings['use_external']:
+        return _request_external_response(prompt, settings['external_url'])
+    return _request_local_response(prompt, settings)
+
+
+def _request_local_response(prompt, settings):
+    _logger.info('Prompt enviado a IA local: %s', prompt)
+    client = OpenAI(base_url=settings['base_url'], api_key="noapykey")
+    response = client.chat.completions.create(
+        messages=[{"role": "system", "content": prompt}],
+        model=settings['model'],
+        temperature=0.6,
+        max_tokens=3000,
+        top_p=1,
+        frequency_penalty=0,
+        presence_penalty=0,
+        user=settings['user'],
+    )
+    return response.choices[0].message.content
+
+
+def _request_external_response(prompt, url):
+    _logger.info('Prompt enviado a IA externa: %s , url : %s', prompt, url)
+    response = requests.post(
+        url,
+        json={"prompt": prompt},
+        headers={"Content-Type": "application/json"},
+        timeout=60,
+    )
+    if response.status_code != 200:
+        raise ValueError('Código %s - %s' % (response.status_code, response.text))
+    try:
+        data = response.json()
+    except ValueError:
+        raise ValueError('La respuesta de la IA no es JSON válido. Contenido recibido: %s' % response.text)
+    # Asumimos que la respuesta es una lista de diccionarios
+    if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
+        return data[0].get("output", "")
+    raise ValueError('La respuesta JSON no es una lista de diccionarios válida: %s' % str(data))
+
+
 class IaService(models.AbstractModel):
     _name = 'asi_ia.service'
     _description = 'Servicio de conexión a IA (local o externa)'
     _inherit = ['mail.thread', 'mail.activity.mixin']
-    
-    def get_ai_response(self, prompt):
-        ICP = self.env['ir.config_parameter'].sudo()
-        use_external = ICP.get_param('asi_ia.use_external_ia') == 'True'
-        external_url = ICP.get_param('asi_ia.external_ia_url')
-        prompt_ok = prompt + '. Responder en el idioma de la pregunta.'
-        if use_external and external_url:
-            response = self._get_external_response(prompt_ok, external_url)
-            return response
-        return self._get_local_response(prompt_ok)
 
-    def _get_local_response(self, prompt):
+    def _get_ai_settings(self):
+        """ Lee una sola vez la configuración necesaria para consultar la IA """
         ICP = self.env['ir.config_parameter'].sudo()
-        url = ICP.get_param('asi_ia.openapi_base_url')
-        localai_model_id = ICP.get_param('asi_ia.localai_model')
+        external_url = ICP.get_param('asi_ia.external_ia_url')
+        settings = {
+            'use_external': ICP.get_param('asi_ia.use_external_ia') == 'True' and bool(external_url),
+            'external_url': external_url,
+            'base_url': ICP.get_param('asi_ia.openapi_base_url'),
+            'model': DEFAULT_LOCALAI_MODEL,
+            'user': self.env.user.name,
+        }
+        if not settings['use_external']:
+            try:
+                localai_model_id = ICP.get_param('asi_ia.localai_model')
+                settings['model'] = self.env['localai.model'].browse(int(localai_model_id)).name
+            except Exception as ex:
+                _logger.warning('Fallo al obtener modelo: %s', ex)
+        return settings
 
-        try:
-            client = OpenAI(base_url=url, api_key="noapykey")
-            localai_model = self.env['localai.model'].browse(int(localai_model_id)).name
-        except Exception as ex:
-            _logger.warning('Fallo al obtener modelo: %s', ex)
-            localai_model = 'qwen2-0.5b-instruct'
+    def _get_error_message(self, settings, error):
+        if settings['use_external']:
+            return _('Error de conexión a IA externa: %s') % str(error)
+        return _('Error en respuesta IA local: %s') % str(error)
 
+    def get_ai_response(self, prompt):
+        settings = self._get_ai_settings()
+        prompt_ok = prompt + '. Responder en el idioma de la pregunta.'
         try:
-            _logger.info('Prompt enviado a IA local: %s', prompt)
-            response = client.chat.completions.create(
-                messages=[{"role": "system", "content": prompt}],
-                model=localai_model,
-                temperature=0.6,
-                max_tokens=3000,
-                top_p=1,
-                frequency_penalty=0,
-                presence_penalty=0,
-                user=self.env.user.name,
-            )
-            return response.choices[0].message.content
+            return _request_ai_response(settings, prompt_ok)
         except Exception as e:
-            raise UserError(_('Error en respuesta IA local: %s') % str(e))
+            raise UserError(self._get_error_message(settings, e))
 
-    
+    def get_ai_responses(self, prompts, max_workers=None):
+        """
+        Consulta la IA para varios prompts a la vez, con un máximo de
+        ``max_workers`` peticiones simultáneas (parámetro del sistema
+        ``asi_ia.max_parallel_requests`` por defecto).
 
-    def _get_external_response(self, prompt, url):
-        try:
-            _logger.info('Prompt enviado a IA externa: %s , url : %s', prompt, url)
-            response = requests.post(
-                url,
-                json={"prompt": prompt},
-                headers={"Content-Type": "application/json"},
-                timeout=60,
-            )
-
-            if response.status_code == 200:
+        :param prompts: diccionario {clave: prompt}
+        :return: generador de tuplas (clave, respuesta, error) en el orden en
+            que se reciben las respuestas; ``error`` es False si no hubo fallo
+        """
+        if not prompts:
+            return
+        settings = self._get_ai_settings()
+        if not max_workers:
+            ICP = self.env['ir.config_parameter'].sudo()
+            max_workers = int(ICP.get_param('asi_ia.max_parallel_requests', DEFAULT_PARALLEL_REQUESTS))
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts)))) as executor:
+            futures = {
+                executor.submit(_request_ai_response, settings, prompt + '. Responder en el idioma de la pregunta.'): key
+                for key, prompt in prompts.items()
+            }
+            for future in as_completed(futures):
                 try:
-                    data = response.json()
-                    # Asumimos que la respuesta es una lista de diccionarios
-                    if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
-                        ia_response=data[0].get("output", "")
-                        #self.message_post(body=f"<b>Respuesta de la IA:</b><br/><pre>{ia_response}</pre>", subtype_xmlid="mail.mt_note" )
-                        return ia_response
-                    else:
-                        raise UserError(_('La respuesta JSON no es una lista de diccionarios válida: %s') % str(data))
-                except ValueError:
-                    raise UserError(_('La respuesta de la IA no es JSON válido. Contenido recibido: %s') % response.text)
-            else:
-                raise UserError(_('Error en respuesta IA externa: Código %s - %s') % (response.status_code, response.text))
-
-        except Exception as e:
-            raise UserError(_('Error de conexión a IA externa: %s') % str(e))
-
-
+                    yield futures[future], future.result(), False
+                except Exception as e:
+                    _logger.warning('Fallo en la consulta a la IA: %s', e)
+                    yield futures[future], False, self._get_error_message(settings, e)
@@ -1,6 +1,6 @@
 {
     'name': 'ASI - Reporte de Movimientos de Inventario',
-    'version': '1.5',
+    'version': '1.6',
     'summary': 'Genera reportes consolidados de movimientos de inventario por producto',
     
     'description': "Genera reportes PDF de movimientos de inventario consolidados por producto con rango de fechas.",
@@ -12,6 +12,7 @@
     'depends': ['stock'],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'wizard/stock_move_report_wizard_view.xml',
         'wizard/product_move_report_wizard_view.xml',
         'report/stock_move_report_template.xml',
@@ -2,3 +2,4 @@
 
 from . import stock_move_report
 from . import product_move_report
+from . import stock_at_date
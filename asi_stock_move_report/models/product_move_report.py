@@ -22,8 +22,37 @@ class ProductMoveReport(models.AbstractModel):
         
         # Obtener ubicaciones del almacén seleccionado
         warehouse = self.env['stock.warehouse'].browse(warehouse_id) if warehouse_id else None
-        warehouse_locations = self.env['stock.location']
+        warehouse_locations = self._get_warehouse_locations(warehouse)
+        
+        # Obtener la existencia inicial correcta
+        initial_stock = self._get_stock_quantity_at_date(product, date_start, warehouse_locations)
+        
+        # Contadores detallados para el resumen
+        totals = self._get_empty_totals()
+        moves_data = list(self._iter_moves_data(
+            product, date_start, date_end, warehouse_locations, initial_stock, totals))
         
+        return {
+            'doc_ids': [1],
+            'doc_model': 'product.move.report.wizard',
+            'docs': [self.env['product.move.report.wizard'].browse(1)],
+            'date_start': date_start,
+            'date_end': date_end,
+            'product': product,
+            'warehouse': warehouse,
+            'moves_data': moves_data,
+            'total_movements': len(moves_data),
+            'totals': totals,
+            'company': self.env.company,
+            'initial_stock': initial_stock,
+        }
+    
+    def _get_warehouse_locations(self, warehouse):
+        """
+        Ubicaciones que forman el almacén: sus ubicaciones internas y las
+        ubicaciones virtuales relacionadas con él
+        """
+        warehouse_locations = self.env['stock.location']
         if warehouse:
             # Incluir todas las ubicaciones internas del almacén
             warehouse_locations = warehouse.lot_stock_id.child_ids | warehouse.lot_stock_id
@@ -33,32 +62,10 @@ class ProductMoveReport(models.AbstractModel):
                 ('usage', 'in', ['inventory', 'production', 'procurement'])
             ])
             warehouse_locations = warehouse_locations | virtual_locations
-        
-        # Obtener la existencia inicial correcta
-        initial_stock = self._get_stock_quantity_at_date(product, date_start, warehouse_locations)
-        
-        # Obtener todos los movimientos del producto en el rango de fechas
-        domain = [
-            ('date', '>=', date_start),
-            ('date', '<=', date_end),
-            ('state', '=', 'done'),
-            ('product_id', '=', product_id),
-        ]
-        
-        # Filtrar por ubicaciones del almacén si se especifica
-        if warehouse_locations:
-            domain.append('|')
-            domain.append(('location_id', 'in', warehouse_locations.ids))
-            domain.append(('location_dest_id', 'in', warehouse_locations.ids))
-        
-        moves = self.env['stock.move'].search(domain, order='date asc')
-        
-        # Preparar datos de movimientos
-        moves_data = []
-        running_stock = initial_stock
-        
-        # Contadores detallados para el resumen
-        totals = {
+        return warehouse_locations
+    
+    def _get_empty_totals(self):
+        return {
             'entradas_recepcion': 0.0,
             'entradas_ajuste': 0.0,
             'entradas_transferencia': 0.0,
@@ -68,14 +75,80 @@ class ProductMoveReport(models.AbstractModel):
             'salidas_ajuste': 0.0,
             'salidas_consumo': 0.0,
         }
+    
+    def _iter_moves(self, product, date_start, date_end, warehouse_locations, batch_size=2000):
+        """
+        Recorre los movimientos realizados del producto en el período por lotes
+        (paginación por fecha e id), sin cargar todos los registros a la vez
+        """
+        where = """
+            move.state = 'done'
+            AND move.product_id = %(product_id)s
+            AND move.date >= %(date_start)s
+            AND move.date <= %(date_end)s
+        """
+        params = {
+            'product_id': product.id,
+            'date_start': date_start,
+            'date_end': date_end,
+            'limit': batch_size,
+        }
+        # Filtrar por ubicaciones del almacén si se especifica
+        if warehouse_locations:
+            where += """
+            AND (move.location_id IN %(location_ids)s
+                 OR move.location_dest_id IN %(location_ids)s)
+            """
+            params['location_ids'] = tuple(warehouse_locations.ids)
+        self.env['stock.move'].flush_model()
+        last_key = None
+        while True:
+            batch_where = where
+            if last_key:
+                batch_where += ' AND (move.date, move.id) > (%(last_date)s, %(last_id)s)'
+                params['last_date'], params['last_id'] = last_key
+            self.env.cr.execute("""
+                SELECT move.id, move.date, move.product_uom_qty,
+                       move.reference, move.name,
+                       move.location_id, move.location_dest_id,
+                       uom.name AS product_uom
+                  FROM stock_move move
+                  JOIN uom_uom uom ON uom.id = move.product_uom
+                 WHERE """ + batch_where + """
+              ORDER BY move.date, move.id
+                 LIMIT %(limit)s
+            """, params)
+            rows = self.env.cr.dictfetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row
+            last_key = (rows[-1]['date'], rows[-1]['id'])
+    
+    def _iter_moves_data(self, product, date_start, date_end, warehouse_locations,
+                         initial_stock, totals):
+        """
+        Genera las líneas del submayor con la existencia acumulada, actualizando
+        los totales del resumen a medida que se recorren los movimientos
+        """
+        running_stock = initial_stock
+        location_ids = set(warehouse_locations.ids)
+        locations = {}
         
-        for move in moves:
+        for move in self._iter_moves(product, date_start, date_end, warehouse_locations):
+            for key in ('location_id', 'location_dest_id'):
+                if move[key] not in locations:
+                    location = self.env['stock.location'].browse(move[key])
+                    locations[move[key]] = {'usage': location.usage, 'name': location.name or ''}
+            move['location_src'] = locations[move['location_id']]
+            move['location_dest'] = locations[move['location_dest_id']]
+            
             # Verificar si el movimiento realmente afecta el stock del almacén
-            stock_impact = self._calculate_stock_impact(move, warehouse_locations)
+            stock_impact = self._calculate_stock_impact(move, location_ids)
             if stock_impact == 0:
                 continue  # No afecta el stock, saltar
                 
-            move_type = self._classify_move_detailed(move, warehouse_locations)
+            move_type = self._classify_move_detailed(move, location_ids)
             quantity = abs(stock_impact)  # Usar el impacto calculado
             
             # Obtener existencia antes del movimiento
@@ -97,92 +170,77 @@ class ProductMoveReport(models.AbstractModel):
                     move_type = 'salida_' + move_type.split('_', 1)[-1] if '_' in move_type else 'salida_transferencia'
                 totals[move_type.replace('salida_', 'salidas_')] += quantity
             
-            moves_data.append({
-                'date': move.date,
+            yield {
+                'date': move['date'],
                 'cantidad_antes': existencia_antes,
                 'cantidad_movida': quantity,
                 'movement_direction': movement_direction,
-                'product_uom': move.product_uom.name,
+                'product_uom': move['product_uom'],
                 'move_type_display': self._get_move_type_display(move_type),
                 'existencia_final': running_stock,
-                'reference': move.reference or move.name or '',
-            })
-        
-        return {
-            'doc_ids': [1],
-            'doc_model': 'product.move.report.wizard',
-            'docs': [self.env['product.move.report.wizard'].browse(1)],
-            'date_start': date_start,
-            'date_end': date_end,
-            'product': product,
-            'warehouse': warehouse,
-            'moves_data': moves_data,
-            'total_movements': len(moves_data),
-            'totals': totals,
-            'company': self.env.company,
-            'initial_stock': initial_stock,
-        }
+                'reference': move['reference'] or move['name'] or '',
+            }
     
-    def _calculate_stock_impact(self, move, warehouse_locations):
+    def _calculate_stock_impact(self, move, location_ids):
         """
         Calcula el impacto real del movimiento en el stock del almacén
         Retorna: > 0 para entradas, < 0 para salidas, 0 para movimientos sin impacto
         """
-        if not warehouse_locations:
+        if not location_ids:
             # Sin filtro de almacén, usar lógica original
-            if move.location_dest_id.usage == 'internal' and move.location_id.usage != 'internal':
-                return move.product_uom_qty
-            elif move.location_id.usage == 'internal' and move.location_dest_id.usage != 'internal':
-                return -move.product_uom_qty
+            if move['location_dest']['usage'] == 'internal' and move['location_src']['usage'] != 'internal':
+                return move['product_uom_qty']
+            elif move['location_src']['usage'] == 'internal' and move['location_dest']['usage'] != 'internal':
+                return -move['product_uom_qty']
             return 0
         
-        src_in_warehouse = move.location_id in warehouse_locations
-        dest_in_warehouse = move.location_dest_id in warehouse_locations
+        src_in_warehouse = move['location_id'] in location_ids
+        dest_in_warehouse = move['location_dest_id'] in location_ids
         
         # Casos que afectan el stock del almacén:
         if not src_in_warehouse and dest_in_warehouse:
             # Entrada al almacén desde fuera
-            return move.product_uom_qty
+            return move['product_uom_qty']
         elif src_in_warehouse and not dest_in_warehouse:
             # Salida del almacén hacia fuera
-            return -move.product_uom_qty
+            return -move['product_uom_qty']
         else:
             # Movimiento interno o externo al almacén - no afecta stock total
             return 0
     
-    def _classify_move_detailed(self, move, warehouse_locations=None):
+    def _classify_move_detailed(self, move, location_ids=None):
         """
         Clasifica un movimiento según su tipo detallado considerando el contexto del almacén
         """
-        location_src = move.location_id
-        location_dest = move.location_dest_id
+        location_src = move['location_src']
+        location_dest = move['location_dest']
         
         # Determinar si es entrada o salida basado en el impacto real
-        stock_impact = self._calculate_stock_impact(move, warehouse_locations)
+        stock_impact = self._calculate_stock_impact(move, location_ids)
         
         if stock_impact > 0:
             # Es una entrada
-            if location_src.usage == 'supplier':
+            if location_src['usage'] == 'supplier':
                 return 'entrada_recepcion'
-            elif location_src.usage == 'inventory':
+            elif location_src['usage'] == 'inventory':
                 return 'entrada_ajuste'
-            elif location_src.usage in ['customer', 'production']:
+            elif location_src['usage'] in ['customer', 'production']:
                 return 'entrada_devolucion'
-            elif location_src.usage in ['internal', 'transit']:
+            elif location_src['usage'] in ['internal', 'transit']:
                 return 'entrada_transferencia'
             else:
                 return 'entrada_recepcion'
         elif stock_impact < 0:
             # Es una salida
-            if location_dest.usage == 'customer':
+            if location_dest['usage'] == 'customer':
                 return 'salida_venta'
-            elif location_dest.usage == 'inventory':
+            elif location_dest['usage'] == 'inventory':
                 return 'salida_ajuste'
-            elif location_dest.usage == 'production':
+            elif location_dest['usage'] == 'production':
                 return 'salida_consumo'
-            elif 'consumo' in location_dest.name.lower() or 'vale' in location_dest.name.lower():
+            elif 'consumo' in location_dest['name'].lower() or 'vale' in location_dest['name'].lower():
                 return 'salida_consumo'
-            elif location_dest.usage in ['internal', 'transit']:
+            elif location_dest['usage'] in ['internal', 'transit']:
                 return 'salida_transferencia'
             else:
                 return 'salida_transferencia'
@@ -209,48 +267,7 @@ class ProductMoveReport(models.AbstractModel):
     def _get_stock_quantity_at_date(self, product, date, warehouse_locations=None):
         """
         Obtiene la cantidad en stock de un producto en una fecha específica para un almacén
-        Método mejorado para mayor precisión en el cálculo
         """
-        # Usar el método nativo de Odoo para obtener stock histórico
-        if warehouse_locations:
-            # Obtener stock por ubicación específica
-            stock_quant_domain = [
-                ('product_id', '=', product.id),
-                ('location_id', 'in', warehouse_locations.ids),
-            ]
-            
-            # Obtener todos los movimientos hasta la fecha especificada
-            move_domain = [
-                ('product_id', '=', product.id),
-                ('date', '<', date),
-                ('state', '=', 'done'),
-                '|',
-                ('location_id', 'in', warehouse_locations.ids),
-                ('location_dest_id', 'in', warehouse_locations.ids),
-            ]
-            
-            moves = self.env['stock.move'].search(move_domain, order='date asc')
-            
-            quantity = 0.0
-            for move in moves:
-                stock_impact = self._calculate_stock_impact(move, warehouse_locations)
-                quantity += stock_impact
-            
-            return quantity
-        else:
-            # Sin filtro de almacén - usar ubicaciones internas
-            domain = [
-                ('product_id', '=', product.id),
-                ('date', '<', date),
-                ('state', '=', 'done'),
-            ]
-            moves = self.env['stock.move'].search(domain)
-            
-            quantity = 0.0
-            for move in moves:
-                if move.location_dest_id.usage == 'internal':
-                    quantity += move.product_uom_qty
-                elif move.location_id.usage == 'internal':
-                    quantity -= move.product_uom_qty
-            
-            return quantity
\ No newline at end of file
+        quantities = self.env['asi.stock.at.date'].get_quantities(
+            product.ids, date, warehouse_locations.ids if warehouse_locations else None)
+        return quantities.get(product.id, 0.0)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+
+from odoo import api, fields, models
+
+
+class StockSnapshot(models.Model):
+    _name = 'asi.stock.snapshot'
+    _description = 'Punto de control de existencias'
+    _order = 'date desc, product_id, location_id'
+
+    date = fields.Datetime(string='Fecha', required=True, index=True)
+    product_id = fields.Many2one('product.product', string='Producto', required=True,
+                                 ondelete='cascade', index=True)
+    location_id = fields.Many2one('stock.location', string='Ubicación', required=True,
+                                  ondelete='cascade')
+    quantity = fields.Float(string='Cantidad', digits='Product Unit of Measure')
+
+    _sql_constraints = [
+        ('snapshot_uniq', 'unique(date, product_id, location_id)',
+         'Ya existe un punto de control para este producto y ubicación en esa fecha.'),
+    ]
+
+    @api.model
+    def _cron_create_snapshot(self):
+        """
+        Crea el punto de control del primer día del mes en curso a partir del
+        punto de control anterior y de los movimientos realizados desde entonces
+        """
+        today = fields.Date.today()
+        snapshot_date = datetime(today.year, today.month, 1)
+        if self.search_count([('date', '=', snapshot_date)]):
+            return True
+        previous_date = self.env['asi.stock.at.date']._get_snapshot_date(snapshot_date)
+        balance_query, params = self.env['asi.stock.at.date']._get_balance_query(
+            snapshot_date, previous_date)
+        params['snapshot_date'] = snapshot_date
+        params['uid'] = self.env.uid
+        self.env.cr.execute("""
+            INSERT INTO asi_stock_snapshot
+                (date, product_id, location_id, quantity,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT %(snapshot_date)s, balance.product_id, balance.location_id,
+                   SUM(balance.quantity),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM (""" + balance_query + """) AS balance
+          GROUP BY balance.product_id, balance.location_id
+            HAVING SUM(balance.quantity) != 0
+        """, params)
+        return True
+
+
+class StockAtDate(models.AbstractModel):
+    _name = 'asi.stock.at.date'
+    _description = 'Existencias a una fecha'
+
+    @api.model
+    def get_quantities(self, product_ids, date, location_ids=None):
+        """
+        Calcula la existencia de varios productos antes de una fecha con una
+        sola consulta agrupada. Si hay un punto de control anterior a la fecha,
+        se parte de él y solo se suman los movimientos posteriores.
+
+        :param product_ids: lista de ids de productos
+        :param date: fecha de corte (se excluyen los movimientos de esa fecha en adelante)
+        :param location_ids: ubicaciones a considerar; por defecto las internas
+        :return: diccionario {product_id: cantidad}
+        """
+        if not product_ids:
+            return {}
+        self.env['stock.move'].flush_model(
+            ['product_id', 'date', 'state', 'location_id', 'location_dest_id', 'product_uom_qty'])
+        snapshot_date = self._get_snapshot_date(date)
+        balance_query, params = self._get_balance_query(date, snapshot_date, product_ids)
+        if location_ids:
+            where = 'balance.location_id IN %(location_ids)s'
+            params['location_ids'] = tuple(location_ids)
+        else:
+            where = "location.usage = 'internal'"
+        self.env.cr.execute("""
+            SELECT balance.product_id, SUM(balance.quantity)
+              FROM (""" + balance_query + """) AS balance
+              JOIN stock_location location ON location.id = balance.location_id
+             WHERE """ + where + """
+          GROUP BY balance.product_id
+        """, params)
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _get_snapshot_date(self, date):
+        """ Fecha del último punto de control anterior o igual a ``date`` """
+        self.env['asi.stock.snapshot'].flush_model()
+        self.env.cr.execute(
+            "SELECT MAX(date) FROM asi_stock_snapshot WHERE date <= %s", (date,))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _get_balance_query(self, date, snapshot_date=None, product_ids=None):
+        """
+        Consulta con las variaciones (product_id, location_id, quantity) que
+        suman la existencia por ubicación antes de ``date``: el punto de control
+        y las entradas (+) y salidas (-) de cada ubicación posteriores a él
+        """
+        params = {'date': date, 'snapshot_date': snapshot_date}
+        move_where = "move.state = 'done' AND move.date < %(date)s"
+        snapshot_where = 'snapshot.date = %(snapshot_date)s'
+        if snapshot_date:
+            move_where += ' AND move.date >= %(snapshot_date)s'
+        if product_ids:
+            params['product_ids'] = tuple(product_ids)
+            move_where += ' AND move.product_id IN %(product_ids)s'
+            snapshot_where += ' AND snapshot.product_id IN %(product_ids)s'
+        query = """
+            SELECT move.product_id, move.location_dest_id AS location_id,
+                   move.product_uom_qty AS quantity
+              FROM stock_move move
+             WHERE """ + move_where + """
+             UNION ALL
+            SELECT move.product_id, move.location_id,
+                   -move.product_uom_qty
+              FROM stock_move move
+             WHERE """ + move_where
+        if snapshot_date:
+            query += """
+             UNION ALL
+            SELECT snapshot.product_id, snapshot.location_id, snapshot.quantity
+              FROM asi_stock_snapshot snapshot
+             WHERE """ + snapshot_where
+        return query, params
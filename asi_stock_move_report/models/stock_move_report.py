@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from odoo import api, fields, models
-from collections import defaultdict
 
 class StockMoveReport(models.AbstractModel):
     _name = 'report.asi_stock_move_report.stock_move_report_template'
@@ -23,68 +22,80 @@ class StockMoveReport(models.AbstractModel):
         if warehouse:
             warehouse_locations = warehouse.lot_stock_id.child_ids | warehouse.lot_stock_id
         
-        # Obtener todos los movimientos en el rango de fechas y almacén
-        domain = [
-            ('date', '>=', date_start),
-            ('date', '<=', date_end),
-            ('state', '=', 'done'),
-            ('product_id', '!=', False),
-        ]
+        # Agrupar en una sola consulta los movimientos del período por producto
+        # y por tipo de ubicación de origen y destino
+        where = """
+            move.state = 'done'
+            AND move.product_id IS NOT NULL
+            AND move.date >= %(date_start)s
+            AND move.date <= %(date_end)s
+        """
+        params = {'date_start': date_start, 'date_end': date_end}
         
         # Filtrar por ubicaciones del almacén si se especifica
         if warehouse_locations:
-            domain.append('|')
-            domain.append(('location_id', 'in', warehouse_locations.ids))
-            domain.append(('location_dest_id', 'in', warehouse_locations.ids))
-        
-        moves = self.env['stock.move'].search(domain)
+            where += """
+            AND (move.location_id IN %(location_ids)s
+                 OR move.location_dest_id IN %(location_ids)s)
+            """
+            params['location_ids'] = tuple(warehouse_locations.ids)
+        
+        self.env['stock.move'].flush_model()
+        self.env.cr.execute("""
+            SELECT move.product_id, src.usage AS src_usage, dest.usage AS dest_usage,
+                   COUNT(*) AS move_count, SUM(move.product_uom_qty) AS quantity
+              FROM stock_move move
+              JOIN stock_location src ON src.id = move.location_id
+              JOIN stock_location dest ON dest.id = move.location_dest_id
+             WHERE """ + where + """
+          GROUP BY move.product_id, src.usage, dest.usage
+        """, params)
+        groups = self.env.cr.dictfetchall()
+        
+        products = self.env['product.product'].browse({group['product_id'] for group in groups})
+        
+        # Existencias al inicio del período para todos los productos a la vez
+        initial_quantities = self.env['asi.stock.at.date'].get_quantities(
+            products.ids, date_start, warehouse_locations.ids or None)
         
         # Diccionario para consolidar movimientos por producto
-        product_moves = defaultdict(lambda: {
-            'product_id': None,
-            'product_code': '',
-            'product_name': '',
-            'product_uom': '',
-            'cantidad_movimientos': 0,
-            'cantidad_a_mano': 0.0,
-            'entradas': 0.0,
-            'ventas': 0.0,
-            'otras_salidas': 0.0,
-            'consumo': 0.0,
-            'existencia_final': 0.0,
-        })
-        
-        # Procesar cada movimiento
-        for move in moves:
-            product_id = move.product_id.id
-            
-            # Inicializar datos del producto si es la primera vez
-            if product_moves[product_id]['product_id'] is None:
-                product_moves[product_id]['product_id'] = product_id
-                product_moves[product_id]['product_code'] = move.product_id.default_code or ''
-                product_moves[product_id]['product_name'] = move.product_id.name or ''
-                product_moves[product_id]['product_uom'] = move.product_uom.name or ''
-                
-                # Obtener cantidad a mano al inicio del período para el almacén específico
-                product_moves[product_id]['cantidad_a_mano'] = self._get_stock_quantity_at_date(
-                    move.product_id, date_start, warehouse_locations
-                )
+        product_moves = {}
+        for product in products:
+            product_moves[product.id] = {
+                'product_id': product.id,
+                'product_code': product.default_code or '',
+                'product_name': product.name or '',
+                'product_uom': product.uom_id.name or '',
+                'cantidad_movimientos': 0,
+                'cantidad_a_mano': initial_quantities.get(product.id, 0.0),
+                'entradas': 0.0,
+                'ventas': 0.0,
+                'otras_salidas': 0.0,
+                'consumo': 0.0,
+                'existencia_final': 0.0,
+            }
+        
+        # Procesar cada grupo de movimientos
+        total_movements = 0
+        for group in groups:
+            product_data = product_moves[group['product_id']]
             
             # Incrementar contador de movimientos para este producto
-            product_moves[product_id]['cantidad_movimientos'] += 1
+            product_data['cantidad_movimientos'] += group['move_count']
+            total_movements += group['move_count']
             
             # Clasificar el movimiento según su tipo
-            move_type = self._classify_move(move)
-            quantity = move.product_uom_qty
+            move_type = self._classify_move(group['src_usage'], group['dest_usage'])
+            quantity = group['quantity']
             
             if move_type == 'entrada':
-                product_moves[product_id]['entradas'] += quantity
+                product_data['entradas'] += quantity
             elif move_type == 'venta':
-                product_moves[product_id]['ventas'] += quantity
+                product_data['ventas'] += quantity
             elif move_type == 'otra_salida':
-                product_moves[product_id]['otras_salidas'] += quantity
+                product_data['otras_salidas'] += quantity
             elif move_type == 'consumo':
-                product_moves[product_id]['consumo'] += quantity
+                product_data['consumo'] += quantity
         
         # Calcular existencias finales
         for product_id in product_moves:
@@ -115,39 +126,36 @@ class StockMoveReport(models.AbstractModel):
             'warehouse': warehouse,
             'products_data': products_with_movements,
             'total_products_with_movements': len(products_with_movements),
-            'total_movements': len(moves),  # Total de movimientos en el período
+            'total_movements': total_movements,  # Total de movimientos en el período
             'company': self.env.company,
         }
     
-    def _classify_move(self, move):
+    def _classify_move(self, src_usage, dest_usage):
         """
-        Clasifica un movimiento según su tipo
+        Clasifica un movimiento según su tipo a partir del tipo de sus ubicaciones
         """
-        location_src = move.location_id
-        location_dest = move.location_dest_id
-        
         # Entradas: de proveedor, inventario, producción a ubicación interna
-        if (location_src.usage in ['supplier', 'inventory', 'production'] and 
-            location_dest.usage == 'internal'):
+        if (src_usage in ['supplier', 'inventory', 'production'] and 
+            dest_usage == 'internal'):
             return 'entrada'
         
         # Ventas: de ubicación interna a cliente
-        if (location_src.usage == 'internal' and 
-            location_dest.usage == 'customer'):
+        if (src_usage == 'internal' and 
+            dest_usage == 'customer'):
             return 'venta'
         
         # Consumo: de ubicación interna a producción
-        if (location_src.usage == 'internal' and 
-            location_dest.usage == 'production'):
+        if (src_usage == 'internal' and 
+            dest_usage == 'production'):
             return 'consumo'
         
         # Otras salidas: cualquier otra salida de ubicación interna
-        if (location_src.usage == 'internal' and 
-            location_dest.usage in ['inventory', 'supplier', 'transit']):
+        if (src_usage == 'internal' and 
+            dest_usage in ['inventory', 'supplier', 'transit']):
             return 'otra_salida'
         
         # Por defecto, considerar como entrada si va a ubicación interna
-        if location_dest.usage == 'internal':
+        if dest_usage == 'internal':
             return 'entrada'
         else:
             return 'otra_salida'
@@ -156,33 +164,6 @@ class StockMoveReport(models.AbstractModel):
         """
         Obtiene la cantidad en stock de un producto en una fecha específica para un almacén
         """
-        domain = [
-            ('product_id', '=', product.id),
-            ('date', '<', date),
-            ('state', '=', 'done'),
-        ]
-        
-        # Filtrar por ubicaciones del almacén si se especifica
-        if warehouse_locations:
-            domain.append('|')
-            domain.append(('location_id', 'in', warehouse_locations.ids))
-            domain.append(('location_dest_id', 'in', warehouse_locations.ids))
-        
-        moves = self.env['stock.move'].search(domain)
-        
-        quantity = 0.0
-        for move in moves:
-            # Solo considerar movimientos que involucren las ubicaciones del almacén
-            if warehouse_locations:
-                if move.location_dest_id in warehouse_locations:
-                    quantity += move.product_uom_qty
-                elif move.location_id in warehouse_locations:
-                    quantity -= move.product_uom_qty
-            else:
-                # Lógica original si no hay filtro de almacén
-                if move.location_dest_id.usage == 'internal':
-                    quantity += move.product_uom_qty
-                elif move.location_id.usage == 'internal':
-                    quantity -= move.product_uom_qty
-        
-        return quantity
+        quantities = self.env['asi.stock.at.date'].get_quantities(
+            product.ids, date, warehouse_locations.ids if warehouse_locations else None)
+        return quantities.get(product.id, 0.0)
@@ -2,9 +2,16 @@
 
 from odoo import api, fields, models
 from datetime import datetime, timedelta, date
+import base64
 import calendar
+import tempfile
 from odoo.exceptions import UserError
 
+try:
+    from odoo.tools.misc import xlsxwriter
+except ImportError:
+    import xlsxwriter
+
 class ProductMoveReportWizard(models.TransientModel):
     _name = 'product.move.report.wizard'
     _description = 'Asistente para Reporte de Movimientos por Producto'
@@ -163,19 +170,16 @@ class ProductMoveReportWizard(models.TransientModel):
         # Período personalizado
         return f"{start_date.strftime('%d-%m-%Y')}_al_{end_date.strftime('%d-%m-%Y')}"
     
-    def action_generate_report(self):
+    def _check_moves(self):
         """
-        Genera el reporte PDF de movimientos por producto
+        Actualiza las fechas y valida que haya movimientos en el rango de fechas
+        para el producto y almacén
         """
-        self.ensure_one()
-        
-        # Aseguramos que las fechas estén actualizadas
         self._onchange_period_fields()
         
         # Obtener ubicaciones del almacén seleccionado (usando | para unir recordsets)
         warehouse_locations = self.warehouse_id.lot_stock_id.child_ids | self.warehouse_id.lot_stock_id
         
-        # Validar que hay movimientos en el rango de fechas para el producto y almacén
         moves_count = self.env['stock.move'].search_count([
             ('date', '>=', self.date_start),
             ('date', '<=', self.date_end),
@@ -188,6 +192,15 @@ class ProductMoveReportWizard(models.TransientModel):
         
         if moves_count == 0:
             raise UserError(f'No se encontraron movimientos para el producto {self.product_id.name} en el período seleccionado para el almacén {self.warehouse_id.name}.')
+    
+    def action_generate_report(self):
+        """
+        Genera el reporte PDF de movimientos por producto
+        """
+        self.ensure_one()
+        
+        # Aseguramos que las fechas estén actualizadas y que haya movimientos
+        self._check_moves()
         
         # Preparar datos para el reporte
         data = {
@@ -212,3 +225,77 @@ class ProductMoveReportWizard(models.TransientModel):
             report_action['context']['report_filename'] = self.report_filename + '.pdf'
         
         return report_action
+
+    
+    def action_export_xlsx(self):
+        """
+        Exporta el submayor a Excel escribiendo los movimientos a medida que se
+        leen de la base de datos (modo de memoria constante de xlsxwriter)
+        """
+        self.ensure_one()
+        self._check_moves()
+        
+        report = self.env['report.asi_stock_move_report.product_move_report_template']
+        warehouse_locations = report._get_warehouse_locations(self.warehouse_id)
+        initial_stock = report._get_stock_quantity_at_date(
+            self.product_id, self.date_start, warehouse_locations)
+        totals = report._get_empty_totals()
+        
+        with tempfile.NamedTemporaryFile(suffix='.xlsx') as output:
+            workbook = xlsxwriter.Workbook(output.name, {'constant_memory': True})
+            sheet = workbook.add_worksheet('Submayor')
+            bold = workbook.add_format({'bold': True})
+            date_format = workbook.add_format({'num_format': 'dd/mm/yyyy hh:mm'})
+            sheet.set_column(0, 0, 18)
+            sheet.set_column(1, 6, 16)
+            sheet.set_column(4, 4, 30)
+            sheet.set_column(6, 6, 25)
+            
+            sheet.write(0, 0, 'Producto', bold)
+            sheet.write(0, 1, self.product_id.display_name)
+            sheet.write(1, 0, 'Almacén', bold)
+            sheet.write(1, 1, self.warehouse_id.name)
+            sheet.write(2, 0, 'Existencia Inicial', bold)
+            sheet.write_number(2, 1, initial_stock)
+            headers = ['Fecha', 'Unidad de Medida', 'Existencia Inicial', 'Cantidad Movida',
+                       'Tipo de Operación', 'Existencia Final', 'Referencia']
+            for col, header in enumerate(headers):
+                sheet.write(4, col, header, bold)
+            
+            row = 5
+            total_movements = 0
+            for move in report._iter_moves_data(self.product_id, self.date_start, self.date_end,
+                                                warehouse_locations, initial_stock, totals):
+                sheet.write_datetime(row, 0, move['date'], date_format)
+                sheet.write(row, 1, move['product_uom'])
+                sheet.write_number(row, 2, move['cantidad_antes'])
+                sheet.write_number(row, 3, move['cantidad_movida'])
+                sheet.write(row, 4, '%s - %s' % (move['movement_direction'], move['move_type_display']))
+                sheet.write_number(row, 5, move['existencia_final'])
+                sheet.write(row, 6, move['reference'])
+                row += 1
+                total_movements += 1
+            
+            row += 1
+            sheet.write(row, 0, 'Total de Movimientos', bold)
+            sheet.write_number(row, 1, total_movements)
+            for key, value in totals.items():
+                row += 1
+                sheet.write(row, 0, key.replace('_', ' ').capitalize())
+                sheet.write_number(row, 1, value)
+            workbook.close()
+            output.seek(0)
+            datas = base64.b64encode(output.read())
+        
+        attachment = self.env['ir.attachment'].create({
+            'name': (self.report_filename or 'Submayor') + '.xlsx',
+            'datas': datas,
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % attachment.id,
+            'target': 'self',
+        }
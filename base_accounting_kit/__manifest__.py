@@ -22,7 +22,7 @@
 
 {
     'name': 'Odoo 16 Full Accounting Kit',
-    'version': '16.0.2.0.13',
+    'version': '16.0.2.0.17',
     'category': 'Accounting',
     'live_test_url': 'https://www.youtube.com/watch?v=peAp2Tx_XIs',
     'summary': """Odoo 17 Accounting, Odoo 17 Accounting Reports, Odoo17 Accounting, Odoo Accounting, Odoo17 Financial Reports, Odoo17 Asset, Odoo17 Profit and Loss, PDC, Followups, Odoo17, Accounting, Odoo Apps, Reports""",
@@ -104,12 +104,15 @@ class ReportBankBook(models.AbstractModel):
         params = (tuple(accounts.ids),) + tuple(where_params)
         cr.execute(sql, params)
 
+        # Running balance of each account, starting from its initial balance
+        balances = {
+            account_id: sum(line['debit'] - line['credit'] for line in lines)
+            for account_id, lines in move_lines.items()}
         for row in cr.dictfetchall():
-            balance = 0
-            for line in move_lines.get(row['account_id']):
-                balance += line['debit'] - line['credit']
-            row['balance'] += balance
-            move_lines[row.pop('account_id')].append(row)
+            account_id = row.pop('account_id')
+            row['balance'] += balances.get(account_id, 0.0)
+            balances[account_id] = row['balance']
+            move_lines[account_id].append(row)
 
         # Calculate the debit, credit and balance for Accounts
         account_res = []
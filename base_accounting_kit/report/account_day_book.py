@@ -20,7 +20,9 @@
 #
 #############################################################################
 import time
-from datetime import timedelta, datetime
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 
 from odoo import models, api, _
 from odoo.exceptions import UserError
@@ -30,13 +32,13 @@ class DayBookPdfReport(models.AbstractModel):
     _name = 'report.base_accounting_kit.day_book_report_template'
     _description = 'Day Book Report'
 
-    def _get_account_move_entry(self, accounts, form_data, pass_date):
+    def _get_account_move_entries(self, accounts, form_data, date_start,
+                                  date_end):
+        """Returns the move lines of the accounts between two dates, fetched
+        with a single query and grouped per day: a list of dictionaries with
+        the 'date', 'debit', 'credit', 'balance' and 'lines' of each day
+        having move lines, in chronological order"""
         cr = self.env.cr
-        move_line = self.env['account.move.line']
-        tables, where_clause, where_params = move_line._query_get()
-        wheres = [""]
-        if where_clause.strip():
-            wheres.append(where_clause.strip())
         if form_data['target_move'] == 'posted':
             target_move = "AND m.state = 'posted'"
         else:
@@ -52,27 +54,33 @@ class DayBookPdfReport(models.AbstractModel):
                 LEFT JOIN res_partner p ON (l.partner_id=p.id)
                 JOIN account_journal j ON (l.journal_id=j.id)
                 JOIN account_account acc ON (l.account_id = acc.id) 
-                WHERE l.account_id IN %s AND l.journal_id IN %s ''' + target_move + ''' AND l.date = %s
+                WHERE l.account_id IN %s AND l.journal_id IN %s ''' + target_move + ''' AND l.date BETWEEN %s AND %s
                 GROUP BY l.id, l.account_id, l.date,
                      j.code, l.currency_id, l.amount_currency, l.ref, l.name, m.name, c.symbol, p.name , acc.name
-                     ORDER BY l.date DESC
+                     ORDER BY l.date, l.id
         ''')
-        params = (
-        tuple(accounts.ids), tuple(form_data['journal_ids']), pass_date)
+        params = (tuple(accounts.ids), tuple(form_data['journal_ids']),
+                  date_start, date_end)
         cr.execute(sql, params)
-        data = cr.dictfetchall()
-        res = {}
-        debit = credit = balance = 0.00
-        for line in data:
-            debit += line['debit']
-            credit += line['credit']
-            balance += line['balance']
-        res['debit'] = debit
-        res['credit'] = credit
-        res['balance'] = balance
-        res['lines'] = data
+        res = []
+        for date, lines in groupby(cr.dictfetchall(),
+                                   key=itemgetter('ldate')):
+            lines = list(lines)
+            res.append({
+                'date': date,
+                'debit': sum(line['debit'] for line in lines),
+                'credit': sum(line['credit'] for line in lines),
+                'balance': sum(line['balance'] for line in lines),
+                'lines': lines,
+            })
         return res
 
+    def _get_account_move_entry(self, accounts, form_data, pass_date):
+        days = self._get_account_move_entries(accounts, form_data, pass_date,
+                                              pass_date)
+        return days and days[0] or {
+            'debit': 0.0, 'credit': 0.0, 'balance': 0.0, 'lines': []}
+
     @api.model
     def _get_report_values(self, docids, data=None):
         if not data.get('form') or not self.env.context.get('active_model'):
@@ -96,24 +104,18 @@ class DayBookPdfReport(models.AbstractModel):
         date_start = datetime.strptime(form_data['date_from'],
                                        '%Y-%m-%d').date()
         date_end = datetime.strptime(form_data['date_to'], '%Y-%m-%d').date()
-        days = date_end - date_start
-        dates = []
         record = []
-        for i in range(days.days + 1):
-            dates.append(date_start + timedelta(days=i))
-        for head in dates:
-            pass_date = str(head)
-            accounts_res = self.with_context(
-                data['form'].get('used_context', {}))._get_account_move_entry(
-                accounts, form_data, pass_date)
-            if accounts_res['lines']:
-                record.append({
-                    'date': head,
-                    'debit': accounts_res['debit'],
-                    'credit': accounts_res['credit'],
-                    'balance': accounts_res['balance'],
-                    'child_lines': accounts_res['lines']
-                })
+        days = self.with_context(
+            data['form'].get('used_context', {}))._get_account_move_entries(
+            accounts, form_data, date_start, date_end)
+        for day in days:
+            record.append({
+                'date': day['date'],
+                'debit': day['debit'],
+                'credit': day['credit'],
+                'balance': day['balance'],
+                'child_lines': day['lines']
+            })
         return {
             'doc_ids': docids,
             'doc_model': model,
@@ -7,6 +7,9 @@ from odoo import SUPERUSER_ID, api, fields, models
 
 _logger = logging.getLogger(__name__)
 
+# Date of the last run of the role update cron
+LAST_UPDATE_PARAM = "base_user_role.last_update_users"
+
 
 class ResUsersRole(models.Model):
     _name = "res.users.role"
@@ -111,8 +114,46 @@ class ResUsersRole(models.Model):
 
     @api.model
     def cron_update_users(self):
+        """Update the users whose roles changed since the last run. Every user
+        is updated on the first run."""
         logging.info("Update user roles")
-        self.search([]).update_users()
+        config_param = self.env["ir.config_parameter"].sudo()
+        last_run = config_param.get_param(LAST_UPDATE_PARAM)
+        now = fields.Datetime.now()
+        if last_run:
+            users = self._get_users_to_update(fields.Datetime.to_datetime(last_run))
+            users.set_groups_from_roles()
+        else:
+            self.search([]).update_users()
+        config_param.set_param(LAST_UPDATE_PARAM, fields.Datetime.to_string(now))
+
+    @api.model
+    def _get_users_to_update(self, since):
+        """Users having a role line changed since the given date, a role whose
+        implied groups changed, or a role line enabled or disabled by its
+        dates since then."""
+        today = fields.Date.today()
+        since_date = since.date()
+        role_lines = (
+            self.env["res.users.role.line"]
+            .sudo()
+            .search(
+                [
+                    "|",
+                    "|",
+                    "|",
+                    ("write_date", ">=", since),
+                    ("role_id.implied_ids.write_date", ">=", since),
+                    "&",
+                    ("date_from", ">", since_date),
+                    ("date_from", "<=", today),
+                    "&",
+                    ("date_to", ">=", since_date - datetime.timedelta(days=1)),
+                    ("date_to", "<", today),
+                ]
+            )
+        )
+        return role_lines.user_id
 
     def show_rule_ids(self):
         action = self.env["ir.actions.actions"]._for_xml_id("base.action_rule")
@@ -51,39 +51,85 @@ class ResUsers(models.Model):
         self.sudo().set_groups_from_roles()
         return res
 
-    def _get_enabled_roles(self):
-        return self.role_line_ids.filtered(lambda rec: rec.is_enabled)
-
     def set_groups_from_roles(self, force=False):
         """Set (replace) the groups following the roles defined on users.
         If no role is defined on the user, its groups are let untouched unless
         the `force` parameter is `True`.
+
+        The target groups of all the users are computed in one pass, then
+        only the difference with their current groups is inserted in or
+        deleted from the relation table, and the caches are cleared once.
+        The users whose groups changed are checked to still have a single
+        user type, as the ORM write of `groups_id` does.
         """
+        if not self:
+            return True
         role_groups = {}
-        # We obtain all the groups associated to each role first, so that
-        # it is faster to compare later with each user's groups.
-        for role in self.mapped("role_line_ids.role_id"):
-            role_groups[role] = list(
-                set(
+        target_groups = {user_id: set() for user_id in self.ids} if force else {}
+        role_lines = self.env["res.users.role.line"].sudo().search(
+            [("user_id", "in", self.ids)]
+        )
+        for role_line in role_lines:
+            group_ids = target_groups.setdefault(role_line.user_id.id, set())
+            if not role_line.is_enabled:
+                continue
+            role = role_line.role_id
+            # We obtain all the groups associated to each role only once
+            if role not in role_groups:
+                role_groups[role] = set(
                     role.group_id.ids
                     + role.implied_ids.ids
                     + role.trans_implied_ids.ids
                 )
+            group_ids |= role_groups[role]
+        if not target_groups:
+            return True
+        self.flush_model(["groups_id"])
+        self.env.cr.execute(
+            "SELECT uid, gid FROM res_groups_users_rel WHERE uid IN %s",
+            (tuple(target_groups),),
+        )
+        current = set(self.env.cr.fetchall())
+        target = {
+            (user_id, group_id)
+            for user_id, group_ids in target_groups.items()
+            for group_id in group_ids
+        }
+        to_remove = current - target
+        to_add = target - current
+        if to_remove:
+            user_ids, group_ids = zip(*to_remove)
+            self.env.cr.execute(
+                """
+                DELETE FROM res_groups_users_rel rel
+                 USING unnest(%s, %s) AS diff(uid, gid)
+                 WHERE rel.uid = diff.uid AND rel.gid = diff.gid
+                """,
+                (list(user_ids), list(group_ids)),
             )
-        for user in self:
-            if not user.role_line_ids and not force:
-                continue
-            group_ids = []
-            for role_line in user._get_enabled_roles():
-                role = role_line.role_id
-                group_ids += role_groups[role]
-            group_ids = list(set(group_ids))  # Remove duplicates IDs
-            groups_to_add = list(set(group_ids) - set(user.groups_id.ids))
-            groups_to_remove = list(set(user.groups_id.ids) - set(group_ids))
-            to_add = [(4, gr) for gr in groups_to_add]
-            to_remove = [(3, gr) for gr in groups_to_remove]
-            groups = to_remove + to_add
-            if groups:
-                vals = {"groups_id": groups}
-                super(ResUsers, user).write(vals)
+        if to_add:
+            user_ids, group_ids = zip(*to_add)
+            self.env.cr.execute(
+                """
+                INSERT INTO res_groups_users_rel (uid, gid)
+                SELECT uid, gid FROM unnest(%s, %s) AS diff(uid, gid)
+                ON CONFLICT DO NOTHING
+                """,
+                (list(user_ids), list(group_ids)),
+            )
+        if to_remove or to_add:
+            changed = self.browse(
+                {user_id for user_id, _group_id in to_remove | to_add}
+            )
+            changed._groups_updated()
+            # Same user type check as writing `groups_id` through the ORM
+            changed._check_one_user_type()
         return True
+
+    def _groups_updated(self):
+        """Invalidate the caches once the groups of the users were changed
+        in SQL, as writing `groups_id` would do"""
+        self.invalidate_recordset(["groups_id"])
+        self.env["res.groups"].invalidate_model(["users"])
+        self.modified(["groups_id"])
+        self.env["ir.model.access"].call_cache_clearing_methods()
@@ -225,3 +225,59 @@ class TestUserRole(TransactionCase):
             AccessError, "You are not allowed to access 'User role'"
         ):
             role.read()
+
+    def test_role_write_updates_all_users(self):
+        users = self.user_model.create(
+            [
+                {
+                    "name": "USER TEST (BULK ROLES) %s" % index,
+                    "login": "user_test_bulk_roles_%s" % index,
+                    "role_line_ids": [(0, 0, {"role_id": self.role1_id.id})],
+                }
+                for index in range(5)
+            ]
+        )
+        self.role1_id.write({"implied_ids": [(4, self.group_multi_currency_id.id)]})
+        role_group_ids = set(
+            self.role1_id.trans_implied_ids.ids + self.role1_id.group_id.ids
+        )
+        for user in users:
+            self.assertEqual(set(user.groups_id.ids), role_group_ids)
+            self.assertTrue(user.has_group("base.group_multi_currency"))
+
+    def test_cron_update_users_changed_lines(self):
+        self.user_id.write({"role_line_ids": [(0, 0, {"role_id": self.role1_id.id})]})
+        user_group_ids = set(self.user_id.groups_id.ids)
+        self.env["ir.config_parameter"].sudo().set_param(
+            "base_user_role.last_update_users",
+            fields.Datetime.to_string(
+                fields.Datetime.now() + datetime.timedelta(minutes=1)
+            ),
+        )
+        # Role line created without updating the user groups
+        other_user = self.user_model.create(
+            {"name": "USER TEST (CRON ROLES)", "login": "user_test_cron_roles"}
+        )
+        self.env["res.users.role.line"].create(
+            {"user_id": other_user.id, "role_id": self.role2_id.id}
+        )
+        self.env.cr.execute(
+            "UPDATE res_users_role_line SET write_date = %s WHERE user_id = %s",
+            (fields.Datetime.now() + datetime.timedelta(minutes=2), other_user.id),
+        )
+        self.env["res.users.role.line"].invalidate_model(["write_date"])
+        # Groups of a user whose role lines did not change are left untouched
+        self.env.cr.execute(
+            "DELETE FROM res_groups_users_rel WHERE uid = %s AND gid = %s",
+            (self.user_id.id, self.group_no_one_id.id),
+        )
+        self.user_id.invalidate_recordset(["groups_id"])
+        self.role_model.cron_update_users()
+        role_group_ids = set(
+            self.role2_id.trans_implied_ids.ids + self.role2_id.group_id.ids
+        )
+        self.assertEqual(set(other_user.groups_id.ids), role_group_ids)
+        self.assertEqual(
+            set(self.user_id.groups_id.ids),
+            user_group_ids - {self.group_no_one_id.id},
+        )
@@ -4,27 +4,8 @@ from odoo.exceptions import UserError
 import logging
 
 _logger = logging.getLogger(__name__)
-class CalendarWorkplanPlan(models.Model):
-    _inherit = 'calendar_workplan.plan'
-    
-    qualitative_analysis = fields.Text("Análisis cualitativo")
 
-    def _get_evaluation_prompt(self):
-        self.ensure_one()
-        events = self.inherited_meeting_ids.filtered(lambda e: e.start and e.start < fields.Datetime.now())
-
-        event_lines = []
-        for event in events:
-            realizado = 'Sí' if any(att.has_participated for att in event.attendee_ids) else 'No'
-            event_lines.append(
-                f"- [Nombre: {event.name}, "
-                f"Planificado: {event.start.strftime('%Y-%m-%d')}, "
-                f"Realizado: {realizado}, "
-                f"Sección: {event.section_id.name if event.section_id else 'N/A'}, "
-                f"Prioridad: {event.priority}]"
-            )
-
-        prompt_header = """
+EVALUATION_PROMPT_HEADER = """
 Eres un analista experto en productividad y gestión de trabajo asistido por IA.
 A continuación se listan los eventos planificados en un plan de trabajo. Cada evento tiene su fecha programada, la sección responsable, y un indicador de si hubo participación registrada (realizado: Sí/No). 
 Existen eventos con prioridad 1, que son actividades principales dentro del mes.
@@ -49,24 +30,146 @@ Con esta información, evalúa el desempeño en el período que comprenden las t
 
 Eventos a evaluar:
 """
-        prompt = prompt_header + "\n" + "\n".join(event_lines)
 
+
+class CalendarWorkplanPlan(models.Model):
+    _inherit = 'calendar_workplan.plan'
+    
+    qualitative_analysis = fields.Text("Análisis cualitativo")
+    evaluation_pending = fields.Boolean("Evaluación IA pendiente", copy=False, index=True)
+
+    def _get_evaluation_events(self):
+        """
+        Eventos ya iniciados de cada plan (los del plan y los de sus planes
+        padres dentro del período, como ``inherited_meeting_ids``) con su
+        participación, obtenidos con una sola consulta agrupada
+
+        :return: diccionario {plan_id: [(nombre, inicio, realizado, sección, prioridad)]}
+        """
+        result = {plan_id: [] for plan_id in self.ids}
+        if not self.ids:
+            return result
+        self.flush_model(['parent_path', 'plan_tz', 'date_start', 'date_end', 'scope', 'presented_by_partner_id'])
+        self.env['calendar.event'].flush_model(['name', 'start', 'active', 'workplan_id', 'section_id', 'priority', 'partner_ids'])
+        self.env['calendar.attendee'].flush_model(['event_id', 'has_participated'])
+        self.env['calendar_workplan.section'].flush_model(['name'])
+        self.env.cr.execute("""
+            SELECT plan.id, event.name, event.start,
+                   BOOL_OR(COALESCE(att.has_participated, FALSE)),
+                   section.name, event.priority
+              FROM calendar_workplan_plan plan
+              JOIN calendar_workplan_plan ancestor
+                   ON plan.parent_path LIKE ancestor.parent_path || '%%'
+              JOIN calendar_event event
+                   ON event.workplan_id = ancestor.id AND event.active
+         LEFT JOIN calendar_workplan_section section ON section.id = event.section_id
+         LEFT JOIN calendar_attendee att ON att.event_id = event.id
+             WHERE plan.id IN %(plan_ids)s
+               AND event.start < %(now)s
+               AND (event.start AT TIME ZONE 'UTC' AT TIME ZONE plan.plan_tz)::date
+                   BETWEEN plan.date_start AND plan.date_end
+               AND (plan.scope != 'individual' OR EXISTS (
+                       SELECT 1 FROM calendar_event_res_partner_rel rel
+                        WHERE rel.calendar_event_id = event.id
+                          AND rel.res_partner_id = plan.presented_by_partner_id))
+          GROUP BY plan.id, event.id, section.name
+          ORDER BY plan.id, event.start, event.id
+        """, {'plan_ids': tuple(self.ids), 'now': fields.Datetime.now()})
+        for plan_id, *event in self.env.cr.fetchall():
+            result[plan_id].append(event)
+        return result
+
+    def _get_evaluation_prompts(self):
+        """ Prompt de evaluación de cada plan: {plan_id: prompt} """
+        prompts = {}
+        for plan_id, events in self._get_evaluation_events().items():
+            event_lines = [
+                f"- [Nombre: {name}, "
+                f"Planificado: {start.strftime('%Y-%m-%d')}, "
+                f"Realizado: {'Sí' if participated else 'No'}, "
+                f"Sección: {section or 'N/A'}, "
+                f"Prioridad: {priority}]"
+                for name, start, participated, section, priority in events
+            ]
+            prompts[plan_id] = EVALUATION_PROMPT_HEADER + "\n" + "\n".join(event_lines)
+        return prompts
+
+    def _get_evaluation_prompt(self):
+        self.ensure_one()
+        return self._get_evaluation_prompts()[self.id]
+
+    def _post_evaluation_prompt(self, prompt):
         # Registrar el prompt como nota en el plan
         self.message_post(
             body=f"<b>Prompt usado para la evaluación IA:</b><br/><pre>{prompt}</pre>",
             subtype_xmlid="mail.mt_note"
         )
 
-        try:
-            response = self.env['asi_ia.service'].get_ai_response(prompt)
-            self.qualitative_analysis = response
-            return response
-        except Exception as e:
-            raise UserError(_("No se pudo obtener la evaluación: %s") % str(e))
+    def _generate_evaluations(self, commit=False):
+        """
+        Evalúa los planes consultando la IA en paralelo y guarda cada
+        análisis en cuanto llega su respuesta. Con ``commit`` se confirma la
+        transacción tras cada plan, para no perder lo ya evaluado si el
+        proceso se interrumpe (solo debe usarse desde el cron).
+        """
+        prompts = self._get_evaluation_prompts()
+        for plan in self:
+            plan._post_evaluation_prompt(prompts[plan.id])
+        if commit:
+            self.env.cr.commit()
+        responses = self.env['asi_ia.service'].get_ai_responses(prompts)
+        for plan_id, response, error in responses:
+            plan = self.browse(plan_id)
+            if error:
+                plan.message_post(
+                    body=_("No se pudo obtener la evaluación: %s") % error,
+                    subtype_xmlid="mail.mt_note"
+                )
+            else:
+                plan.write({'qualitative_analysis': response})
+            plan.evaluation_pending = False
+            if commit:
+                self.env.cr.commit()
 
     def action_generate_evaluation(self):
-        for record in self:
-            prompt = record._get_evaluation_prompt()
-            response = self.env['asi_ia.service'].get_ai_response(prompt)
-            record.qualitative_analysis = response
-        return True    
\ No newline at end of file
+        if len(self) == 1:
+            prompt = self._get_evaluation_prompt()
+            self._post_evaluation_prompt(prompt)
+            try:
+                self.qualitative_analysis = self.env['asi_ia.service'].get_ai_response(prompt)
+            except Exception as e:
+                raise UserError(_("No se pudo obtener la evaluación: %s") % str(e))
+            return True
+        self._queue_evaluations()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'info',
+                'message': _("Se evaluarán %s planes en segundo plano.") % len(self),
+                'sticky': False,
+            },
+        }
+
+    def _queue_evaluations(self):
+        self.write({'evaluation_pending': True})
+        self.env.ref('calendar_workplan_evaluation.ir_cron_generate_evaluation')._trigger()
+
+    @api.model
+    def queue_period_evaluations(self, date_start, date_end):
+        """ Encola la evaluación de todos los planes individuales del período """
+        plans = self.search([
+            ('scope', '=', 'individual'),
+            ('date_start', '>=', date_start),
+            ('date_end', '<=', date_end),
+        ])
+        if plans:
+            plans._queue_evaluations()
+        return plans
+
+    @api.model
+    def _cron_generate_evaluations(self, batch_size=50):
+        plans = self.search([('evaluation_pending', '=', True)], limit=batch_size)
+        plans._generate_evaluations(commit=True)
+        if self.search_count([('evaluation_pending', '=', True)]):
+            self.env.ref('calendar_workplan_evaluation.ir_cron_generate_evaluation')._trigger()
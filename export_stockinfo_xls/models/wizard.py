@@ -92,21 +92,17 @@ class StockReport(models.TransientModel):
                AND s_p_t.warehouse_id = %s AND p_o_l.product_id in %s group by p_o_l.product_id"""
         params = warehouse_ids, product_ids if product_ids else (0, 0)
         self._cr.execute(sale_query, params)
-        sol_query_obj = self._cr.dictfetchall()
+        sale_values = {row['product_id']: row['product_uom_qty'] for row in self._cr.dictfetchall()}
         self._cr.execute(purchase_query, params)
-        pol_query_obj = self._cr.dictfetchall()
+        purchase_values = {row['product_id']: row['product_qty'] for row in self._cr.dictfetchall()}
+        # Compute the stock quantities of the whole product set at once
+        quantities = categ_products.with_context(warehouse=warehouse_ids)._compute_quantities_dict(
+            self._context.get('lot_id'), self._context.get('owner_id'), self._context.get('package_id'))
         for obj in categ_products:
-            sale_value = 0
-            purchase_value = 0
-            for sol_product in sol_query_obj:
-                if sol_product['product_id'] == obj.id:
-                    sale_value = sol_product['product_uom_qty']
-            for pol_product in pol_query_obj:
-                if pol_product['product_id'] == obj.id:
-                    purchase_value = pol_product['product_qty']
-            virtual_available = obj.with_context({'warehouse': warehouse_ids}).virtual_available
-            outgoing_qty = obj.with_context({'warehouse': warehouse_ids}).outgoing_qty
-            incoming_qty = obj.with_context({'warehouse': warehouse_ids}).incoming_qty
+            product_quantities = quantities[obj.id]
+            virtual_available = product_quantities['virtual_available']
+            outgoing_qty = product_quantities['outgoing_qty']
+            incoming_qty = product_quantities['incoming_qty']
             available_qty = virtual_available + outgoing_qty - incoming_qty
             value = available_qty * obj.standard_price
             vals = {
@@ -118,17 +114,17 @@ class StockReport(models.TransientModel):
                 'virtual': virtual_available,
                 'incoming': incoming_qty,
                 'outgoing': outgoing_qty,
-                'net_on_hand': obj.with_context({'warehouse': warehouse_ids}).qty_available,
+                'net_on_hand': product_quantities['qty_available'],
                 'total_value': value,
-                'sale_value': sale_value,
-                'purchase_value': purchase_value,
+                'sale_value': sale_values.get(obj.id, 0),
+                'purchase_value': purchase_values.get(obj.id, 0),
             }
             lines.append(vals)
         return lines
 
     def get_xlsx_report(self, data, response):
         output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
         lines = self.browse(data['ids'])
         d = lines.category_ids
         get_warehouse = self.get_warehouse(lines)
@@ -192,59 +188,36 @@ class StockReport(models.TransientModel):
             sheet.merge_range(9, p_col_no1 + 8, 9, p_col_no1 + 9, 'Total Purchased', format21)
             sheet.write(9, p_col_no1 + 10, 'Valuation', format21)
             p_col_no1 = p_col_no1 + 11
+        # Rows are written in order (constant memory mode): product
+        # information first, then one block of columns per warehouse
+        warehouse_lines = [self.get_lines(d, i) for i in get_warehouse[1]]
         prod_row = 10
-        prod_col = 0
-        for i in get_warehouse[1]:
-            get_line = self.get_lines(d, i)
-            for each in get_line:
-                sheet.write(prod_row, prod_col, each['sku'], font_size_8)
-                sheet.merge_range(prod_row, prod_col + 1, prod_row, prod_col + 3, each['name'], font_size_8_l)
-                sheet.merge_range(prod_row, prod_col + 4, prod_row, prod_col + 5, each['category'], font_size_8_l)
-                sheet.write(prod_row, prod_col + 6, each['cost_price'], font_size_8_r)
-                prod_row = prod_row + 1
-            break
-        prod_row = 10
-        prod_col = 7
-        for i in get_warehouse[1]:
-            get_line = self.get_lines(d, i)
-            for each in get_line:
-                if each['available'] < 0:
-                    sheet.write(prod_row, prod_col, each['available'], red_mark)
-                else:
-                    sheet.write(prod_row, prod_col, each['available'], font_size_8)
-                if each['virtual'] < 0:
-                    sheet.write(prod_row, prod_col + 1, each['virtual'], red_mark)
-                else:
-                    sheet.write(prod_row, prod_col + 1, each['virtual'], font_size_8)
-                if each['incoming'] < 0:
-                    sheet.write(prod_row, prod_col + 2, each['incoming'], red_mark)
-                else:
-                    sheet.write(prod_row, prod_col + 2, each['incoming'], font_size_8)
-                if each['outgoing'] < 0:
-                    sheet.write(prod_row, prod_col + 3, each['outgoing'], red_mark)
-                else:
-                    sheet.write(prod_row, prod_col + 3, each['outgoing'], font_size_8)
-                if each['net_on_hand'] < 0:
-                    sheet.merge_range(prod_row, prod_col + 4, prod_row, prod_col + 5, each['net_on_hand'], red_mark)
-                else:
-                    sheet.merge_range(prod_row, prod_col + 4, prod_row, prod_col + 5, each['net_on_hand'], font_size_8)
-                    if each['sale_value'] < 0:
-                        sheet.merge_range(prod_row, prod_col + 6, prod_row, prod_col + 7, each['sale_value'], red_mark)
-                    else:
-                        sheet.merge_range(prod_row, prod_col + 6, prod_row, prod_col + 7, each['sale_value'],
-                                          font_size_8)
-                if each['purchase_value'] < 0:
-                    sheet.merge_range(prod_row, prod_col + 8, prod_row, prod_col + 9, each['purchase_value'], red_mark)
-                else:
-                    sheet.merge_range(prod_row, prod_col + 8, prod_row, prod_col + 9, each['purchase_value'],
-                                      font_size_8)
-                if each['total_value'] < 0:
-                    sheet.write(prod_row, prod_col + 10, each['total_value'], red_mark)
-                else:
-                    sheet.write(prod_row, prod_col + 10, each['total_value'], font_size_8_r)
-                prod_row = prod_row + 1
-            prod_row = 10
-            prod_col = prod_col + 11
+        for index, product_line in enumerate(warehouse_lines[0] if warehouse_lines else []):
+            sheet.write(prod_row, 0, product_line['sku'], font_size_8)
+            sheet.merge_range(prod_row, 1, prod_row, 3, product_line['name'], font_size_8_l)
+            sheet.merge_range(prod_row, 4, prod_row, 5, product_line['category'], font_size_8_l)
+            sheet.write(prod_row, 6, product_line['cost_price'], font_size_8_r)
+            prod_col = 7
+            for get_line in warehouse_lines:
+                each = get_line[index]
+                sheet.write(prod_row, prod_col, each['available'],
+                            red_mark if each['available'] < 0 else font_size_8)
+                sheet.write(prod_row, prod_col + 1, each['virtual'],
+                            red_mark if each['virtual'] < 0 else font_size_8)
+                sheet.write(prod_row, prod_col + 2, each['incoming'],
+                            red_mark if each['incoming'] < 0 else font_size_8)
+                sheet.write(prod_row, prod_col + 3, each['outgoing'],
+                            red_mark if each['outgoing'] < 0 else font_size_8)
+                sheet.merge_range(prod_row, prod_col + 4, prod_row, prod_col + 5, each['net_on_hand'],
+                                  red_mark if each['net_on_hand'] < 0 else font_size_8)
+                sheet.merge_range(prod_row, prod_col + 6, prod_row, prod_col + 7, each['sale_value'],
+                                  red_mark if each['sale_value'] < 0 else font_size_8)
+                sheet.merge_range(prod_row, prod_col + 8, prod_row, prod_col + 9, each['purchase_value'],
+                                  red_mark if each['purchase_value'] < 0 else font_size_8)
+                sheet.write(prod_row, prod_col + 10, each['total_value'],
+                            red_mark if each['total_value'] < 0 else font_size_8_r)
+                prod_col = prod_col + 11
+            prod_row = prod_row + 1
         workbook.close()
         output.seek(0)
         response.stream.write(output.read())
@@ -11,6 +11,8 @@ class FSMLocation(models.Model):
     _inherit = ["mail.thread", "mail.activity.mixin", "fsm.model.mixin"]
     _description = "Field Service Location"
     _stage_type = "location"
+    _parent_name = "fsm_parent_id"
+    _parent_store = True
 
     direction = fields.Char()
     partner_id = fields.Many2one(
@@ -54,16 +56,17 @@ class FSMLocation(models.Model):
 
     calendar_id = fields.Many2one("resource.calendar", string="Office Hours")
     fsm_parent_id = fields.Many2one("fsm.location", string="Parent", index=True)
+    parent_path = fields.Char(index=True, unaccent=False)
     notes = fields.Text(string="Location Notes")
     person_ids = fields.One2many("fsm.location.person", "location_id", string="Workers")
     contact_count = fields.Integer(
-        string="Contacts Count", compute="_compute_contact_ids"
+        string="Contacts Count", compute="_compute_location_counts"
     )
     equipment_count = fields.Integer(
-        string="Equipment", compute="_compute_equipment_ids"
+        string="Equipment", compute="_compute_location_counts"
     )
     sublocation_count = fields.Integer(
-        string="Sub Locations", compute="_compute_sublocation_ids"
+        string="Sub Locations", compute="_compute_location_counts"
     )
     complete_name = fields.Char(
         compute="_compute_complete_name", recursive=True, store=True
@@ -148,79 +151,66 @@ class FSMLocation(models.Model):
     def _onchange_region_id(self):
         self.region_manager_id = self.region_id.partner_id or False
 
+    def _compute_location_counts(self):
+        """Count sub-locations, equipment and contacts of the whole subtree
+        of every location in ``self`` with one prefix query on
+        ``parent_path`` and one grouped count per related model."""
+        counts = {
+            loc_id: {"contact": 0, "equipment": 0, "sublocation": 0}
+            for loc_id in self._origin.ids
+        }
+        if counts:
+            nodes = self.search_read([("id", "child_of", list(counts))], ["parent_path"])
+            node_ids = [node["id"] for node in nodes]
+            equipment = self._count_by_location(
+                "fsm.equipment", "location_id", node_ids
+            )
+            contacts = self._count_by_location(
+                "res.partner", "service_location_id", node_ids
+            )
+            for node in nodes:
+                for ancestor_id in map(int, node["parent_path"].split("/")[:-1]):
+                    if ancestor_id not in counts:
+                        continue
+                    ancestor = counts[ancestor_id]
+                    ancestor["equipment"] += equipment.get(node["id"], 0)
+                    ancestor["contact"] += contacts.get(node["id"], 0)
+                    if ancestor_id != node["id"]:
+                        ancestor["sublocation"] += 1
+        for loc in self:
+            loc_counts = counts.get(
+                loc._origin.id, {"contact": 0, "equipment": 0, "sublocation": 0}
+            )
+            loc.contact_count = loc_counts["contact"]
+            loc.equipment_count = loc_counts["equipment"]
+            loc.sublocation_count = loc_counts["sublocation"]
+
+    @api.model
+    def _count_by_location(self, model_name, field_name, location_ids):
+        groups = self.env[model_name].read_group(
+            [(field_name, "in", location_ids)], [field_name], [field_name]
+        )
+        return {
+            group[field_name][0]: group["%s_count" % field_name] for group in groups
+        }
+
     def comp_count(self, contact, equipment, loc):
         if equipment:
-            for child in loc:
-                child_locs = self.env["fsm.location"].search(
-                    [("fsm_parent_id", "=", child.id)]
-                )
-                equip = self.env["fsm.equipment"].search_count(
-                    [("location_id", "=", child.id)]
-                )
-            if child_locs:
-                for loc in child_locs:
-                    equip += loc.comp_count(0, 1, loc)
-            return equip
+            return loc.equipment_count
         elif contact:
-            for child in loc:
-                child_locs = self.env["fsm.location"].search(
-                    [("fsm_parent_id", "=", child.id)]
-                )
-                con = self.env["res.partner"].search_count(
-                    [("service_location_id", "=", child.id)]
-                )
-            if child_locs:
-                for loc in child_locs:
-                    con += loc.comp_count(1, 0, loc)
-            return con
-        else:
-            for child in loc:
-                child_locs = self.env["fsm.location"].search(
-                    [("fsm_parent_id", "=", child.id)]
-                )
-                subloc = self.env["fsm.location"].search_count(
-                    [("fsm_parent_id", "=", child.id)]
-                )
-            if child_locs:
-                for loc in child_locs:
-                    subloc += loc.comp_count(0, 0, loc)
-            return subloc
+            return loc.contact_count
+        return loc.sublocation_count
 
     def get_action_views(self, contact, equipment, loc):
         if equipment:
-            for child in loc:
-                child_locs = self.env["fsm.location"].search(
-                    [("fsm_parent_id", "=", child.id)]
-                )
-                equip = self.env["fsm.equipment"].search(
-                    [("location_id", "=", child.id)]
-                )
-            if child_locs:
-                for loc in child_locs:
-                    equip += loc.get_action_views(0, 1, loc)
-            return equip
+            return self.env["fsm.equipment"].search(
+                [("location_id", "child_of", loc.ids)]
+            )
         elif contact:
-            for child in loc:
-                child_locs = self.env["fsm.location"].search(
-                    [("fsm_parent_id", "=", child.id)]
-                )
-                con = self.env["res.partner"].search(
-                    [("service_location_id", "=", child.id)]
-                )
-            if child_locs:
-                for loc in child_locs:
-                    con += loc.get_action_views(1, 0, loc)
-            return con
-        else:
-            for child in loc:
-                child_locs = self.env["fsm.location"].search(
-                    [("fsm_parent_id", "=", child.id)]
-                )
-                subloc = child_locs
-            if child_locs:
-                for loc in child_locs:
-                    subloc += loc.get_action_views(0, 0, loc)
-            return subloc
+            return self.env["res.partner"].search(
+                [("service_location_id", "child_of", loc.ids)]
+            )
+        return self.search([("id", "child_of", loc.ids), ("id", "not in", loc.ids)])
 
     def action_view_contacts(self):
         """
@@ -246,11 +236,6 @@ class FSMLocation(models.Model):
                 action["res_id"] = contacts.id
             return action
 
-    def _compute_contact_ids(self):
-        for loc in self:
-            contacts = self.comp_count(1, 0, loc)
-            loc.contact_count = contacts
-
     def action_view_equipment(self):
         """
         This function returns an action that display existing
@@ -277,10 +262,6 @@ class FSMLocation(models.Model):
                 action["res_id"] = equipment.id
             return action
 
-    def _compute_sublocation_ids(self):
-        for loc in self:
-            loc.sublocation_count = self.comp_count(0, 0, loc)
-
     def action_view_sublocation(self):
         """
         This function returns an action that display existing
@@ -310,10 +291,6 @@ class FSMLocation(models.Model):
     def geo_localize(self):
         return self.partner_id.geo_localize()
 
-    def _compute_equipment_ids(self):
-        for loc in self:
-            loc.equipment_count = self.comp_count(0, 1, loc)
-
     @api.constrains("fsm_parent_id")
     def _check_location_recursion(self):
         if not self._check_recursion(parent="fsm_parent_id"):
@@ -210,6 +210,39 @@ class FSMLocation(TransactionCase):
             (4, 3, 2, 1),
         )
 
+    def test_fsm_location_parent_path_counts(self):
+        """Test counters computed for a whole recordset from parent_path
+        - Hierarchy is stored as a materialized path
+        - Counters follow a moved branch
+        """
+        self.location_3.fsm_parent_id = self.location_2
+        self.location_2.fsm_parent_id = self.location_1
+        self.location_1.fsm_parent_id = self.test_location
+        self.assertTrue(
+            self.location_3.parent_path.startswith(self.location_2.parent_path)
+        )
+        self.assertTrue(
+            self.location_2.parent_path.startswith(self.test_location.parent_path)
+        )
+        locations = (
+            self.test_location | self.location_1 | self.location_2 | self.location_3
+        )
+        for location in locations:
+            self.Equipment.create(
+                {
+                    "name": "Eq-{}".format(location.id),
+                    "location_id": location.id,
+                    "current_location_id": location.id,
+                }
+            )
+        self.assertEqual(locations.mapped("sublocation_count"), [3, 2, 1, 0])
+        self.assertEqual(locations.mapped("equipment_count"), [4, 3, 2, 1])
+        # Detach Location 2 (and Location 3 with it) from the tree
+        self.location_2.fsm_parent_id = False
+        locations.invalidate_recordset(["sublocation_count", "equipment_count"])
+        self.assertEqual(locations.mapped("sublocation_count"), [1, 0, 1, 0])
+        self.assertEqual(locations.mapped("equipment_count"), [2, 1, 2, 1])
+
     def test_convert_partner_to_fsm_location(self):
         """
         FSM Location can be created from the res.partner form
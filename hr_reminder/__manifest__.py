@@ -21,7 +21,7 @@
 ###############################################################################
 {
     'name': 'Open HRMS Reminders Todo',
-    'version': '16.0.2.0.0',
+    'version': '16.0.2.1.0',
     'category': 'Generic Modules/Human Resources',
     'summary': 'HR Reminder For OHRMS',
     'author': 'Cybrosys Techno solutions,Open HRMS',
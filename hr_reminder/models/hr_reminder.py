@@ -19,8 +19,8 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 ###############################################################################
-from datetime import datetime
-from odoo import models, fields
+from datetime import timedelta
+from odoo import api, models, fields
 
 
 class HrPopupReminder(models.Model):
@@ -55,33 +55,50 @@ class HrPopupReminder(models.Model):
                                  required=True, help="Company",
                                  default=lambda self: self.env.user.company_id)
 
+    reminder_date_start = fields.Date(
+        string="Reminder Start", index=True,
+        compute='_compute_reminder_dates', store=True,
+        help="First day on which the reminder is shown")
+    reminder_date_end = fields.Date(
+        string="Reminder End", index=True,
+        compute='_compute_reminder_dates', store=True,
+        help="Last day on which the reminder is shown")
+
+    @api.depends('search_by', 'date_set', 'date_from', 'days_before')
+    def _compute_reminder_dates(self):
+        """The reminder is shown the days around the selected date (or the
+        start of the period) within the number of days set"""
+        for reminder in self:
+            reminder_date = False
+            if reminder.search_by == 'set_date':
+                reminder_date = reminder.date_set
+            elif reminder.search_by == 'set_period':
+                reminder_date = reminder.date_from
+            if reminder_date:
+                days = timedelta(days=reminder.days_before)
+                reminder.reminder_date_start = reminder_date - days
+                reminder.reminder_date_end = reminder_date + days
+            else:
+                reminder.reminder_date_start = False
+                reminder.reminder_date_end = False
+
     def reminder_scheduler(self):
-        """function to run the scheduler for reminder"""
-        now = fields.Datetime.from_string(fields.Datetime.now())
+        """function to run the scheduler for reminder.
+        Only the reminders whose state changes today are selected, and
+        they are updated with one write per new state"""
         today = fields.Date.today()
-        obj = self.env['hr.reminder'].search([])
-        for i in obj:
-            if i.search_by != "today":
-                if i.expiry_date and datetime.strptime(str(today),
-                                                       "%Y-%m-%d") == datetime.\
-                        strptime(str(i.expiry_date), "%Y-%m-%d"):
-                    i.active = False
-                else:
-                    if i.search_by == "set_date":
-                        d1 = datetime.strptime(str(i.date_set), "%Y-%m-%d")
-                        d2 = datetime.strptime(str(today), "%Y-%m-%d")
-                        daydiff = abs((d2 - d1).days)
-                        if daydiff <= i.days_before:
-                            i.reminder_active = True
-                        else:
-                            i.reminder_active = False
-                    elif i.search_by == "set_period":
-                        d1 = datetime.strptime(str(i.date_from), "%Y-%m-%d")
-                        d2 = datetime.strptime(str(today), "%Y-%m-%d")
-                        daydiff = abs((d2 - d1).days)
-                        if daydiff <= i.days_before:
-                            i.reminder_active = True
-                        else:
-                            i.reminder_active = False
-            else:
-                i.reminder_active = True
+        self.search([('search_by', '!=', 'today'),
+                     ('expiry_date', '=', today)]).write({'active': False})
+        self.search([
+            ('reminder_active', '=', False),
+            '|', ('search_by', '=', 'today'),
+            '&', ('reminder_date_start', '<=', today),
+            ('reminder_date_end', '>=', today),
+        ]).write({'reminder_active': True})
+        self.search([
+            ('reminder_active', '=', True),
+            ('search_by', '!=', 'today'),
+            '|', '|', ('reminder_date_start', '=', False),
+            ('reminder_date_start', '>', today),
+            ('reminder_date_end', '<', today),
+        ]).write({'reminder_active': False})
@@ -21,7 +21,7 @@
 ################################################################################
 {
     'name': 'Import Bank Statement',
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.0.1',
     'category': 'Accounting',
     'summary': 'Import bank statement in CSV, XLSX, QIF and OFX format',
     'description': """Uploading the data in CSV, XLSX, OFX and QIF format and 
@@ -43,6 +43,28 @@ class ImportBankStatement(models.TransientModel):
     journal_id = fields.Many2one('account.journal', string="Journal ID",
                                  help="Journal in which the file importing")
 
+    def _get_partner_map(self, names):
+        """Map each of the names to the id of the first partner having it,
+        with a single search"""
+        partner_map = {}
+        names = list(set(names))
+        if names:
+            for partner in self.env['res.partner'].search_read(
+                    [('name', 'in', names)], ['name']):
+                partner_map.setdefault(partner['name'], partner['id'])
+        return partner_map
+
+    def _create_statements(self, statement_vals):
+        """Create the statements in one batch and open them"""
+        statements = self.env['account.bank.statement'].create(statement_vals)
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Statements',
+            'view_mode': 'tree',
+            'res_model': 'account.bank.statement',
+            'res_id': statements[-1:].id,
+        }
+
     def action_statement_import(self):
         """Function to import csv, xlsx, ofx and qif file format"""
         split_tup = os.path.splitext(self.file_name)
@@ -56,146 +78,111 @@ class ImportBankStatement(models.TransientModel):
                     file_string = file_string.split('\n')
                 except:
                     raise ValidationError(_("Choose correct file"))
-                # Skipping the first line
-                firstline = True
-                for file_item in file_string:
-                    if firstline:
-                        firstline = False
-                        continue
+                # Skipping the first line and splitting each line once
+                rows = [file_item.split(',') for file_item in file_string[1:]]
+                rows = [row for row in rows if row != ['']]
+                partner_map = self._get_partner_map(
+                    row[4] for row in rows if row[0] and row[1] and row[4])
+                statement_vals = []
+                for row in rows:
                     # Reading the content from csv file
-                    if file_item.split(',') != ['']:
-                        if file_item.split(',')[0] and file_item.split(',')[1] \
-                                and file_item.split(',')[4]:
-                            date_obj = str(fields.date.today()) if not \
-                                file_item.split(',')[3] else \
-                                file_item.split(',')[
-                                    3]
-                            transaction_date = datetime.strptime(date_obj,
-                                                                 "%Y-%m-%d")
-                            partner = self.env['res.partner'].search(
-                                [('name', '=', file_item.split(',')[4])])
-                            # Creating a record in account.bank.statement model
-                            if partner:
-                                statement = self.env[
-                                    'account.bank.statement'].create({
-                                     'name': file_item.split(',')[0],
-                                     'line_ids': [
-                                        (0, 0, {
-                                            'date': transaction_date,
-                                            'payment_ref': 'csv file',
-                                            'partner_id': partner.id,
-                                            'journal_id': self.journal_id.id,
-                                            'amount': file_item.split(',')[1],
-                                            'amount_currency':
-                                                file_item.split(',')[2],
-                                        }),
-                                    ],
-                                })
-                            else:
-                                raise ValidationError(_("Partner not exist"))
-                        else:
-                            if not file_item.split(',')[0]:
-                                raise ValidationError(
-                                    _("Account name is not set"))
-                            elif not file_item.split(',')[1]:
-                                raise ValidationError(
-                                    _("Amount is not set"))
-                            elif not file_item.split(',')[4]:
-                                date_obj = str(fields.date.today()) if not \
-                                    file_item.split(',')[3] else \
-                                    file_item.split(',')[
-                                        3]
-                                transaction_date = datetime.strptime(date_obj,
-                                                                     "%Y-%m-%d")
-                                # Creating a record in account.bank.statement model
-                                statement = self.env[
-                                    'account.bank.statement'].create({
-                                    'name': file_item.split(',')[0],
-                                    'line_ids': [
-                                        (0, 0, {
-                                            'date': transaction_date,
-                                            'payment_ref': 'csv file',
-                                            'journal_id': self.journal_id.id,
-                                            'amount': file_item.split(',')[
-                                                1],
-                                            'amount_currency':
-                                                file_item.split(',')[2],
-                                        }),
-                                    ],
-                                })
-                return {
-                    'type': 'ir.actions.act_window',
-                    'name': 'Statements',
-                    'view_mode': 'tree',
-                    'res_model': 'account.bank.statement',
-                    'res_id': statement.id,
-                }
+                    if row[0] and row[1] and row[4]:
+                        date_obj = str(fields.date.today()) if not row[3] \
+                            else row[3]
+                        transaction_date = datetime.strptime(date_obj,
+                                                             "%Y-%m-%d")
+                        if row[4] not in partner_map:
+                            raise ValidationError(_("Partner not exist"))
+                        statement_vals.append({
+                            'name': row[0],
+                            'line_ids': [
+                                (0, 0, {
+                                    'date': transaction_date,
+                                    'payment_ref': 'csv file',
+                                    'partner_id': partner_map[row[4]],
+                                    'journal_id': self.journal_id.id,
+                                    'amount': row[1],
+                                    'amount_currency': row[2],
+                                }),
+                            ],
+                        })
+                    elif not row[0]:
+                        raise ValidationError(_("Account name is not set"))
+                    elif not row[1]:
+                        raise ValidationError(_("Amount is not set"))
+                    else:
+                        date_obj = str(fields.date.today()) if not row[3] \
+                            else row[3]
+                        transaction_date = datetime.strptime(date_obj,
+                                                             "%Y-%m-%d")
+                        statement_vals.append({
+                            'name': row[0],
+                            'line_ids': [
+                                (0, 0, {
+                                    'date': transaction_date,
+                                    'payment_ref': 'csv file',
+                                    'journal_id': self.journal_id.id,
+                                    'amount': row[1],
+                                    'amount_currency': row[2],
+                                }),
+                            ],
+                        })
+                # Creating the records in account.bank.statement model
+                return self._create_statements(statement_vals)
             elif split_tup[1] == '.xlsx':
-                # Reading xlsx file
+                # Reading xlsx file, the rows are streamed from the sheet
                 try:
                     order = openpyxl.load_workbook(
-                        filename=BytesIO(base64.b64decode(self.attachment)))
+                        filename=BytesIO(base64.b64decode(self.attachment)),
+                        read_only=True)
                     xl_order = order.active
                 except:
                     raise ValidationError(_("Choose correct file"))
-                for record in xl_order.iter_rows(min_row=2, max_row=None,
-                                                 min_col=None,
-                                                 max_col=None,
-                                                 values_only=True):
-                    line = list(record)
+                lines = [list(record) for record in xl_order.iter_rows(
+                    min_row=2, max_row=None, min_col=None, max_col=None,
+                    values_only=True)]
+                partner_map = self._get_partner_map(
+                    line[3] for line in lines if line[0] and line[1] and line[3])
+                statement_vals = []
+                for line in lines:
                     # Reading the content from file
                     if line[0] and line[1] and line[3]:
-                        partner = self.env['res.partner'].search(
-                            [('name', '=', line[3])])
                         date_obj = fields.date.today() if not line[2] else \
                             line[2].date()
-                        # Creating record
-                        if partner:
-                            statement = self.env[
-                                'account.bank.statement'].create({
-                                 'name': line[0],
-                                 'line_ids': [
-                                    (0, 0, {
-                                        'date': date_obj,
-                                        'payment_ref': 'xlsx file',
-                                        'partner_id': partner.id,
-                                        'journal_id': self.journal_id.id,
-                                        'amount': line[1],
-                                    }),
-                                 ],
-                                })
-                        else:
+                        if line[3] not in partner_map:
                             raise ValidationError(_("Partner not exist"))
+                        statement_vals.append({
+                            'name': line[0],
+                            'line_ids': [
+                                (0, 0, {
+                                    'date': date_obj,
+                                    'payment_ref': 'xlsx file',
+                                    'partner_id': partner_map[line[3]],
+                                    'journal_id': self.journal_id.id,
+                                    'amount': line[1],
+                                }),
+                            ],
+                        })
+                    elif not line[0]:
+                        raise ValidationError(_("Account name is not set"))
+                    elif not line[1]:
+                        raise ValidationError(_("Amount is not set"))
                     else:
-                        if not line[0]:
-                            raise ValidationError(
-                                _("Account name is not set"))
-                        elif not line[1]:
-                            raise ValidationError(
-                                _("Amount is not set"))
-                        elif not line[3]:
-                            date_obj = fields.date.today() if not line[2] else \
-                                line[2].date()
-                            # Creating record
-                            statement = self.env[
-                                'account.bank.statement'].create({
-                                'name': line[0],
-                                'line_ids': [
-                                    (0, 0, {
-                                        'date': date_obj,
-                                        'payment_ref': 'xlsx file',
-                                        'journal_id': self.journal_id.id,
-                                        'amount': line[1],
-                                    }),
-                                ],
-                            })
-                return {
-                    'type': 'ir.actions.act_window',
-                    'name': 'Statements',
-                    'view_mode': 'tree',
-                    'res_model': 'account.bank.statement',
-                    'res_id': statement.id,
-                }
+                        date_obj = fields.date.today() if not line[2] else \
+                            line[2].date()
+                        statement_vals.append({
+                            'name': line[0],
+                            'line_ids': [
+                                (0, 0, {
+                                    'date': date_obj,
+                                    'payment_ref': 'xlsx file',
+                                    'journal_id': self.journal_id.id,
+                                    'amount': line[1],
+                                }),
+                            ],
+                        })
+                # Creating records
+                return self._create_statements(statement_vals)
             elif split_tup[1] == '.ofx':
                 # Searching the path of the file
                 file_attachment = self.env["ir.attachment"].search(
@@ -218,55 +205,33 @@ class ImportBankStatement(models.TransientModel):
                 if not ofx_file.account.statement:
                     raise ValidationError(
                         _("No statement information found in OFX file."))
-                statement_list = []
+                transactions = [
+                    transaction for transaction in
+                    ofx_file.account.statement.transactions
+                    if transaction.type in ('debit', 'credit') and
+                    transaction.amount != 0]
+                partner_map = self._get_partner_map(
+                    transaction.payee for transaction in transactions)
+                statement_vals = []
                 # Reading the content from file
-                for transaction in ofx_file.account.statement.transactions:
-                    if transaction.type == "debit" and transaction.amount != 0:
-                        payee = transaction.payee
-                        amount = transaction.amount
-                        date = transaction.date
-                        if not date:
-                            date = fields.date.today()
-                        partner = self.env['res.partner'].search(
-                            [('name', '=', payee)])
-                        if partner:
-                            statement_list.append([partner.id, amount, date])
-                        else:
-                            raise ValidationError(_("Partner not exist"))
-                    if transaction.type == "credit" and transaction.amount != 0:
-                        payee = transaction.payee
-                        amount = transaction.amount
-                        date = transaction.date
-                        if not date:
-                            date = fields.date.today()
-                        partner = self.env['res.partner'].search(
-                            [('name', '=', payee)])
-                        if partner:
-                            statement_list.append([partner.id, amount, date])
-                        else:
-                            raise ValidationError(_("Partner not exist"))
+                for transaction in transactions:
+                    if transaction.payee not in partner_map:
+                        raise ValidationError(_("Partner not exist"))
+                    statement_vals.append({
+                        'name': ofx_file.account.routing_number,
+                        'line_ids': [
+                            (0, 0, {
+                                'date': transaction.date or fields.date.today(),
+                                'payment_ref': 'ofx file',
+                                'partner_id': partner_map[transaction.payee],
+                                'journal_id': self.journal_id.id,
+                                'amount': transaction.amount,
+                            }),
+                        ],
+                    })
                 # Creating record
-                if statement_list:
-                    for item in statement_list:
-                        statement = self.env['account.bank.statement'].create({
-                            'name': ofx_file.account.routing_number,
-                            'line_ids': [
-                                (0, 0, {
-                                    'date': item[2],
-                                    'payment_ref': 'ofx file',
-                                    'partner_id': item[0],
-                                    'journal_id': self.journal_id.id,
-                                    'amount': item[1],
-                                }),
-                            ],
-                        })
-                    return {
-                        'type': 'ir.actions.act_window',
-                        'name': 'Statements',
-                        'view_mode': 'tree',
-                        'res_model': 'account.bank.statement',
-                        'res_id': statement.id,
-                    }
+                if statement_vals:
+                    return self._create_statements(statement_vals)
                 else:
                     raise ValidationError(_("There is no data to import"))
             elif split_tup[1] == '.qif':
@@ -291,7 +256,7 @@ class ImportBankStatement(models.TransientModel):
                 file_item[-1] = file_item[-1].rstrip('\n')
                 if file_item[-1] == '':
                     file_item.pop()
-                statement_list = []
+                statement_vals = []
                 for item in file_item:
                     if not item.startswith('!Type:Bank'):
                         item = '!Type:Bank' + item
@@ -304,33 +269,24 @@ class ImportBankStatement(models.TransientModel):
                         if not date_entry:
                             date_entry = str(fields.date.today())
                         date_object = datetime.strptime(date_entry, '%d/%m/%Y')
-                        date = date_object.strftime('%Y-%m-%d')
-                        statement_list.append([payee, amount, date])
-                    else:
-                        if not amount:
-                            raise ValidationError(_("Amount is not set"))
-                        elif not payee:
-                            raise ValidationError(_("Payee is not set"))
-                # Creating record
-                if statement_list:
-                    for item in statement_list:
-                        statement = self.env['account.bank.statement'].create({
-                            'name': item[0],
+                        statement_vals.append({
+                            'name': payee,
                             'line_ids': [
                                 (0, 0, {
-                                    'date': item[2],
+                                    'date': date_object.strftime('%Y-%m-%d'),
                                     'payment_ref': 'qif file',
                                     'journal_id': self.journal_id.id,
-                                    'amount': item[1],
+                                    'amount': amount,
                                 }),
                             ],
                         })
-                    return {
-                        'type': 'ir.actions.act_window',
-                        'name': 'Statements',
-                        'view_mode': 'tree',
-                        'res_model': 'account.bank.statement',
-                        'res_id': statement.id,
-                    }
+                    else:
+                        if not amount:
+                            raise ValidationError(_("Amount is not set"))
+                        elif not payee:
+                            raise ValidationError(_("Payee is not set"))
+                # Creating record
+                if statement_vals:
+                    return self._create_statements(statement_vals)
         else:
             raise ValidationError(_("Choose correct file"))
@@ -21,7 +21,7 @@
 ###############################################################################
 {
     'name': 'Login using QR Code',
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.1.0',
     'category': 'Extra Tools',
     'summary': 'Users can login by scanning QR Code',
     'description': 'A QR code is generate corresponding to each internal user'
@@ -32,6 +32,7 @@
     'maintainer': 'Cybrosys Techno Solutions',
     'website': 'http://www.cybrosys.com',
     'data': [
+        'security/ir.model.access.csv',
         'views/login_templates.xml',
         'views/res_users_views.xml',
         'views/login_using_qr_templates.xml',
@@ -30,12 +30,12 @@ class LoginController(Controller):
                 csrf=False, csrf_token=None)
     def scanner(self, scanned_qr):
         """This code scans the QR provided and Login to the corresponding user
-        note: Only Internal User can log in through it"""
-        users = request.env['res.users'].sudo().search([('share', '=', False)])
-        login = users.mapped('login')
-        if scanned_qr in login:
+        note: Only Internal User can log in through it. The QR holds a random
+        token that is looked up by its hash"""
+        user = request.env['res.users.qr.token'].sudo()._get_user(scanned_qr)
+        if user:
             request.session.authenticate_without_passwd(
-                            request.session.db, scanned_qr)
+                            request.session.db, user.login)
             return request.redirect('/')
         else:
             return False
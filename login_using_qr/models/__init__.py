@@ -20,3 +20,4 @@
 #
 ###############################################################################
 from . import res_users
+from . import res_users_qr_token
@@ -19,17 +19,8 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
-try:
-    import qrcode
-except ImportError:
-    qrcode = None
-try:
-    import base64
-except ImportError:
-    base64 = None
-from io import BytesIO
-from odoo import fields, models, _
-from odoo.exceptions import UserError
+from odoo import _, api, fields, models
+from odoo.exceptions import AccessError
 
 
 class ResUsers(models.Model):
@@ -39,21 +30,31 @@ class ResUsers(models.Model):
     qr_code = fields.Binary(string='QRcode', compute="_compute_qr_code",
                             help="Use this to login (only for internal users)")
 
+    @api.depends_context('uid')
     def _compute_qr_code(self):
-        """Method to generate QR code"""
-        for detail in self:
-            if qrcode and base64:
-                qr_code = qrcode.QRCode(
-                    version=1,
-                    error_correction=qrcode.constants.ERROR_CORRECT_L,
-                    box_size=3,
-                    border=4,)
-                qr_code.add_data(detail.login)
-                qr_code.make(fit=True)
-                temp = BytesIO()
-                qr_code.make_image().save(temp, format="PNG")
-                detail.update({'qr_code': base64.b64encode(temp.getvalue())})
-            else:
-                raise UserError(
-                    _('Necessary Requirements To Run This Operation Is '
-                      'Not Satisfied'))
+        """The QR code is generated the first time it is displayed, together
+        with a new login token, and kept in the token record afterwards.
+        Only administrators can see the QR code of other users"""
+        is_admin = self.env.user.has_group('base.group_system')
+        internal_users = self.filtered(
+            lambda user: user.id and not user.share
+            and (is_admin or user == self.env.user))
+        tokens = self.env['res.users.qr.token'].sudo().search(
+            [('user_id', 'in', internal_users.ids)])
+        missing_users = internal_users - tokens.user_id
+        if missing_users:
+            tokens |= tokens._create_for_users(missing_users)
+        qr_codes = {token.user_id.id: token.qr_code for token in tokens}
+        for user in self:
+            user.qr_code = qr_codes.get(user.id, False)
+
+    def action_rotate_qr_token(self):
+        """Invalidates the current QR code of the users; a new one is
+        generated the next time it is displayed"""
+        if self != self.env.user and not self.env.user.has_group(
+                'base.group_system'):
+            raise AccessError(
+                _("Only administrators can rotate the QR code of other users."))
+        self.env['res.users.qr.token'].sudo().search(
+            [('user_id', 'in', self.ids)]).unlink()
+        return True
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Anjhana A K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU AFFERO
+#    GENERAL PUBLIC LICENSE (AGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU AFFERO GENERAL PUBLIC LICENSE (AGPL v3) for more details.
+#
+#    You should have received a copy of the GNU AFFERO GENERAL PUBLIC LICENSE
+#    (AGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import hashlib
+import secrets
+try:
+    import qrcode
+except ImportError:
+    qrcode = None
+import base64
+from io import BytesIO
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+
+class ResUsersQrToken(models.Model):
+    """ Random login token of a user. Only the SHA-256 hash of the token is
+    stored; the token itself only lives inside the cached QR image"""
+    _name = 'res.users.qr.token'
+    _description = 'QR Login Token'
+
+    user_id = fields.Many2one('res.users', string='User', required=True,
+                              ondelete='cascade', index=True)
+    token_hash = fields.Char(string='Token Hash', required=True, index=True,
+                             help="SHA-256 hash of the token encoded in the "
+                                  "QR code")
+    qr_code = fields.Binary(string='QR Code', attachment=True)
+
+    _sql_constraints = [
+        ('user_uniq', 'unique(user_id)',
+         'A user can only have one QR login token.'),
+        ('token_hash_uniq', 'unique(token_hash)',
+         'The QR login token must be unique.'),
+    ]
+
+    @api.model
+    def _hash_token(self, token):
+        """Returns the hash under which a token is stored"""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @api.model
+    def _generate_qr_image(self, token):
+        """Renders the QR code image encoding the token"""
+        if not qrcode:
+            raise UserError(
+                _('Necessary Requirements To Run This Operation Is '
+                  'Not Satisfied'))
+        qr_code = qrcode.QRCode(
+            version=1,
+            error_correction=qrcode.constants.ERROR_CORRECT_L,
+            box_size=3,
+            border=4,)
+        qr_code.add_data(token)
+        qr_code.make(fit=True)
+        temp = BytesIO()
+        qr_code.make_image().save(temp, format="PNG")
+        return base64.b64encode(temp.getvalue())
+
+    @api.model
+    def _create_for_users(self, users):
+        """Creates a new random token for each user, with its QR image"""
+        vals_list = []
+        for user in users:
+            token = secrets.token_urlsafe(32)
+            vals_list.append({
+                'user_id': user.id,
+                'token_hash': self._hash_token(token),
+                'qr_code': self._generate_qr_image(token),
+            })
+        return self.create(vals_list)
+
+    @api.model
+    def _get_user(self, token):
+        """Returns the active internal user owning the token, looked up by
+        its hash in a single query"""
+        if not token or not isinstance(token, str):
+            return self.env['res.users']
+        self.env.cr.execute("""
+            SELECT users.id
+              FROM res_users_qr_token token
+              JOIN res_users users ON users.id = token.user_id
+             WHERE token.token_hash = %s
+               AND users.active
+               AND NOT users.share
+        """, (self._hash_token(token),))
+        row = self.env.cr.fetchone()
+        return self.env['res.users'].browse(row and row[0])
@@ -21,7 +21,7 @@
 #############################################################################
 {
     'name': "Product Low Stock Alert",
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.1.0',
     'summary': """Product Low Stock Alert Display in Point of Sale and 
     Product Views""",
     "category": 'Warehouse,Point of Sale',
@@ -34,6 +34,8 @@
     'website': 'https://www.cybrosys.com',
     'depends': ['stock', 'point_of_sale'],
     'data': [
+        'security/ir.model.access.csv',
+        'data/product_low_stock_data.xml',
         'views/res_config_settings_views.xml',
         'views/product_product_views.xml',
         'views/product_template_views.xml'
@@ -43,6 +45,7 @@
             'low_stocks_product_alert/static/src/css/template_color.css',
         ],
         'point_of_sale.assets': [
+            'low_stocks_product_alert/static/src/js/pos_low_stock.js',
             'low_stocks_product_alert/static/src/xml/product_item_template.xml',
         ],
     },
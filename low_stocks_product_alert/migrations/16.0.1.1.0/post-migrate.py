@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+from odoo import SUPERUSER_ID, api
+
+
+def migrate(cr, version):
+    """The data file only fills the low stock table on install, so databases
+    upgraded from a previous version compute it here"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['product.low.stock']._refresh()
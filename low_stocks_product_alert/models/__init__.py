@@ -19,7 +19,9 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
+from . import product_low_stock
 from . import product_product
 from . import product_template
 from . import pos_session
 from . import res_config_settings
+from . import stock_quant
@@ -27,18 +27,34 @@ class PosSession(models.Model):
     This is an Odoo model for Point of Sale (POS) sessions.
     It inherits from the 'pos.session' model and extends its functionality.
 
-     Methods: _loader_params_product_product(): Adds the 'alert_tag' field to
-     the search parameters for the product loader.
+     Methods: _pos_ui_models_to_load(): Adds the low stock alerts to the
+     data loaded by the point of sale.
+     _get_pos_ui_product_low_stock(params): Returns the products under their
+     alert quantity from the persisted low stock flags.
     """
     _inherit = 'pos.session'
 
-    def _loader_params_product_product(self):
-        """ Adds the 'alert_tag' field to the search parameters for the
-        product loader.
+    def _pos_ui_models_to_load(self):
+        """ Adds the low stock alerts to the data loaded by the point of
+        sale.
 
         Returns:
-            dict: The updated search parameters for the product loader.
+            list: The models to load in the point of sale.
         """
-        result = super()._loader_params_product_product()
-        result['search_params']['fields'].append('alert_tag')
+        result = super()._pos_ui_models_to_load()
+        result.append('product.low.stock')
         return result
+
+    def _loader_params_product_low_stock(self):
+        """ No parameter is needed: only the flagged products are loaded."""
+        return {}
+
+    def _get_pos_ui_product_low_stock(self, params):
+        """ Returns the products under their alert quantity. The point of
+        sale then only synchronizes the alerts changed since this date, so
+        that the stock of the products is never computed on session open.
+
+        Returns:
+            dict: The synchronization date and the low stock alerts.
+        """
+        return self.env['product.low.stock'].get_pos_low_stock()
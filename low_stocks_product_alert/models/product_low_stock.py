@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Anfas Faisal K (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+# Key of the products waiting for a refresh in the transaction precommit data
+PENDING_KEY = 'low_stocks_product_alert.pending'
+# Overlap, in seconds, applied to the date of the last POS synchronization so
+# that the rows updated by transactions committing during the previous
+# synchronization are not missed
+SYNC_OVERLAP = 10
+
+
+class ProductLowStock(models.Model):
+    """
+    Persisted stock level of the products in internal locations, with the
+    low stock flag derived from the configured alert quantity. The rows are
+    refreshed from the quant changes right before the transaction commits,
+    so the alerts never have to compute the stock of every product.
+
+    Methods:
+        _get_low_stock_quantities(product_ids): Returns the quantity of the
+        given products that are under their alert quantity.
+        _mark_products(product_ids): Schedules the refresh of the given
+        products at the end of the transaction.
+        _refresh(product_ids): Recomputes the stock level and the low stock
+        flag of the given products, or of all of them.
+        get_pos_low_stock(sync_date): Returns the low stock alerts changed
+        since the last synchronization of the point of sale.
+    """
+    _name = 'product.low.stock'
+    _description = 'Product Low Stock'
+    _rec_name = 'product_id'
+
+    product_id = fields.Many2one(
+        'product.product', string='Product', required=True,
+        ondelete='cascade', help='Product of the stock level')
+    qty_available = fields.Float(
+        string='Quantity On Hand', digits='Product Unit of Measure',
+        help='Quantity of the product in the internal locations')
+    is_low_stock = fields.Boolean(
+        string='Low Stock', index=True,
+        help='Whether the quantity is under the alert quantity')
+
+    _sql_constraints = [
+        ('product_uniq', 'unique(product_id)',
+         'The stock level of a product must be unique.'),
+    ]
+
+    @api.model
+    def _get_low_stock_quantities(self, product_ids):
+        """Returns the quantity on hand of the given products that are under
+        their alert quantity.
+
+        Returns:
+            dict: {product_id: quantity}
+        """
+        if not product_ids:
+            return {}
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT product_id, qty_available
+              FROM product_low_stock
+             WHERE is_low_stock AND product_id IN %s
+        """, (tuple(product_ids),))
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _mark_products(self, product_ids):
+        """Collects the products of the transaction whose stock level must
+        be refreshed. They are refreshed once, right before the commit."""
+        if not product_ids:
+            return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(PENDING_KEY)
+        if pending is None:
+            pending = precommit.data[PENDING_KEY] = set()
+            env = self.env
+
+            @precommit.add
+            def refresh_low_stock():
+                product_ids = precommit.data.pop(PENDING_KEY, set())
+                if product_ids:
+                    env['product.low.stock']._refresh(list(product_ids))
+
+        pending.update(product_ids)
+
+    @api.model
+    def _get_threshold_query(self):
+        """Returns the SQL expression of the alert quantity of a product
+        according to the configuration, and its parameters."""
+        config_param = self.env['ir.config_parameter'].sudo()
+        if config_param.get_param(
+                'low_stocks_product_alert.is_low_stock_alert'):
+            return '%(min_low_stock_alert)s', {
+                'min_low_stock_alert': int(config_param.get_param(
+                    'low_stocks_product_alert.min_low_stock_alert') or 0)}
+        if config_param.get_param(
+                'low_stocks_product_alert.is_low_stock_alert_individual'):
+            return 'COALESCE(product.min_low_stock_alert, 0)', {}
+        return 'NULL', {}
+
+    @api.model
+    def _refresh(self, product_ids=None):
+        """Recomputes with a single query the quantity on hand and the low
+        stock flag of the given products, or of all of them. Only the rows
+        whose values change are updated, so their write date tells the point
+        of sale which alerts to synchronize."""
+        self.env['stock.quant'].flush_model(
+            ['product_id', 'location_id', 'quantity'])
+        self.env['product.product'].flush_model(
+            ['min_low_stock_alert', 'product_tmpl_id'])
+        self.env['product.template'].flush_model(['detailed_type'])
+        threshold, params = self._get_threshold_query()
+        params['uid'] = self.env.uid
+        product_where = quant_where = ''
+        if product_ids is not None:
+            if not product_ids:
+                return True
+            params['product_ids'] = tuple(product_ids)
+            product_where = 'WHERE product.id IN %(product_ids)s'
+            quant_where = 'AND quant.product_id IN %(product_ids)s'
+        self.env.cr.execute("""
+            INSERT INTO product_low_stock AS low_stock
+                (product_id, qty_available, is_low_stock,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT product.id, COALESCE(stock.quantity, 0),
+                   template.detailed_type = 'product'
+                   AND COALESCE(COALESCE(stock.quantity, 0) <= """
+                            + threshold + """, FALSE),
+                   %(uid)s, CLOCK_TIMESTAMP() AT TIME ZONE 'UTC',
+                   %(uid)s, CLOCK_TIMESTAMP() AT TIME ZONE 'UTC'
+              FROM product_product product
+              JOIN product_template template
+                ON template.id = product.product_tmpl_id
+         LEFT JOIN (SELECT quant.product_id, SUM(quant.quantity) AS quantity
+                      FROM stock_quant quant
+                      JOIN stock_location location
+                        ON location.id = quant.location_id
+                     WHERE location.usage = 'internal' """ + quant_where + """
+                  GROUP BY quant.product_id) stock
+                ON stock.product_id = product.id
+            """ + product_where + """
+            ON CONFLICT (product_id) DO UPDATE
+               SET qty_available = EXCLUDED.qty_available,
+                   is_low_stock = EXCLUDED.is_low_stock,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+             WHERE low_stock.qty_available != EXCLUDED.qty_available
+                OR low_stock.is_low_stock != EXCLUDED.is_low_stock
+        """, params)
+        self.invalidate_model()
+        self.env['product.product'].invalidate_model(['alert_tag'])
+        self.env['product.template'].invalidate_model(
+            ['alert_state', 'color_field'])
+        return True
+
+    @api.model
+    def get_pos_low_stock(self, sync_date=False):
+        """Returns the low stock alerts of the point of sale. Without
+        synchronization date, only the products under their alert quantity
+        are returned; otherwise every product whose stock level changed
+        since then is returned, with no quantity once it is no longer low.
+
+        Returns:
+            dict: the date of the synchronization and the list of
+            [product_id, quantity] of the alerts
+        """
+        domain = [('is_low_stock', '=', True)]
+        if sync_date:
+            domain = [('write_date', '>=', fields.Datetime.to_datetime(
+                sync_date) - timedelta(seconds=SYNC_OVERLAP))]
+        now = fields.Datetime.now()
+        low_stocks = self.sudo().search(domain).read(
+            ['product_id', 'qty_available', 'is_low_stock'], load=None)
+        return {
+            'sync_date': fields.Datetime.to_string(now),
+            'products': [
+                [low_stock['product_id'],
+                 low_stock['qty_available'] if low_stock['is_low_stock']
+                 else None]
+                for low_stock in low_stocks],
+        }
@@ -29,14 +29,14 @@ class ProductProduct(models.Model):
     computed field for product alert state.
 
      Methods:
-        _compute_alert_tag(): Computes the value of the 'alert_tag' field based on the
-        product's stock quantity and configured low stock alert parameters
+        _compute_alert_tag(): Computes the value of the 'alert_tag' field from
+        the persisted low stock flags of the products
     """
     _inherit = 'product.product'
 
     alert_tag = fields.Char(
         string='Product Alert Tag', compute='_compute_alert_tag',
-        help='This field represents the alert tag of the product.', store=True)
+        help='This field represents the alert tag of the product.')
     is_low_stock_alert = fields.Boolean(
         string="Low Stock Alert",
         help='This field determines the minimum stock quantity at which a low '
@@ -50,23 +50,30 @@ class ProductProduct(models.Model):
         help='Change the background color for the product based'
              'on the Alert Quant.')
 
-    @api.depends('qty_available')
+    @api.depends('min_low_stock_alert')
     def _compute_alert_tag(self):
-        """Computes the value of the 'alert_tag' field based on the product's
-        stock quantity and configured low stock alert parameters."""
-        if self.env['ir.config_parameter'].sudo().get_param(
-                'low_stocks_product_alert.is_low_stock_alert'):
-            for rec in self:
-                is_low_stock = rec.detailed_type == 'product' and rec.qty_available <= int(
-                    self.env['ir.config_parameter'].sudo().get_param(
-                        'low_stocks_product_alert.min_low_stock_alert'))
-                rec.alert_tag = rec.qty_available if is_low_stock else False
-        elif self.env['ir.config_parameter'].sudo().get_param(
-                'low_stocks_product_alert.is_low_stock_alert_individual'):
-            for rec in self:
-                is_low_stock_single = rec.detailed_type == 'product' and rec.qty_available <= int(
-                    rec.min_low_stock_alert)
-                rec.alert_tag = rec.qty_available if is_low_stock_single else False
+        """Computes the value of the 'alert_tag' field from the low stock
+        flags maintained by the quant changes, so that no stock quantity is
+        computed here."""
+        quantities = self.env['product.low.stock']._get_low_stock_quantities(
+            self._origin.ids)
+        for rec in self:
+            qty = quantities.get(rec._origin.id)
+            rec.alert_tag = qty if qty is not None else False
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Creates the low stock flags of the new products."""
+        products = super().create(vals_list)
+        self.env['product.low.stock']._mark_products(products.ids)
+        return products
+
+    def write(self, vals):
+        """Refreshes the low stock flags when the alert quantity changes."""
+        res = super().write(vals)
+        if 'min_low_stock_alert' in vals:
+            self.env['product.low.stock']._mark_products(self.ids)
+        return res
 
     @api.depends_context('is_low_stock_alert_individual')
     def _compute_is_low_stock_alert(self):
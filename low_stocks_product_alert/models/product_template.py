@@ -30,8 +30,7 @@ class ProductTemplate(models.Model):
 
     Methods:
          _compute_alert_state: Computes the 'alert_state' and 'color_field'
-         fields based on the product's stock quantity and low stock
-    alert parameters
+         fields from the persisted low stock flags of the variants
 
     """
     _inherit = 'product.template'
@@ -41,27 +40,27 @@ class ProductTemplate(models.Model):
                                  help='This field represents the alert state'
                                       'of the product')
     color_field = fields.Char(string='Background color',
+                              compute='_compute_alert_state',
                               help='This field represents the background '
                                    'color of the product.')
 
-    @api.depends('qty_available')
+    @api.depends('product_variant_ids.min_low_stock_alert')
     def _compute_alert_state(self):
-        """ Computes the 'alert_state' and 'color_field' fields based on
-        the product's stock quantity and low stock alert parameters."""
-        if self.env['ir.config_parameter'].sudo().get_param(
-                'low_stocks_product_alert.is_low_stock_alert'):
-            for rec in self:
-                rec.alert_state, rec.color_field = (False, 'white') if \
-                    rec.detailed_type != 'product' or rec.qty_available > int(
-                        self.env['ir.config_parameter'].sudo().get_param(
-                            'low_stocks_product_alert.min_low_stock_alert')) \
-                    else (True, '#fdc6c673')
-        elif self.env['ir.config_parameter'].sudo().get_param(
-                'low_stocks_product_alert.is_low_stock_alert_individual') and self.filtered(lambda x: x.product_variant_id.is_low_stock_alert):
-            for rec in self:
-                rec.alert_state, rec.color_field = (False, 'white') if \
-                    rec.detailed_type != 'product' or rec.qty_available > int(rec.product_variant_id.min_low_stock_alert) \
-                    else (True, '#fdc6c673')
-        else:
-            self.alert_state = False
-            self.color_field = 'white'
+        """ Computes the 'alert_state' and 'color_field' fields from the low
+        stock flags of the variants, read with a single query."""
+        variants = self._origin.product_variant_ids
+        quantities = self.env['product.low.stock']._get_low_stock_quantities(
+            variants.ids)
+        low_templates = {variant.product_tmpl_id.id for variant in variants
+                         if variant.id in quantities}
+        for rec in self:
+            rec.alert_state, rec.color_field = (True, '#fdc6c673') if \
+                rec._origin.id in low_templates else (False, 'white')
+
+    def write(self, vals):
+        """Refreshes the low stock flags when the product type changes."""
+        res = super().write(vals)
+        if 'detailed_type' in vals:
+            self.env['product.low.stock']._mark_products(
+                self.with_context(active_test=False).product_variant_ids.ids)
+        return res
@@ -19,7 +19,7 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import api, fields, models
+from odoo import fields, models
 
 
 class ResConfig(models.TransientModel):
@@ -52,11 +52,14 @@ class ResConfig(models.TransientModel):
              'on the Alert Quant.',
         config_parameter='low_stocks_product_alert.min_low_stock_alert')
 
-    @api.onchange('is_low_stock_alert_individual')
-    def _onchange_is_low_stock_alert_individual(self):
-        """The function is used to change the stock alert in the product form"""
-        if self.env['ir.config_parameter'].sudo().get_param(
-                'low_stocks_product_alert.is_low_stock_alert_individual'):
-            product_variants = self.env['product.product'].search([])
-            for rec in product_variants:
-                rec.is_low_stock_alert = True
+    def set_values(self):
+        """Refreshes the low stock flags of all the products when the alert
+        configuration changes."""
+        config_param = self.env['ir.config_parameter'].sudo()
+        keys = ['low_stocks_product_alert.is_low_stock_alert',
+                'low_stocks_product_alert.is_low_stock_alert_individual',
+                'low_stocks_product_alert.min_low_stock_alert']
+        previous = [config_param.get_param(key) for key in keys]
+        super().set_values()
+        if previous != [config_param.get_param(key) for key in keys]:
+            self.env['product.low.stock']._refresh()
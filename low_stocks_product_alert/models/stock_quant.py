@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Anfas Faisal K (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+from odoo import api, models
+
+
+class StockQuant(models.Model):
+    """
+    This is an Odoo model for stock quants. It inherits from the
+    'stock.quant' model to refresh the low stock flags of the products
+    whose quantity changes.
+
+    Methods:
+        create(vals_list): Schedules the refresh of the low stock flags of
+        the products of the new quants.
+        write(vals): Schedules the refresh of the low stock flags of the
+        products when the quantity of their quants changes.
+    """
+    _inherit = 'stock.quant'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Schedules the refresh of the low stock flags of the products of
+        the new quants."""
+        quants = super().create(vals_list)
+        self.env['product.low.stock']._mark_products(
+            quants.product_id.ids)
+        return quants
+
+    def write(self, vals):
+        """Schedules the refresh of the low stock flags of the products when
+        the quantity or the location of their quants changes."""
+        res = super().write(vals)
+        if 'quantity' in vals or 'location_id' in vals:
+            self.env['product.low.stock']._mark_products(
+                self.product_id.ids)
+        return res
@@ -0,0 +1,53 @@
+/** @odoo-module */
+import { PosGlobalState } from 'point_of_sale.models';
+import Registries from 'point_of_sale.Registries';
+
+// Interval, in milliseconds, between two synchronizations of the alerts
+const LOW_STOCK_SYNC_INTERVAL = 60000;
+
+/**
+ * Keeps the low stock alerts of the products: the flagged products are
+ * loaded with the session, then only the alerts changed on the server since
+ * the last synchronization are fetched.
+ */
+const LowStockPosGlobalState = (PosGlobalState) => class LowStockPosGlobalState extends PosGlobalState {
+    async _processData(loadedData) {
+        await super._processData(...arguments);
+        this.lowStockAlerts = {};
+        this._applyLowStockAlerts(loadedData['product.low.stock']);
+    }
+    async after_load_server_data() {
+        const result = await super.after_load_server_data(...arguments);
+        setInterval(() => this._syncLowStockAlerts(), LOW_STOCK_SYNC_INTERVAL);
+        return result;
+    }
+    /**
+     * Merges the alerts received from the server, an alert without quantity
+     * meaning the product is no longer low on stock.
+     */
+    _applyLowStockAlerts(data) {
+        const alerts = Object.assign({}, this.lowStockAlerts);
+        for (const [productId, quantity] of data.products) {
+            if (quantity === null) {
+                delete alerts[productId];
+            } else {
+                alerts[productId] = quantity;
+            }
+        }
+        this.lowStockAlerts = alerts;
+        this.lowStockSyncDate = data.sync_date;
+    }
+    async _syncLowStockAlerts() {
+        try {
+            const data = await this.env.services.rpc({
+                model: 'product.low.stock',
+                method: 'get_pos_low_stock',
+                args: [this.lowStockSyncDate],
+            });
+            this._applyLowStockAlerts(data);
+        } catch {
+            // Offline: the alerts are synchronized at the next interval
+        }
+    }
+};
+Registries.Model.extend(PosGlobalState, LowStockPosGlobalState);
@@ -20,10 +20,20 @@
 #
 #############################################################################
 
+import logging
+import time
+
 from odoo import models, fields, api
 from odoo.osv import expression
 from ast import literal_eval
 
+_logger = logging.getLogger(__name__)
+
+# Seconds during which the values of a block are kept
+BLOCK_CACHE_TIMEOUT = 300
+# Cached values: {(block id, company ids): (expiration time, values)}
+_BLOCK_CACHE = {}
+
 
 class DashboardBlock(models.Model):
     _name = "dashboard.block"
@@ -75,6 +85,7 @@ class DashboardBlock(models.Model):
         """Dashboard block values"""
         block_id = []
         dashboard_block = self.env['dashboard.block'].sudo().search([('client_action', '=', int(action_id))])
+        values = dashboard_block._evaluate_blocks()
         for rec in dashboard_block:
             color = rec.tile_color if rec.tile_color else '#1f6abb;'
             icon_color = rec.tile_color if rec.tile_color else '#1f6abb;'
@@ -90,37 +101,94 @@ class DashboardBlock(models.Model):
                 'text_color': 'color: %s;' % text_color,
                 'icon_color': 'color: %s;' % icon_color,
             }
+            vals.update(values.get(rec.id, {}))
+            block_id.append(vals)
+        return block_id
+
+    def _evaluate_blocks(self):
+        """Computes the values of the blocks. The values are cached per
+        block and companies for BLOCK_CACHE_TIMEOUT seconds; the other
+        blocks are merged by model, domain and group by so that each merge
+        needs a single query.
+
+        :return: {block id: values}, the values holding the evaluation time
+         of the block in milliseconds and whether it came from the cache
+        """
+        cache_context = (tuple(self.env.companies.ids),)
+        values = {}
+        groups = {}
+        now = time.monotonic()
+        for rec in self:
+            if not rec.model_name or not rec.operation or not rec.measured_field:
+                continue
+            cached = _BLOCK_CACHE.get((rec.id,) + cache_context)
+            if cached and cached[0] > now:
+                values[rec.id] = dict(cached[1], eval_time=0.0, cached=True)
+                continue
             domain = []
             if rec.filter:
                 domain = expression.AND([literal_eval(rec.filter)])
-            if rec.model_name:
-                if rec.type == 'graph':
-                    query = self.env[rec.model_name].get_query(domain, rec.operation, rec.measured_field,
-                                                               group_by=rec.group_by)
-                    self._cr.execute(query)
-                    records = self._cr.dictfetchall()
-                    x_axis = []
-                    for record in records:
-                        x_axis.append(record.get(rec.group_by.name))
-                    y_axis = []
-                    for record in records:
-                        y_axis.append(record.get('value'))
-                    vals.update({'x_axis': x_axis, 'y_axis': y_axis})
-                else:
-                    query = self.env[rec.model_name].get_query(domain, rec.operation, rec.measured_field)
-                    self._cr.execute(query)
-                    records = self._cr.dictfetchall()
-                    magnitude = 0
-                    total = records[0].get('value')
-                    while abs(total) >= 1000:
-                        magnitude += 1
-                        total /= 1000.0
-                    # add more suffixes if you need them
-                    val = '%.2f%s' % (total, ['', 'K', 'M', 'G', 'T', 'P'][magnitude])
-                    records[0]['value'] = val
-                    vals.update(records[0])
-            block_id.append(vals)
-        return block_id
+            group_by = rec.group_by if rec.type == 'graph' else False
+            group_key = (rec.model_name, repr(domain), group_by.id if group_by else False)
+            groups.setdefault(group_key, [domain, group_by, []])[2].append(rec.id)
+        for group_key, (domain, group_by, block_ids) in groups.items():
+            blocks = self.browse(block_ids)
+            start = time.perf_counter()
+            group_values = blocks._evaluate_block_group(group_key[0], domain, group_by)
+            eval_time = (time.perf_counter() - start) * 1000
+            expiration = time.monotonic() + BLOCK_CACHE_TIMEOUT
+            for rec in blocks:
+                _BLOCK_CACHE[(rec.id,) + cache_context] = (expiration, group_values[rec.id])
+                values[rec.id] = dict(group_values[rec.id], eval_time=round(eval_time, 2), cached=False)
+        for block_id, block_values in values.items():
+            _logger.debug("Dashboard block %s evaluated in %.2f ms%s", block_id, block_values['eval_time'],
+                          ' (cached)' if block_values['cached'] else '')
+        return values
+
+    def _evaluate_block_group(self, model_name, domain, group_by):
+        """Computes with a single query the values of blocks sharing the
+        same model, domain and group by.
+
+        :return: {block id: values}
+        """
+        query, params = self.env[model_name].get_grouped_query(
+            domain, [('value_%s' % rec.id, rec.operation, rec.measured_field) for rec in self],
+            group_by=group_by)
+        self._cr.execute(query, params)
+        records = self._cr.dictfetchall()
+        values = {}
+        for rec in self:
+            value_key = 'value_%s' % rec.id
+            if rec.type == 'graph':
+                x_axis = [record.get(rec.group_by.name) for record in records]
+                y_axis = [record.get(value_key) for record in records]
+                values[rec.id] = {'x_axis': x_axis, 'y_axis': y_axis}
+            else:
+                magnitude = 0
+                total = records[0].get(value_key)
+                while abs(total) >= 1000:
+                    magnitude += 1
+                    total /= 1000.0
+                # add more suffixes if you need them
+                val = '%.2f%s' % (total, ['', 'K', 'M', 'G', 'T', 'P'][magnitude])
+                values[rec.id] = {'value': val}
+        return values
+
+    def write(self, vals):
+        """Drops the cached values of the blocks"""
+        self._clear_block_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        """Drops the cached values of the blocks"""
+        self._clear_block_cache()
+        return super().unlink()
+
+    def _clear_block_cache(self):
+        """Drops the cached values of the blocks"""
+        for key in list(_BLOCK_CACHE):
+            if key[0] in self.ids:
+                _BLOCK_CACHE.pop(key, None)
 
 
 class DashboardBlockLine(models.Model):
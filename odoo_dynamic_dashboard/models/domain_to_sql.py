@@ -25,6 +25,22 @@ from odoo import models
 from odoo.release import version_info
 
 
+def get_group_by_clause(self, group_by):
+    """Dashboard block group by: selected column, join and group by clause"""
+    if group_by.ttype == 'many2one':
+        relation_model = group_by.relation.replace('.', '_')
+        join = ' INNER JOIN %s on "%s".id = "%s".%s' % (
+        relation_model, relation_model, self._table, group_by.name)
+        rec_name = self.env[group_by.relation]._rec_name_fallback()
+        data = ',"%s".%s AS %s' % (relation_model, rec_name, group_by.name)
+        group_by_str = ' Group by "%s".%s' % (relation_model, rec_name)
+    else:
+        join = ''
+        data = ',"%s".%s' % (self._table, group_by.name)
+        group_by_str = ' Group by "%s".%s' % (self._table, str(group_by.name))
+    return data, join, group_by_str
+
+
 def get_query(self, args, operation, field, group_by=False, apply_ir_rules=False):
     """Dashboard block Query Creation"""
     query = self._where_calc(args)
@@ -35,16 +51,8 @@ def get_query(self, args, operation, field, group_by=False, apply_ir_rules=False
         join = ''
         group_by_str = ''
         if group_by:
-            if group_by.ttype == 'many2one':
-                relation_model = group_by.relation.replace('.', '_')
-                join = ' INNER JOIN %s on "%s".id = "%s".%s' % (
-                relation_model, relation_model, self._table, group_by.name)
-                rec_name = self.env[group_by.relation]._rec_name_fallback()
-                data = data + ',"%s".%s AS %s' % (relation_model, rec_name, group_by.name)
-                group_by_str = ' Group by "%s".%s' % (relation_model, rec_name)
-            else:
-                data = data + ',"%s".%s' % (self._table, group_by.name)
-                group_by_str = ' Group by "%s".%s' % (self._table, str(group_by.name))
+            group_by_data, join, group_by_str = self.get_group_by_clause(group_by)
+            data = data + group_by_data
     else:
         data = '"%s".id' % (self._table)
 
@@ -71,4 +79,31 @@ def get_query(self, args, operation, field, group_by=False, apply_ir_rules=False
     return query_str % tuple(where_clause_params)
 
 
+def get_grouped_query(self, args, aggregates, group_by=False, apply_ir_rules=False):
+    """Dashboard blocks Query Creation: computes the aggregates of several
+    blocks sharing the same domain and group by in a single query.
+
+    :param aggregates: list of (alias, operation, field) of the blocks
+    :return: the query and its parameters
+    """
+    query = self._where_calc(args)
+    if apply_ir_rules:
+        self._apply_ir_rules(query, 'read')
+    if 'company_id' in self._fields:
+        query.add_where('"%s".company_id IN %%s' % self._table, [tuple(self.env.companies.ids)])
+    data = ','.join('COALESCE(%s("%s".%s),0) AS %s' % (operation.upper(), self._table, field.name, alias)
+                    for alias, operation, field in aggregates)
+    join = ''
+    group_by_str = ''
+    if group_by:
+        group_by_data, join, group_by_str = self.get_group_by_clause(group_by)
+        data = data + group_by_data
+    from_clause, where_clause, where_clause_params = query.get_sql()
+    where_str = where_clause and (" WHERE %s" % where_clause) or ''
+    query_str = 'SELECT %s FROM ' % data + from_clause + join + where_str + group_by_str
+    return query_str, where_clause_params
+
+
+models.BaseModel.get_group_by_clause = get_group_by_clause
 models.BaseModel.get_query = get_query
+models.BaseModel.get_grouped_query = get_grouped_query
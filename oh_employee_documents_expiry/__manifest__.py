@@ -22,7 +22,7 @@
 ###################################################################################
 {
     'name': 'Open HRMS Employee Documents',
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.1.0',
     'summary': """Manages Employee Documents With Expiry Notifications.""",
     'description': """OH Addon: Manages Employee Related Documents with Expiry Notifications.""",
     'live_test_url': 'https://youtu.be/4fe5tzAG8Ng',
@@ -34,6 +34,8 @@
     'depends': ['base', 'hr'],
     'data': [
         'security/ir.model.access.csv',
+        'data/mail_template_data.xml',
+        'data/ir_cron_data.xml',
         'views/employee_document_view.xml',
         'views/document_type_view.xml',
         'views/hr_document_template.xml',
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
 from datetime import datetime, date, timedelta
-from odoo import models, fields, api, _
+from odoo import models, fields, api, _, Command
 from odoo.exceptions import Warning
 
 
@@ -8,89 +9,79 @@ class HrEmployeeDocument(models.Model):
     _name = 'hr.employee.document'
     _description = 'HR Employee Documents'
 
+    @api.model
     def mail_reminder(self):
-        """Sending document expiry notification to employees."""
+        """Sending document expiry notification to employees.
+        Only the documents whose next notification date has come are
+        loaded; their mails are rendered in batch from the template and
+        queued for the mail cron."""
+        date_now = fields.Date.today()
+        documents = self.search([('next_notification_date', '<=', date_now)])
+        if not documents:
+            return
+        template = self.env.ref(
+            'oh_employee_documents_expiry.mail_template_document_expiry')
+        mails = template.generate_email(
+            documents.ids, ['subject', 'body_html', 'email_from', 'email_to'])
+        vals_list = []
+        for document in documents:
+            values = mails[document.id]
+            values['recipient_ids'] = [
+                Command.link(partner_id) for partner_id in
+                values.pop('partner_ids', [])]
+            values.pop('attachment_ids', None)
+            values.pop('attachments', None)
+            if not values.get('email_from'):
+                values.pop('email_from', None)
+            values['author_id'] = self.env.user.partner_id.id
+            vals_list.append(values)
+        self.env['mail.mail'].sudo().create(vals_list)
+        # Move every document to its following notification date
+        next_dates = defaultdict(lambda: self.browse())
+        for document in documents:
+            next_dates[document._get_next_notification_date(
+                date_now + timedelta(days=1))] |= document
+        for next_date, docs in next_dates.items():
+            docs.write({'next_notification_date': next_date})
+
+    def _get_notification_dates(self):
+        """Returns the first and last date on which the document has to be
+        notified, every day in between included"""
+        self.ensure_one()
+        expiry_date = self.expiry_date
+        if self.notification_type == 'single':
+            return expiry_date, expiry_date
+        elif self.notification_type == 'multi':
+            # On Expire date and few days(As it set) before expire date
+            return expiry_date - timedelta(days=self.before_days), expiry_date
+        elif self.notification_type == 'everyday':
+            return expiry_date - timedelta(days=self.before_days), expiry_date
+        elif self.notification_type == 'everyday_after':
+            return expiry_date, expiry_date + timedelta(days=self.before_days)
+        date_before = expiry_date - timedelta(days=7)
+        return date_before, date_before
+
+    def _get_next_notification_date(self, from_date):
+        """First notification date of the document on or after from_date"""
+        self.ensure_one()
+        if not self.expiry_date:
+            return False
+        first_date, last_date = self._get_notification_dates()
+        if self.notification_type == 'multi':
+            # Only the two ends of the period are notified
+            return next((notification_date for notification_date in (
+                first_date, last_date) if notification_date >= from_date),
+                False)
+        if from_date > last_date:
+            return False
+        return max(first_date, from_date)
 
+    @api.depends('expiry_date', 'notification_type', 'before_days')
+    def _compute_next_notification_date(self):
         date_now = fields.Date.today()
-        match = self.search([])
-        for i in match:
-            if i.expiry_date:
-                if i.notification_type == 'single':
-                    exp_date = fields.Date.from_string(i.expiry_date)
-                    print('exp_date :', exp_date)
-                    if date_now == i.expiry_date:
-                        mail_content = "  Hello  " + i.employee_ref.name + ",<br>Your Document " + i.name + " is going to expire on " + \
-                                       str(i.expiry_date) + ". Please renew it before expiry date"
-                        main_content = {
-                            'subject': _('Document-%s Expired On %s') % (
-                                i.name, i.expiry_date),
-                            'author_id': self.env.user.partner_id.id,
-                            'body_html': mail_content,
-                            'email_to': i.employee_ref.work_email,
-                        }
-                        self.env['mail.mail'].create(main_content).send()
-                elif i.notification_type == 'multi':
-                    exp_date = fields.Date.from_string(
-                        i.expiry_date) - timedelta(days=i.before_days)
-                    if date_now == exp_date or date_now == i.expiry_date:  # on Expire date and few days(As it set) before expire date
-                        mail_content = "  Hello  " + i.employee_ref.name + ",<br>Your Document " + i.name + \
-                                       " is going to expire on " + str(
-                            i.expiry_date) + \
-                                       ". Please renew it before expiry date"
-                        main_content = {
-                            'subject': _('Document-%s Expired On %s') % (
-                                i.name, i.expiry_date),
-                            'author_id': self.env.user.partner_id.id,
-                            'body_html': mail_content,
-                            'email_to': i.employee_ref.work_email,
-                        }
-                        self.env['mail.mail'].create(main_content).send()
-                elif i.notification_type == 'everyday':
-                    exp_date = fields.Date.from_string(
-                        i.expiry_date) - timedelta(days=i.before_days)
-                    if date_now >= exp_date or date_now == i.expiry_date:
-                        mail_content = "  Hello  " + i.employee_ref.name + ",<br>Your Document " + i.name + \
-                                       " is going to expire on " + str(
-                            i.expiry_date) + \
-                                       ". Please renew it before expiry date"
-                        main_content = {
-                            'subject': _('Document-%s Expired On %s') % (
-                                i.name, i.expiry_date),
-                            'author_id': self.env.user.partner_id.id,
-                            'body_html': mail_content,
-                            'email_to': i.employee_ref.work_email,
-                        }
-                        self.env['mail.mail'].create(main_content).send()
-                elif i.notification_type == 'everyday_after':
-                    exp_date = fields.Date.from_string(
-                        i.expiry_date) + timedelta(days=i.before_days)
-                    if date_now <= exp_date or date_now == i.expiry_date:
-                        mail_content = "  Hello  " + i.employee_ref.name + ",<br>Your Document " + i.name + \
-                                       " is expired on " + str(i.expiry_date) + \
-                                       ". Please renew it "
-                        main_content = {
-                            'subject': _('Document-%s Expired On %s') % (
-                                i.name, i.expiry_date),
-                            'author_id': self.env.user.partner_id.id,
-                            'body_html': mail_content,
-                            'email_to': i.employee_ref.work_email,
-                        }
-                        self.env['mail.mail'].create(main_content).send()
-                else:
-                    exp_date = fields.Date.from_string(
-                        i.expiry_date) - timedelta(days=7)
-                    if date_now == exp_date:
-                        mail_content = "  Hello  " + i.employee_ref.name + ",<br>Your Document " + i.name + \
-                                       " is going to expire on " + \
-                                       str(i.expiry_date) + ". Please renew it before expiry date"
-                        main_content = {
-                            'subject': _('Document-%s Expired On %s') % (
-                                i.name, i.expiry_date),
-                            'author_id': self.env.user.partner_id.id,
-                            'body_html': mail_content,
-                            'email_to': i.employee_ref.work_email,
-                        }
-                        self.env['mail.mail'].create(main_content).send()
+        for document in self:
+            document.next_notification_date = \
+                document._get_next_notification_date(date_now)
 
     @api.constrains('expiry_date')
     def check_expr_date(self):
@@ -131,6 +122,10 @@ class HrEmployeeDocument(models.Model):
         Everyday till expiry date: You will get notification from number of days till the expiry date of the document.
         Notification on and after expiry: You will get notification on the expiry date and continues upto Days.
         If you did't select any then you will get notification before 7 days of document expiry.""")
+    next_notification_date = fields.Date(
+        string='Next Notification Date', index=True, copy=False,
+        compute='_compute_next_notification_date', store=True,
+        help="Next date on which the expiry notification will be sent")
 
 
 class HrEmployee(models.Model):
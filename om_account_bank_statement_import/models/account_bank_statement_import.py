@@ -51,6 +51,24 @@ class AccountBankStatementImport(models.TransientModel):
         currency = self.env['res.currency'].search([('name', '=', value)])
         return currency.id if currency else False
 
+    def _get_partner_map(self, names):
+        """ Map each of the names to the id of the first partner having it, with a single search """
+        partner_map = {}
+        names = list(set(names) - {''})
+        if names:
+            for partner in self.env['res.partner'].search_read([('name', 'in', names)], ['name']):
+                partner_map.setdefault(partner['name'], partner['id'])
+        return partner_map
+
+    def _get_currency_map(self, names):
+        """ Map each of the names to the id of the currency having it, with a single search """
+        currency_map = {}
+        names = list(set(names) - {''})
+        if names:
+            for currency in self.env['res.currency'].search_read([('name', 'in', names)], ['name']):
+                currency_map.setdefault(currency['name'], currency['id'])
+        return currency_map
+
     def create_statement(self, values):
         statement = self.env['account.bank.statement'].create(values)
         return statement
@@ -75,6 +93,8 @@ class AccountBankStatementImport(models.TransientModel):
                             raise UserError(_("Invalid file!"))
                         vals_list = []
                         date = False
+                        partner_map = self._get_partner_map(row[3] for row in file_reader[1:] if len(row) > 3)
+                        currency_map = self._get_currency_map(row[5] for row in file_reader[1:] if len(row) > 5)
                         for i in range(len(file_reader)):
                             field = list(map(str, file_reader[i]))
                             values = dict(zip(keys, field))
@@ -88,9 +108,9 @@ class AccountBankStatementImport(models.TransientModel):
                                         'date': field[0],
                                         'payment_ref': field[1],
                                         'ref': field[2],
-                                        'partner_id': self.get_partner(field[3]),
+                                        'partner_id': partner_map.get(field[3], False),
                                         'amount': field[4],
-                                        'currency_id':  self.get_currency(field[5])
+                                        'currency_id': currency_map.get(field[5], False)
                                     })
                                     vals_list.append((0, 0, values))
                         statement_vals = {
@@ -111,24 +131,20 @@ class AccountBankStatementImport(models.TransientModel):
                         except:
                             raise UserError(_("Invalid file!"))
                         vals_list = []
-                        for row_no in range(sheet.nrows):
-                            val = {}
-                            values = {}
-                            if row_no <= 0:
-                                fields = map(lambda row: row.value.encode('utf-8'), sheet.row(row_no))
-                            else:
-                                line = list(map(
-                                    lambda row: isinstance(row.value, bytes) and row.value.encode('utf-8') or str(
-                                        row.value), sheet.row(row_no)))
-                                values.update({
-                                    'date': line[0],
-                                    'payment_ref': line[1],
-                                    'ref': line[2],
-                                    'partner_id': self.get_partner(line[3]),
-                                    'amount': line[4],
-                                    'currency_id': self.get_currency(line[5])
-                                })
-                                vals_list.append((0, 0, values))
+                        lines = [list(map(
+                            lambda row: isinstance(row.value, bytes) and row.value.encode('utf-8') or str(
+                                row.value), sheet.row(row_no))) for row_no in range(1, sheet.nrows)]
+                        partner_map = self._get_partner_map(line[3] for line in lines)
+                        currency_map = self._get_currency_map(line[5] for line in lines)
+                        for line in lines:
+                            vals_list.append((0, 0, {
+                                'date': line[0],
+                                'payment_ref': line[1],
+                                'ref': line[2],
+                                'partner_id': partner_map.get(line[3], False),
+                                'amount': line[4],
+                                'currency_id': currency_map.get(line[5], False)
+                            }))
                         statement_vals = {
                             'name': 'Statement Of ' + str(datetime.today().date()),
                             'journal_id': self.env.context.get('active_id'),
@@ -293,6 +309,12 @@ class AccountBankStatementImport(models.TransientModel):
                 #build the full name like BNK/2016/00135 by just giving the number '135'
                 st_vals['name'] = journal.sequence_id.with_context(ir_sequence_date=st_vals.get('date')).get_next_char(st_vals['number'])
                 del(st_vals['number'])
+            account_numbers = [line_vals['account_number'] for line_vals in st_vals['transactions']
+                               if not line_vals.get('bank_account_id') and line_vals.get('account_number')]
+            partner_banks = {}
+            if account_numbers:
+                for partner_bank in self.env['res.partner.bank'].search([('acc_number', 'in', account_numbers)]):
+                    partner_banks.setdefault(partner_bank.acc_number, partner_bank)
             for line_vals in st_vals['transactions']:
                 unique_import_id = line_vals.get('unique_import_id')
                 if unique_import_id:
@@ -304,7 +326,7 @@ class AccountBankStatementImport(models.TransientModel):
                     # reconciliation process will be linked to the bank when the statement is closed.
                     identifying_string = line_vals.get('account_number')
                     if identifying_string:
-                        partner_bank = self.env['res.partner.bank'].search([('acc_number', '=', identifying_string)], limit=1)
+                        partner_bank = partner_banks.get(identifying_string)
                         if partner_bank:
                             line_vals['bank_account_id'] = partner_bank.id
                             line_vals['partner_id'] = partner_bank.partner_id.id
@@ -318,12 +340,18 @@ class AccountBankStatementImport(models.TransientModel):
         # Filter out already imported transactions and create statements
         statement_line_ids = []
         ignored_statement_lines_import_ids = []
+        unique_import_ids = [line_vals['unique_import_id'] for st_vals in stmts_vals
+                             for line_vals in st_vals['transactions'] if line_vals.get('unique_import_id')]
+        imported_ids = set()
+        if unique_import_ids:
+            imported_ids = set(BankStatementLine.sudo().search(
+                [('unique_import_id', 'in', unique_import_ids)]).mapped('unique_import_id'))
         for st_vals in stmts_vals:
             filtered_st_lines = []
             for line_vals in st_vals['transactions']:
                 if 'unique_import_id' not in line_vals \
                    or not line_vals['unique_import_id'] \
-                   or not bool(BankStatementLine.sudo().search([('unique_import_id', '=', line_vals['unique_import_id'])], limit=1)):
+                   or line_vals['unique_import_id'] not in imported_ids:
                     filtered_st_lines.append(line_vals)
                 else:
                     ignored_statement_lines_import_ids.append(line_vals['unique_import_id'])
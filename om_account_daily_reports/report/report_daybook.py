@@ -3,21 +3,23 @@
 import time
 from odoo import api, models, _
 from odoo.exceptions import UserError
-from datetime import timedelta, datetime
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 
 
 class ReportDayBook(models.AbstractModel):
     _name = 'report.om_account_daily_reports.report_daybook'
     _description = 'Day Book'
 
-    def _get_account_move_entry(self, accounts, form_data, date):
+    def _get_account_move_entries(self, accounts, form_data, date_from, date_to):
+        """
+        Returns the move lines of the accounts between two dates, fetched with
+        a single query and grouped per day: a list of dictionaries with the
+        'date', 'debit', 'credit', 'balance' and 'lines' of each day having
+        move lines, in chronological order
+        """
         cr = self.env.cr
-        MoveLine = self.env['account.move.line']
-        init_wheres = [""]
-
-        init_tables, init_where_clause, init_where_params =MoveLine._query_get()
-        if init_where_clause.strip():
-            init_wheres.append(init_where_clause.strip())
         if form_data['target_move'] == 'posted':
             target_move = "AND m.state = 'posted'"
         else:
@@ -42,7 +44,7 @@ class ReportDayBook(models.AbstractModel):
                             WHERE 
                               l.account_id IN %s 
                               AND l.journal_id IN %s """ + target_move + """ 
-                              AND l.date = %s 
+                              AND l.date BETWEEN %s AND %s 
                             GROUP BY 
                               l.id, 
                               l.account_id, 
@@ -54,24 +56,27 @@ class ReportDayBook(models.AbstractModel):
                               j.code, 
                               l.ref 
                             ORDER BY 
-                              l.date DESC
+                              l.date, l.id
                      """)
 
-        where_params = (tuple(accounts.ids), tuple(form_data['journal_ids']), date)
+        where_params = (tuple(accounts.ids), tuple(form_data['journal_ids']), date_from, date_to)
         cr.execute(sql, where_params)
-        data = cr.dictfetchall()
-        res = {}
-        debit = credit = balance = 0.00
-        for line in data:
-            debit += line['debit']
-            credit += line['credit']
-            balance += line['balance']
-        res['debit'] = debit
-        res['credit'] = credit
-        res['balance'] = balance
-        res['lines'] = data
+        res = []
+        for date, lines in groupby(cr.dictfetchall(), key=itemgetter('ldate')):
+            lines = list(lines)
+            res.append({
+                'date': date,
+                'debit': sum(line['debit'] for line in lines),
+                'credit': sum(line['credit'] for line in lines),
+                'balance': sum(line['balance'] for line in lines),
+                'lines': lines,
+            })
         return res
 
+    def _get_account_move_entry(self, accounts, form_data, date):
+        days = self._get_account_move_entries(accounts, form_data, date, date)
+        return days and days[0] or {'debit': 0.0, 'credit': 0.0, 'balance': 0.0, 'lines': []}
+
     @api.model
     def _get_report_values(self, docids, data=None):
         if not data.get('form') or not self.env.context.get('active_model'):
@@ -89,22 +94,17 @@ class ReportDayBook(models.AbstractModel):
             codes = [journal.code for journal in
                      self.env['account.journal'].search([('id', 'in', data['form']['journal_ids'])])]
         accounts = self.env['account.account'].search([])
-        dates = []
         record = []
-        days_total = date_to - date_from
-        for day in range(days_total.days + 1):
-            dates.append(date_from + timedelta(days=day))
-        for date in dates:
-            date_data = str(date)
-            accounts_res = self.with_context(data['form'].get('comparison_context', {}))._get_account_move_entry(accounts, form_data, date_data)
-            if accounts_res['lines']:
-                record.append({
-                    'date': date,
-                    'debit': accounts_res['debit'],
-                    'credit': accounts_res['credit'],
-                    'balance': accounts_res['balance'],
-                    'move_lines': accounts_res['lines']
-                })
+        days = self.with_context(data['form'].get('comparison_context', {}))._get_account_move_entries(
+            accounts, form_data, date_from, date_to)
+        for day in days:
+            record.append({
+                'date': day['date'],
+                'debit': day['debit'],
+                'credit': day['credit'],
+                'balance': day['balance'],
+                'move_lines': day['lines']
+            })
         return {
             'doc_ids': docids,
             'doc_model': model,
@@ -15,7 +15,7 @@
     'images': ["static/description/evaluation_prog.png"],
 
     'category': 'Human Resources/Employees',
-    'version': '16.0.1',
+    'version': '16.0.2',
     'license': 'AGPL-3',
     'depends': ['hr', 'base'],
     'data': [
@@ -23,6 +23,7 @@
         'security/ir.model.access.csv',
         'views/performance_evaluation_view.xml',
         'views/hr_employee_views.xml',
+        'views/performance_evaluation_campaign_views.xml',
         'data/ir_sequence_data.xml',
     ],
 
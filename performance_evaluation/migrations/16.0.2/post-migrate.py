@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+from odoo import SUPERUSER_ID, api
+
+
+def migrate(cr, version):
+    # La imagen del empleado ya no se copia en cada evaluación; unlink()
+    # marca los ficheros para el recolector de basura del filestore
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['ir.attachment'].search([
+        ('res_model', '=', 'performance.evaluation.program'),
+        ('res_field', '=', 'image_1920'),
+    ]).unlink()
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from . import performance_evaluation_program
-from . import hr_employee
\ No newline at end of file
+from . import hr_employee
+from . import performance_evaluation_campaign
+
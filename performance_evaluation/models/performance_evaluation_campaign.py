@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from odoo import fields, models, _
+from odoo.exceptions import UserError
+
+
+class PerformanceEvaluationCampaign(models.TransientModel):
+    _name = 'performance.evaluation.campaign'
+    _description = 'Performance Evaluation Campaign'
+
+    performance_period_id = fields.Many2one("performance.period", required=True)
+    department_id = fields.Many2one("hr.department", help="Only evaluate the employees of this department and its sub-departments")
+    manager_id = fields.Many2one("hr.employee", help="Only evaluate the employees that report to this manager, directly or not")
+
+    def _get_employees_domain(self):
+        self.ensure_one()
+        domain = [('default_evaluation_template_id', '!=', False)]
+        if self.department_id:
+            domain.append(('department_id', 'child_of', self.department_id.id))
+        if self.manager_id:
+            domain.append(('parent_id', 'child_of', self.manager_id.id))
+        return domain
+
+    def action_generate(self):
+        self.ensure_one()
+        employees = self.env['hr.employee'].search(self._get_employees_domain())
+        evaluations = self.env['performance.evaluation.program'].generate_campaign(self.performance_period_id, employees)
+        if not evaluations:
+            raise UserError(_("No new evaluation to create for this period."))
+        action = self.env["ir.actions.actions"]._for_xml_id("performance_evaluation.performance_evaluation_program_action")
+        action['domain'] = [('id', 'in', evaluations.ids)]
+        return action
@@ -113,7 +113,6 @@ class PerformanceEvaluationProgram(models.Model):
             rec.manager_id = rec.employee_id.parent_id
             rec.birthday = rec.employee_id.birthday
             rec.country_id = rec.employee_id.country_id
-            rec.image_1920 = rec.employee_id.image_1920
             rec.visa_expire = rec.employee_id.visa_expire
             if rec.employee_id.default_evaluation_template_id: 
                 rec.template_id= rec.employee_id.default_evaluation_template_id
@@ -140,13 +139,19 @@ class PerformanceEvaluationProgram(models.Model):
 
     @api.depends('personal_ev_line_ids.evaluation')
     def _compute_personal_ev(self):
+        # Saved evaluations are summed in a single grouped query
+        saved = self.filtered('id')
+        scores = {}
+        if saved:
+            groups = self.env['program.perosnal.line']._read_group(
+                [('program_id', 'in', saved.ids)],
+                ['program_id', 'evaluation:sum'], ['program_id'])
+            scores = {group['program_id'][0]: group['evaluation'] for group in groups}
         for rec in self:
-            rec.overall_personal_score = 0.00
-            len_ev = len(rec.personal_ev_line_ids) or 1
-            t_rating = 0.00
-            for line in rec.personal_ev_line_ids:
-                t_rating += int(line.evaluation)
-            rec.overall_personal_score = t_rating
+            if rec.id:
+                rec.overall_personal_score = scores.get(rec.id, 0.00)
+            else:
+                rec.overall_personal_score = sum(rec.personal_ev_line_ids.mapped('evaluation'))
    
 
     name = fields.Char(string="Reference", copy=False, default=lambda self: _('New'))
@@ -188,7 +193,8 @@ class PerformanceEvaluationProgram(models.Model):
     manager_id = fields.Many2one("hr.employee", compute="_compute_emp_info", store=True)
     visa_expire = fields.Date('Visa Expire Date', compute="_compute_emp_info", store=True)
         
-    image_1920 = fields.Image(compute="_compute_emp_info", store=True)
+    # Shown from the employee, not copied on every evaluation
+    image_1920 = fields.Image(related="employee_id.image_1920")
     country_id = fields.Many2one(
         'res.country', 'Nationality (Country)', compute="_compute_emp_info", store=True)
     birthday = fields.Date('Date of Birth', compute="_compute_emp_info", store=True)
@@ -226,19 +232,21 @@ class PerformanceEvaluationProgram(models.Model):
 
 
 
-    @api.model
-    def create(self, vals):
-        if 'company_id' in vals:
-            self = self.with_company(vals['company_id'])
-        if vals.get('name', _('New')) == _('New'):
-            vals['name'] = self.env['ir.sequence'].next_by_code('performance.evaluation.program') or _('New')
-        if 'employee_id' in vals and 'template_id' in vals:
-            performance_evaluator = self.env['performance.evaluation.program.config'].sudo().browse(vals['template_id']).performance_evaluator
-            if performance_evaluator =='manager':
-                vals['evaluator_employee_id'] = self.env['hr.employee'].sudo().browse(vals['employee_id']).parent_id.id
-            elif performance_evaluator =='own':
-                vals['evaluator_employee_id'] = vals['employee_id']
-        result = super(PerformanceEvaluationProgram, self).create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get('name', _('New')) == _('New'):
+                sequence = self.env['ir.sequence']
+                if 'company_id' in vals:
+                    sequence = sequence.with_company(vals['company_id'])
+                vals['name'] = sequence.next_by_code('performance.evaluation.program') or _('New')
+            if 'employee_id' in vals and 'template_id' in vals:
+                performance_evaluator = self.env['performance.evaluation.program.config'].sudo().browse(vals['template_id']).performance_evaluator
+                if performance_evaluator =='manager':
+                    vals['evaluator_employee_id'] = self.env['hr.employee'].sudo().browse(vals['employee_id']).parent_id.id
+                elif performance_evaluator =='own':
+                    vals['evaluator_employee_id'] = vals['employee_id']
+        result = super(PerformanceEvaluationProgram, self).create(vals_list)
         return result
     
     
@@ -423,25 +431,45 @@ class PerformanceEvaluationProgram(models.Model):
         period = self.env['performance.period'].search([('name', '=', currentperiod)])
         if not period:
             period = self.env['performance.period'].create({'name': currentperiod})
-        
+        self.generate_campaign(period, employees)
+        return True
+
+    @api.model
+    def generate_campaign(self, period, employees):
+        """Create the evaluations of a period for the given employees, using
+        their default template. Employees that already have an evaluation
+        with that template in the period are skipped. All the evaluations
+        and their lines are created in one batch."""
+        employees = employees.filtered('default_evaluation_template_id')
+        if not employees:
+            return self.browse()
+        self.flush_model(['employee_id', 'template_id', 'performance_period_id'])
+        self.env.cr.execute("""
+            SELECT employee_id, template_id
+              FROM performance_evaluation_program
+             WHERE performance_period_id = %s AND employee_id IN %s
+        """, (period.id, tuple(employees.ids)))
+        existing = set(self.env.cr.fetchall())
+        lines_by_template = {}
+        vals_list = []
         for employee in employees:
-            if employee.default_evaluation_template_id:
-                this_personal_lines = []
-                for pl in employee.default_evaluation_template_id.personal_line_ids:
-                    pline = {
-                                'name':pl.name,
-                                'evaluation':pl.max_value
-                             }
-                    this_personal_lines.append(Command.create(pline))
-                        
-                res = self.env['performance.evaluation.program'].create({
-                  'employee_id': employee.id,
-                  'performance_period_id' : period.id,           
-                  'template_id': employee.default_evaluation_template_id.id,
-                  'personal_ev_line_ids' : this_personal_lines
+            template = employee.default_evaluation_template_id
+            if (employee.id, template.id) in existing:
+                continue
+            if template not in lines_by_template:
+                lines_by_template[template] = [{
+                    'name': pl.name,
+                    'evaluation': pl.max_value
+                } for pl in template.personal_line_ids]
+            vals_list.append({
+                'employee_id': employee.id,
+                'performance_period_id': period.id,
+                'template_id': template.id,
+                'company_id': employee.company_id.id or self.env.company.id,
+                'personal_ev_line_ids': [Command.create(pline) for pline in lines_by_template[template]],
             })
-        return True        
-        
+        return self.with_context(tracking_disable=True, mail_create_nolog=True).create(vals_list)
+
 class ProgramPerosnalLine(models.Model):
     _name = "program.perosnal.line"
     _description = 'Program Perosnal Line'
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     "name": "Performance Evaluation Summary",
-    "version": "16.0.1.0.0",
+    "version": "16.0.1.1.0",
     "summary": "Resumen de evaluaciones de subordinados por periodo (fixes)",
     "description": "Extiende el módulo de Performance Evaluation y añade un wizard para imprimir un resumen de evaluaciones de los subordinados de un empleado para un período determinado. Esta versión incluye correcciones de templates y permisos.",
     "author": "ChatGPT for user",
@@ -19,31 +19,50 @@ class PerformanceEvaluationSummaryWizard(models.TransientModel):
         departamento = self.employee_id.department_id.name or 'Departamento'
         return f"Reporte de evaluación - {periodo} - {departamento}"
 
-    def _get_subordinates(self):
+    def _get_latest_evaluations(self):
+        """Latest evaluation of the period of each direct subordinate,
+        picked in SQL: {employee_id: evaluation_id}"""
         self.ensure_one()
-        evals = self.env['performance.evaluation.program'].search([
-            ('performance_period_id', '=', self.performance_period_id.id),
-            ('employee_id.parent_id', '=', self.employee_id.id),
-        ])
-        return evals.mapped('employee_id').with_context(active_test=False)
+        Evaluation = self.env['performance.evaluation.program']
+        Evaluation.flush_model(['employee_id', 'performance_period_id', 'date_of_evaluation', 'active'])
+        self.env['hr.employee'].flush_model(['parent_id'])
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (ev.employee_id) ev.employee_id, ev.id
+              FROM performance_evaluation_program ev
+              JOIN hr_employee emp ON emp.id = ev.employee_id
+             WHERE ev.performance_period_id = %s
+               AND emp.parent_id = %s
+               AND ev.active
+          ORDER BY ev.employee_id, ev.date_of_evaluation DESC NULLS LAST, ev.id DESC
+        """, (self.performance_period_id.id, self.employee_id.id))
+        latest = dict(self.env.cr.fetchall())
+        # Keep the access rules of the evaluations
+        allowed = set(Evaluation.browse(latest.values())._filter_access_rules('read').ids)
+        return {emp_id: ev_id for emp_id, ev_id in latest.items() if ev_id in allowed}
 
+    def _get_subordinates(self):
+        self.ensure_one()
+        latest = self._get_latest_evaluations()
+        return self.env['hr.employee'].with_context(active_test=False).browse(latest).sorted('name')
 
     def _gather_evaluations(self):
         self.ensure_one()
-        subs = self._get_subordinates()
-        if not subs:
-            return []
-        evals = self.env['performance.evaluation.program'].search([
-            ('employee_id', 'in', subs.ids),
-            ('performance_period_id', '=', self.performance_period_id.id)
-        ])
-        # Map evaluations by employee id (take latest if multiple)
-        result = {}
-        for ev in evals.sorted(key=lambda r: r.date_of_evaluation or False, reverse=True):
-            if ev.employee_id.id not in result:
-                result[ev.employee_id.id] = ev
+        latest = self._get_latest_evaluations()
+        subs = self.env['hr.employee'].with_context(active_test=False).browse(latest).sorted('name')
+        evaluations = self.env['performance.evaluation.program'].browse(latest.values())
+        by_employee = {ev.employee_id.id: ev for ev in evaluations}
         # Return list preserving subordinate order
-        return [result.get(emp.id) for emp in subs]
+        return [(emp, by_employee[emp.id]) for emp in subs]
+
+    def _get_score_rollup(self, lines=None):
+        """Average score and number of evaluations of the report rows, with
+        the same score each row displays"""
+        self.ensure_one()
+        if lines is None:
+            lines = self._gather_evaluations()
+        scores = [ev.overall_score or ev.overall_personal_score for emp, ev in lines]
+        scores = [score for score in scores if score]
+        return (sum(scores) / len(scores) if scores else 0.0, len(lines))
     
     
         fields_to_check = {
@@ -1,5 +1,6 @@
 from . import pos_config
 from . import pos_session
+from . import pos_stock_notification
 from . import res_config_settings
 from . import stock_quant
 from . import stock_warehouse
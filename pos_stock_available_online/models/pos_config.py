@@ -1,6 +1,8 @@
 import logging
+from collections import defaultdict
+from datetime import timedelta
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 _logger = logging.getLogger(__name__)
 
@@ -51,3 +53,83 @@ class PosConfig(models.Model):
         if notifications:
             self.env["bus.bus"]._sendmany(notifications)
             _logger.debug("POS notifications for %s: %s", self.ids, notifications)
+
+    @api.model
+    def _dispatch_product_quantities(self, pairs):
+        """
+        Notify POSes about the (warehouse, product) pairs changed in a
+        transaction, right away or once the notification delay is over
+        """
+        if not pairs:
+            return
+        delay = int(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("pos_stock_available_online.notification_delay", 0)
+        )
+        if delay <= 0:
+            self._notify_product_quantities(pairs)
+            return
+        self.env["pos.stock.notification"]._enqueue(pairs)
+        self.env.ref(
+            "pos_stock_available_online.ir_cron_notify_product_quantities"
+        )._trigger(at=fields.Datetime.now() + timedelta(seconds=delay))
+
+    @api.model
+    def _cron_notify_product_quantities(self):
+        """
+        Send the notifications queued during the notification delay
+        """
+        self._notify_product_quantities(self.env["pos.stock.notification"]._dequeue())
+
+    @api.model
+    def _notify_product_quantities(self, pairs):
+        """
+        Compute the quantities of all the (warehouse, product) pairs in one
+        batch per warehouse and send one message per POS channel
+        """
+        configs = (
+            self.env["pos.session"]
+            .search(
+                [
+                    ("state", "=", "opened"),
+                    ("config_id.display_product_quantity", "=", True),
+                ]
+            )
+            .mapped("config_id")
+        )
+        if not configs or not pairs:
+            return
+        product_ids_by_warehouse = defaultdict(set)
+        for warehouse_id, product_id in pairs:
+            product_ids_by_warehouse[warehouse_id].add(product_id)
+        products = self.env["product.product"].browse(
+            {product_id for dummy, product_id in pairs}
+        )
+        messages = defaultdict(list)
+        for warehouse in self.env["stock.warehouse"].browse(product_ids_by_warehouse):
+            for product in products:
+                if product.id in product_ids_by_warehouse[warehouse.id]:
+                    messages[warehouse.id].append(
+                        warehouse._prepare_vals_for_pos(product)
+                    )
+        notifications = []
+        for config in configs:
+            warehouse_ids = (
+                config.main_warehouse_id | config.additional_warehouse_ids
+            ).ids
+            categories = config.iface_available_categ_ids
+            message = [
+                vals
+                for warehouse_id in warehouse_ids
+                for vals in messages.get(warehouse_id, [])
+                if not categories
+                or products.browse(vals["product_id"]).pos_categ_id in categories
+            ]
+            if message:
+                notifications.append(
+                    [config._get_channel_name(), "pos.config/product_update", message]
+                )
+        if notifications:
+            self.env["bus.bus"]._sendmany(notifications)
+            _logger.debug("POS notifications for %s: %s", configs.ids, notifications)
@@ -0,0 +1,42 @@
+from odoo import api, fields, models
+
+
+class PosStockNotification(models.Model):
+    _name = "pos.stock.notification"
+    _description = "Pending POS Product Quantity Notification"
+    _log_access = False
+
+    warehouse_id = fields.Many2one("stock.warehouse", required=True, ondelete="cascade")
+    product_id = fields.Many2one("product.product", required=True, ondelete="cascade")
+
+    _sql_constraints = [
+        (
+            "warehouse_product_uniq",
+            "unique(warehouse_id, product_id)",
+            "A notification is already pending for this product and warehouse.",
+        )
+    ]
+
+    @api.model
+    def _enqueue(self, pairs):
+        """
+        Queue (warehouse, product) pairs, ignoring the ones already pending
+        """
+        self.env.cr.execute(
+            """
+            INSERT INTO pos_stock_notification (warehouse_id, product_id)
+            SELECT * FROM unnest(%s::int[], %s::int[])
+            ON CONFLICT DO NOTHING
+            """,
+            ([pair[0] for pair in pairs], [pair[1] for pair in pairs]),
+        )
+
+    @api.model
+    def _dequeue(self):
+        """
+        Remove and return all the pending (warehouse, product) pairs
+        """
+        self.env.cr.execute(
+            "DELETE FROM pos_stock_notification RETURNING warehouse_id, product_id"
+        )
+        return set(self.env.cr.fetchall())
@@ -21,3 +21,10 @@ class ResConfigSettings(models.TransientModel):
         related="pos_config_id.minimum_product_quantity_alert",
         readonly=False,
     )
+    pos_stock_notification_delay = fields.Integer(
+        string="Quantity Notification Delay",
+        config_parameter="pos_stock_available_online.notification_delay",
+        help="Seconds during which stock changes are collected before the "
+        "quantities are sent to the POS. 0 sends them at the end of each "
+        "transaction.",
+    )
@@ -4,6 +4,8 @@ from odoo import models
 
 _logger = logging.getLogger(__name__)
 
+PENDING_KEY = "pos_stock_available_online.pending"
+
 
 class StockQuant(models.Model):
     _inherit = "stock.quant"
@@ -17,29 +19,30 @@ class StockQuant(models.Model):
 
     def _notify_pos(self):
         """
-        Send notification to POS
+        Collect the changed (warehouse, product) pairs of the transaction.
+        POSes are notified once, right before the commit, with the
+        quantities of all the collected pairs.
         """
-        pos_session_obj = self.env["pos.session"]
-        for quant in self:
-            warehouse_id = quant.warehouse_id.id
-            configs = pos_session_obj.search(
-                [
-                    ("state", "=", "opened"),
-                    ("config_id.display_product_quantity", "=", True),
-                    "|",
-                    ("config_id.additional_warehouse_ids", "in", [warehouse_id]),
-                    ("config_id.main_warehouse_id", "=", warehouse_id),
-                    "|",
-                    ("config_id.iface_available_categ_ids", "=", False),
-                    (
-                        "config_id.iface_available_categ_ids",
-                        "in",
-                        [quant.product_id.pos_categ_id.id],
-                    ),
-                ],
-            ).mapped("config_id")
-            if configs:
-                configs._notify_available_quantity(quant._prepare_pos_message())
+        pairs = {
+            (quant.warehouse_id.id, quant.product_id.id)
+            for quant in self
+            if quant.warehouse_id
+        }
+        if not pairs:
+            return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(PENDING_KEY)
+        if pending is None:
+            pending = precommit.data[PENDING_KEY] = set()
+            env = self.env
+
+            @precommit.add
+            def notify_pos():
+                env["pos.config"]._dispatch_product_quantities(
+                    precommit.data.pop(PENDING_KEY, set())
+                )
+
+        pending.update(pairs)
 
     def write(self, vals):
         res = super().write(vals)
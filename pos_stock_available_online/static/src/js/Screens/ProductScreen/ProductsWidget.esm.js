@@ -48,7 +48,7 @@ const StockProductsWidget = (OriginalProductsWidget) =>
                             product.warehouse_info.push(message);
                         }
                     } else {
-                        ProductIds.push(message.id);
+                        ProductIds.push(message.product_id);
                     }
                 }
             }
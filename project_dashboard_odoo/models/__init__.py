@@ -18,4 +18,6 @@
 #    (AGPL v3) along with this program.
 #    If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
+from . import account_analytic_line
 from . import project
+from . import project_task
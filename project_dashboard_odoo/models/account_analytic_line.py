@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+################################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2023-TODAY Cybrosys Technologies(<https://www.cybrosys.com>).
+#    Author: Yadhukrishnan K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU AFFERO
+#    GENERAL PUBLIC LICENSE (AGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU AFFERO GENERAL PUBLIC LICENSE (AGPL v3) for more details.
+#
+#    You should have received a copy of the GNU AFFERO GENERAL PUBLIC LICENSE
+#    (AGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+from odoo import api, models
+
+
+class AccountAnalyticLine(models.Model):
+    """
+
+    The AccountAnalyticLine class drops the cached tiles of the project dashboard when
+    the timesheets change.
+
+    """
+    _inherit = 'account.analytic.line'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """ Drop the cached tiles of the dashboard """
+        records = super().create(vals_list)
+        self.env['project.project']._invalidate_tiles_cache()
+        return records
+
+    def write(self, vals):
+        """ Drop the cached tiles of the dashboard """
+        res = super().write(vals)
+        self.env['project.project']._invalidate_tiles_cache()
+        return res
+
+    def unlink(self):
+        """ Drop the cached tiles of the dashboard """
+        self.env['project.project']._invalidate_tiles_cache()
+        return super().unlink()
@@ -19,8 +19,16 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 import random
+import time
 from odoo import api, models
 
+# Seconds during which the tiles of the dashboard are kept per user
+TILES_CACHE_TIMEOUT = 60
+# Cached tiles: {(dbname, uid, company ids): (expiration time, tiles)}
+_TILES_CACHE = {}
+# Key of the pending invalidation in the transaction postcommit data
+TILES_CACHE_KEY = 'project_dashboard_odoo.invalidate_tiles'
+
 
 class Project(models.Model):
     """
@@ -32,6 +40,10 @@ class Project(models.Model):
                 when the page is loaded get the data from different models and
                 transfer to the js file.
                 return a dictionary variable.
+            _get_tiles_data(self):
+                computing the tiles with grouped aggregates.
+            _invalidate_tiles_cache(self):
+                dropping the cached tiles after the commit.
             get_top_timesheet_employees(model_ids):
                getting data for the timesheet graph.
             get_hours_data(self):
@@ -53,89 +65,109 @@ class Project(models.Model):
         Summery:
             when the page is loaded get the data from different models and
             transfer to the js file.
-            return a dictionary variable.
+            return a dictionary variable. The result is cached for a short
+            time per user and company, and dropped as soon as a task or a
+            timesheet is written.
         return:
             type:It is a dictionary variable. This dictionary contain data that
             affecting the dashboard view.
 
         """
-        user_employee = self.env.user.partner_id
-        if user_employee.user_has_groups('project.group_project_manager'):
-            all_project = self.env['project.project'].search([])
-            all_task = self.env['project.task'].search([])
-            analytic_project = self.env['account.analytic.line'].search([])
-            report_project = self.env['timesheets.analysis.report'].search([])
-            margin = sum(report_project.mapped('margin'))
-            total_time = sum(analytic_project.mapped('unit_amount'))
-            employees = self.env['hr.employee'].search([])
-
-            task = self.env['project.task'].search_read([
-                ('sale_order_id', '!=', False)
-            ], ['sale_order_id'])
-            task_so_ids = [o['sale_order_id'][0] for o in task]
-            sale_orders = self.mapped('sale_line_id.order_id') | self.env[
-                'sale.order'].browse(task_so_ids)
-            project_stage_ids = self.env['project.project.stage'].search([])
-            project_stage_list = []
-            for project_stage_id in project_stage_ids:
-                total_projects = self.env['project.project'].search_count(
-                    [('stage_id', '=', project_stage_id.id)])
-                project_stage_list.append({
-                    'name': project_stage_id.name,
-                    'projects': total_projects
-                })
-            return {
-                'total_projects': len(all_project),
-                'total_projects_ids': all_project.ids,
-                'total_tasks': len(all_task),
-                'total_tasks_ids': all_task.ids,
-                'total_hours': total_time,
-                'total_profitability': margin,
-                'total_employees': len(employees),
-                'total_sale_orders': len(sale_orders),
-                'sale_orders_ids': sale_orders.mapped('id'),
-                'project_stage_list': project_stage_list,
-                'flag': 1
-            }
+        key = (self.env.cr.dbname, self.env.uid,
+               tuple(self.env.companies.ids))
+        cached = _TILES_CACHE.get(key)
+        if cached and cached[0] > time.monotonic():
+            return dict(cached[1])
+        tiles = self._get_tiles_data()
+        _TILES_CACHE[key] = (time.monotonic() + TILES_CACHE_TIMEOUT, tiles)
+        return dict(tiles)
+
+    @api.model
+    def _get_tiles_data(self):
+        """
+
+        Summery:
+            compute the tiles of the dashboard with grouped aggregates: only
+            the ids of the projects and of the sale orders are fetched, and
+            the tasks are given as a domain.
+        return:
+            type:It is a dictionary variable with the tiles of the dashboard.
+
+        """
+        is_manager = self.env.user.partner_id.user_has_groups(
+            'project.group_project_manager')
+        if is_manager:
+            project_domain = []
+            task_domain = []
+            line_domain = []
         else:
-            all_project = self.env['project.project'].search(
-                [('user_id', '=', self.env.uid)])
-            all_task = []
-            for task in self.env['project.task'].search([]):
-                for assignee in task.user_ids:
-                    if assignee.id == self.env.uid:
-                        all_task.append(task.id)
-            analytic_project = self.env['account.analytic.line'].search(
-                [('project_id', 'in', all_project.ids)])
-            total_time = sum(analytic_project.mapped('unit_amount'))
-            task = self.env['project.task'].search_read([
-                ('sale_order_id', '!=', False),
-                ('project_id', 'in', all_project.ids)
-            ], ['sale_order_id'])
-            task_so_ids = [o['sale_order_id'][0] for o in task]
-            sale_orders = self.mapped('sale_line_id.order_id') | self.env[
-                'sale.order'].browse(task_so_ids)
-            project_stage_ids = self.env['project.project.stage'].search([])
-            project_stage_list = []
-            for project_stage_id in project_stage_ids:
-                total_projects = self.env['project.project'].search_count(
-                    [('stage_id', '=', project_stage_id.id),
-                     ('id', 'in', all_project.ids)])
-                project_stage_list.append({
-                    'name': project_stage_id.name,
-                    'projects': total_projects
-                })
-            return {
-                'total_projects': len(all_project),
-                'total_projects_ids': all_project.ids,
-                'total_tasks': len(all_task),
-                'total_tasks_ids': all_task,
-                'total_hours': total_time,
-                'total_sale_orders': len(sale_orders),
-                'sale_orders_ids': sale_orders.mapped('id'),
-                'project_stage_list': project_stage_list,
-                'flag': 2
-            }
+            project_domain = [('user_id', '=', self.env.uid)]
+            task_domain = [('user_ids', 'in', self.env.uid)]
+        all_project = self.env['project.project'].search(project_domain).ids
+        if not is_manager:
+            line_domain = [('project_id', 'in', all_project)]
+        total_time = self.env['account.analytic.line'].read_group(
+            line_domain, ['unit_amount:sum'], [])[0]['unit_amount'] or 0.0
+        so_task_domain = [('sale_order_id', '!=', False)]
+        if not is_manager:
+            so_task_domain.append(('project_id', 'in', all_project))
+        sale_orders_ids = [
+            group['sale_order_id'][0]
+            for group in self.env['project.task'].read_group(
+                so_task_domain, ['sale_order_id'], ['sale_order_id'])]
+        stage_counts = {
+            group['stage_id'][0]: group['stage_id_count']
+            for group in self.env['project.project'].read_group(
+                project_domain + [('stage_id', '!=', False)], ['stage_id'],
+                ['stage_id'])}
+        project_stage_list = [{
+            'name': stage['name'],
+            'projects': stage_counts.get(stage['id'], 0)
+        } for stage in self.env['project.project.stage'].search_read(
+            [], ['name'])]
+        result = {
+            'total_projects': len(all_project),
+            'total_projects_ids': all_project,
+            'total_tasks': self.env['project.task'].search_count(
+                task_domain),
+            'total_tasks_domain': task_domain,
+            'total_hours': total_time,
+            'total_sale_orders': len(sale_orders_ids),
+            'sale_orders_ids': sale_orders_ids,
+            'project_stage_list': project_stage_list,
+            'flag': 2
+        }
+        if is_manager:
+            result.update({
+                'total_profitability': self.env[
+                    'timesheets.analysis.report'].read_group(
+                    [], ['margin:sum'], [])[0]['margin'] or 0.0,
+                'total_employees': self.env['hr.employee'].search_count([]),
+                'flag': 1
+            })
+        return result
+
+    @api.model
+    def _invalidate_tiles_cache(self):
+        """
+
+        Summery:
+            drop the cached tiles of the database once the current
+            transaction is committed.
+
+        """
+        postcommit = self.env.cr.postcommit
+        if postcommit.data.get(TILES_CACHE_KEY):
+            return
+        postcommit.data[TILES_CACHE_KEY] = True
+        dbname = self.env.cr.dbname
+
+        @postcommit.add
+        def invalidate_tiles_cache():
+            postcommit.data.pop(TILES_CACHE_KEY, None)
+            for key in list(_TILES_CACHE):
+                if key[0] == dbname:
+                    _TILES_CACHE.pop(key, None)
 
     @api.model
     def get_top_timesheet_employees(self):
@@ -208,9 +208,9 @@ odoo.define('pj_dashboard.Dashboard', function(require) {
                 name: _t("Tasks"),
                 type: 'ir.actions.act_window',
                 res_model: 'project.task',
-                domain: [
+                domain: self.tot_task ? [
                     ["id", "in", self.tot_task]
-                ],
+                ] : self.tot_task_domain,
                 view_mode: 'tree,kanban,form',
                 views: [
                     [false, 'list'],
@@ -432,7 +432,8 @@ odoo.define('pj_dashboard.Dashboard', function(require) {
                 if (result['flag'] == 1) {
                     self.total_projects = result['total_projects']
                     self.total_tasks = result['total_tasks']
-                    self.tot_task = result['total_tasks_ids']
+                    self.tot_task = false
+                    self.tot_task_domain = result['total_tasks_domain']
                     self.total_hours = result['total_hours']
                     self.total_profitability = result['total_profitability']
                     self.total_employees = result['total_employees']
@@ -442,7 +443,8 @@ odoo.define('pj_dashboard.Dashboard', function(require) {
                     self.flag_user = result['flag']
                     self.total_projects_ids = result['total_projects_ids']
                 } else {
-                    self.tot_task = result['total_tasks_ids']
+                    self.tot_task = false
+                    self.tot_task_domain = result['total_tasks_domain']
                     self.total_projects = result['total_projects']
                     self.total_tasks = result['total_tasks']
                     self.total_hours = result['total_hours']
@@ -25,6 +25,7 @@ logging.basicConfig(
 try:
     from scan.core.exportador import ExportadorOdoo
     from scan.core.recolector import GestorTI
+    from scan.core.huellas import AlmacenHuellas
 except ImportError as e:
     logging.error(f"Error de importación: {e}. Asegúrate de ejecutar desde la raíz del proyecto.")
     sys.exit(1)
@@ -54,6 +55,20 @@ class AgenteScanner:
             username=username,
             password=password  # Usamos la contraseña recuperada de forma segura
         )
+        # Huellas del último escaneo aceptado: solo se envían las secciones que cambian
+        self.almacen_huellas = AlmacenHuellas(config.get("ruta_huellas", "huellas_scan.json"))
+        # El gestor se conserva entre ciclos para aprovechar la caché de sus recolectores
+        self.gestor = None
+
+    def _obtener_gestor(self) -> GestorTI:
+        software = self.exportador.software_module_installed
+        red = self.exportador.network_module_installed
+        if self.gestor is None or (self.gestor.software_installed, self.gestor.network_installed) != (software, red):
+            if self.gestor is not None:
+                self.gestor.cerrar()
+            # Pasamos la información de los módulos al recolector
+            self.gestor = GestorTI(software_installed=software, network_installed=red)
+        return self.gestor
 
     def _ejecutar_ciclo(self) -> bool:
         logging.info("Iniciando nuevo ciclo de escaneo...")
@@ -65,13 +80,8 @@ class AgenteScanner:
         self.exportador.check_installed_modules()
         
         try:
-            # Pasamos la información de los módulos al recolector
-            gestor = GestorTI(
-                software_installed=self.exportador.software_module_installed,
-                network_installed=self.exportador.network_module_installed
-            )
-            datos_completos = gestor.recolectar_todo()
-            self.exportador.exportar_activo_completo(datos_completos)
+            datos_completos = self._obtener_gestor().recolectar_todo()
+            self.exportador.exportar_activo_completo(datos_completos, self.almacen_huellas)
             logging.info("Ciclo de escaneo y exportación completado exitosamente.")
             return True
         except Exception as e:
@@ -6,6 +6,8 @@ hiddenimports = [
     'scan.sistema',
     'scan.core.recolector',
     'scan.core.exportador',
+    'scan.core.contexto',
+    'scan.core.huellas',
     'scan.hardware.cpu',
     'scan.hardware.disco',
     'scan.hardware.gpu',
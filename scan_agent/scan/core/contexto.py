@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Recursos compartidos por los recolectores durante un escaneo: la conexión
+WMI de cada hilo y la salida de los comandos que varios recolectores (o un
+mismo recolector varias veces) necesitan leer.
+"""
+import subprocess
+import threading
+from typing import Dict
+
+_local = threading.local()
+_salidas: Dict[str, str] = {}
+_bloqueo = threading.Lock()
+
+
+def inicializar_hilo():
+    """
+    Prepara un hilo de recolección. En Windows, COM debe inicializarse en
+    cada hilo antes de usar WMI o ``win32com``.
+    """
+    try:
+        import pythoncom
+    except ImportError:
+        return
+    pythoncom.CoInitialize()
+
+
+def obtener_wmi():
+    """
+    Conexión WMI del hilo actual. Se abre una vez por hilo y se reutiliza en
+    los escaneos siguientes (las conexiones COM no se comparten entre hilos).
+    """
+    conexion = getattr(_local, 'wmi', None)
+    if conexion is None:
+        import wmi
+        conexion = _local.wmi = wmi.WMI()
+    return conexion
+
+
+def salida_comando(comando: str, timeout: int = 60) -> str:
+    """
+    Salida de un comando de consola, ejecutado como mucho una vez por
+    escaneo. Los errores no se guardan: el siguiente intento vuelve a
+    ejecutarlo.
+    """
+    with _bloqueo:
+        if comando in _salidas:
+            return _salidas[comando]
+    salida = subprocess.check_output(
+        comando, shell=True, text=True, stderr=subprocess.STDOUT, timeout=timeout)
+    with _bloqueo:
+        _salidas[comando] = salida
+    return salida
+
+
+def nuevo_escaneo():
+    """Descarta las salidas de comandos del escaneo anterior."""
+    with _bloqueo:
+        _salidas.clear()
@@ -6,6 +6,7 @@ import logging
 import random
 from typing import Dict, Any, List, Optional
 from .mapper import ComponentMapper # ¡Importamos el nuevo mapeador!
+from .huellas import AlmacenHuellas, SECCIONES, es_error, secciones_validas
 
 logging.basicConfig(
     level=logging.INFO,
@@ -90,104 +91,135 @@ class ExportadorOdoo:
         else:
             logging.error("No se pudieron obtener los subtipos de componentes de Odoo.")
 
-    def _buscar_o_crear(self, modelo: str, search_domain: list, create_vals: dict, update_vals: dict = None):
-        # ... (código sin cambios)
-        update_vals = update_vals or create_vals
-        existente_ids = self._llamar_api(modelo, 'search', [search_domain], {'limit': 1})
-        if existente_ids:
-            record_id = existente_ids[0]
-            self._llamar_api(modelo, 'write', [[record_id], update_vals])
-            return record_id
-        else:
-            return self._llamar_api(modelo, 'create', [create_vals])
-
-    def exportar_activo_completo(self, datos: Dict[str, Any]):
+    def exportar_activo_completo(self, datos: Dict[str, Any], almacen: Optional[AlmacenHuellas] = None):
+        """
+        Envía el escaneo a Odoo. Con un ``almacen`` de huellas solo se envían
+        las secciones que cambiaron desde el último envío aceptado (o solo las
+        huellas si no cambió nada); sin él se envía el escaneo completo.
+        """
         if not self.uid:
             if not self._autenticar():
                 logging.error("Exportación abortada. Se requiere autenticación.")
                 return
-        
-        # ¡NUEVO! Obtenemos el mapa de subtipos antes de empezar a procesar
-        self._fetch_and_load_subtypes()
 
+        interfaces = [] if es_error(datos.get('red')) else datos.get('red', [])
         id_unico_hw = datos.get('placa_madre', {}).get('Número de Serie') or \
-                      next((iface.get('mac') for iface in datos.get('red', []) if iface.get('mac')), None)
+                      next((iface.get('mac') for iface in interfaces if iface.get('mac')), None)
         if not id_unico_hw:
             logging.error("No se pudo determinar un ID único para el hardware. Abortando.")
             return
 
-        # --- 1. PROCESAR Y CREAR COMPONENTES CON MAPEADOR ---
-        component_ids = []
-        todos_los_componentes = (datos.get('almacenamiento', []) + datos.get('ram', []) + 
-                                 [datos.get('cpu', {})] + [datos.get('placa_madre', {})] + 
-                                 datos.get('gpu', []) + datos.get('perifericos', []))
-
-        for comp_data in todos_los_componentes:
-            if not comp_data: continue
-            
-            # Usamos diferentes campos como número de serie de respaldo
-            serial_number = comp_data.get('Número de Serie') or comp_data.get('ID único') or comp_data.get('id_unico') or comp_data.get('pnp_id')
-            if not serial_number:
-                continue
-            
-            # ¡NUEVO! Usamos el mapeador para obtener el subtype_id
-            subtype_id = self.mapper.get_subtype_id(comp_data)
-            if not subtype_id:
-                logging.warning(f"Omitiendo componente sin subtipo mapeado: {comp_data.get('Modelo') or comp_data.get('nombre')}")
-                continue
-
-            comp_vals = {
-                'model': comp_data.get('Modelo') or comp_data.get('nombre', 'Desconocido'),
-                'serial_number': serial_number,
-                'subtype_id': subtype_id
-            }
-            comp_id = self._buscar_o_crear(
-                self.modelos['componente'],
-                [('serial_number', '=', comp_vals['serial_number'])],
-                comp_vals
-            )
-            if comp_id:
-                component_ids.append(comp_id)
-
-        # --- 2. PROCESAR IPs ---
-        ip_ids = []
-        if self.network_module_installed and 'red' in datos:
-            for iface in datos['red']:
-                for ip_addr in iface.get('ipv4', []):
-                    ip_vals = {'address': ip_addr, 'description': iface.get('nombre')}
-                    ip_id = self._buscar_o_crear(self.modelos['ip'], [('address', '=', ip_addr)], ip_vals)
-                    if ip_id:
-                        ip_ids.append(ip_id)
-        
-        # --- 3. PROCESAR SOFTWARE ---
-        software_ids = []
-        if self.software_module_installed and 'programas' in datos:
-            for prog in datos['programas']:
-                sw_vals = {'name': prog.get('nombre', 'Desconocido'), 'version': prog.get('version', 'N/A')}
-                sw_id = self._buscar_o_crear(self.modelos['software'], [('name', '=', sw_vals['name']), ('version', '=', sw_vals['version'])], sw_vals)
-                if sw_id:
-                    software_ids.append(sw_id)
-
-        # --- 4. VINCULACIÓN FINAL EN BACKLOG ---
+        if almacen is None:
+            payload = self._preparar_payload(datos, id_unico_hw)
+            payload['raw_data'] = json.dumps(datos, indent=2, default=str)
+            return self._enviar_escaneo(id_unico_hw, payload)
+
+        # --- ENVÍO INCREMENTAL POR HUELLAS ---
+        huellas = almacen.calcular(datos)
+        secciones = almacen.secciones_cambiadas(id_unico_hw, huellas)
+        if secciones:
+            logging.info(f"Secciones modificadas desde el último escaneo: {', '.join(secciones)}.")
+        else:
+            logging.info("Sin cambios desde el último escaneo. Se envía solo la señal de vida.")
+        resultado = self._enviar_escaneo(id_unico_hw, self._preparar_payload_parcial(datos, id_unico_hw, huellas, secciones))
+        if resultado and resultado.get('missing_sections'):
+            # Odoo no tiene la versión de esas secciones (p. ej. se borró el
+            # backlog): se reenvían completas
+            secciones = sorted(set(secciones) | set(resultado['missing_sections']))
+            logging.info(f"Odoo solicita las secciones: {', '.join(resultado['missing_sections'])}. Reenviando.")
+            resultado = self._enviar_escaneo(id_unico_hw, self._preparar_payload_parcial(datos, id_unico_hw, huellas, secciones))
+        if resultado and not resultado.get('missing_sections'):
+            almacen.guardar(id_unico_hw, huellas)
+        return resultado
+
+    def _preparar_payload_parcial(self, datos: Dict[str, Any], id_unico_hw: str,
+                                  huellas: Dict[str, str], secciones: List[str]) -> Dict[str, Any]:
+        """Payload con las huellas de todas las secciones y los datos de ``secciones``."""
+        validas = secciones_validas(datos)
+        secciones = [seccion for seccion in secciones if seccion in validas]
+        payload = self._preparar_payload(datos, id_unico_hw, secciones)
+        payload['fingerprints'] = huellas
+        payload['sections'] = list(secciones)
+        payload['raw_data_update'] = {
+            clave: datos[clave]
+            for seccion in secciones
+            for clave in SECCIONES.get(seccion, [])
+            if clave in datos
+        }
+        return json.loads(json.dumps(payload, default=str))
+
+    def _preparar_payload(self, datos: Dict[str, Any], id_unico_hw: str,
+                          secciones: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Datos del escaneo para ``ingest_scan``. Si se indican ``secciones``,
+        solo se incluyen las relaciones (componentes, software, IPs) de esas.
+        Las secciones con algún recolector en error nunca se incluyen.
+        """
+        incluir = set(secciones_validas(datos))
+        if secciones is not None:
+            incluir &= set(secciones)
         os_info = datos.get('sistema_operativo', {})
-        backlog_vals = {
+        payload = {
+            'name': id_unico_hw,
             'description': f"{socket.gethostname()} - {os_info.get('sistema', 'OS Desc.')}",
             'type': 'hardware',
-            'raw_data': json.dumps(datos, indent=2, default=str),
-            'components_ids': [(6, 0, list(set(component_ids)))],
-            'software_ids': [(6, 0, software_ids)] if self.software_module_installed else False,
-            'ip_ids': [(6, 0, ip_ids)] if self.network_module_installed else False,
         }
+
+        # --- 1. PREPARAR COMPONENTES CON MAPEADOR ---
+        if 'hardware' in incluir:
+            # El mapa de subtipos solo se consulta cuando se envían componentes
+            self._fetch_and_load_subtypes()
+            componentes = []
+            todos_los_componentes = (datos.get('almacenamiento', []) + datos.get('ram', []) + 
+                                     [datos.get('cpu', {})] + [datos.get('placa_madre', {})] + 
+                                     datos.get('gpu', []) + datos.get('perifericos', []))
+
+            for comp_data in todos_los_componentes:
+                if not comp_data: continue
+                
+                # Usamos diferentes campos como número de serie de respaldo
+                serial_number = comp_data.get('Número de Serie') or comp_data.get('ID único') or comp_data.get('id_unico') or comp_data.get('pnp_id')
+                if not serial_number:
+                    continue
+                
+                # ¡NUEVO! Usamos el mapeador para obtener el subtype_id
+                subtype_id = self.mapper.get_subtype_id(comp_data)
+                if not subtype_id:
+                    logging.warning(f"Omitiendo componente sin subtipo mapeado: {comp_data.get('Modelo') or comp_data.get('nombre')}")
+                    continue
+
+                componentes.append({
+                    'model': comp_data.get('Modelo') or comp_data.get('nombre', 'Desconocido'),
+                    'serial_number': serial_number,
+                    'subtype_id': subtype_id
+                })
+            payload['components'] = componentes
+
+        # --- 2. PREPARAR IPs ---
+        if self.network_module_installed and 'red' in incluir:
+            ips = []
+            for iface in datos.get('red', []):
+                for ip_addr in iface.get('ipv4', []):
+                    ips.append({'address': ip_addr, 'description': iface.get('nombre')})
+            payload['ips'] = ips
         
-        backlog_vals = {k: v for k, v in backlog_vals.items() if v is not False}
-
-        self._buscar_o_crear(
-            self.modelos['backlog'],
-            [('name', '=', id_unico_hw)],
-            {'name': id_unico_hw, **backlog_vals},
-            backlog_vals
-        )
-        logging.info(f"Proceso de exportación para '{id_unico_hw}' completado.")
+        # --- 3. PREPARAR SOFTWARE ---
+        if self.software_module_installed and 'programas' in incluir:
+            programas = []
+            for prog in datos.get('programas', []):
+                programas.append({'name': prog.get('nombre', 'Desconocido'), 'version': prog.get('version', 'N/A')})
+            payload['software'] = programas
+        return payload
+
+    def _enviar_escaneo(self, id_unico_hw: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # El servidor resuelve componentes, IPs y software por lotes y
+        # actualiza o crea el backlog en una sola transacción
+        resultado = self._llamar_api(self.modelos['backlog'], 'ingest_scan', [payload])
+        if resultado is None:
+            logging.error(f"La exportación para '{id_unico_hw}' no se pudo completar.")
+            return
+        logging.info(f"Proceso de exportación para '{id_unico_hw}' completado (backlog ID: {resultado.get('backlog_id')}).")
+        return resultado
 
     def test_connection_with_odoo(self) -> bool:
         if not self._autenticar(): return False
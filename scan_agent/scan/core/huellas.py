@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Any, List
+
+# Secciones del escaneo que se envían (o no) de forma independiente y
+# claves de los datos recolectados que forman cada una
+SECCIONES = {
+    'hardware': ['placa_madre', 'cpu', 'almacenamiento', 'ram', 'gpu', 'perifericos', 'sistema_operativo'],
+    'programas': ['programas'],
+    'red': ['red'],
+}
+
+# Valores que cambian en cada escaneo sin que cambie el inventario
+CLAVES_VOLATILES = {'Espacio libre (GB)', 'Espacio usado (GB)'}
+
+
+def _sin_volatiles(valor):
+    if isinstance(valor, dict):
+        return {k: _sin_volatiles(v) for k, v in valor.items() if k not in CLAVES_VOLATILES}
+    if isinstance(valor, list):
+        return [_sin_volatiles(v) for v in valor]
+    return valor
+
+
+def es_error(valor) -> bool:
+    """Indica si el resultado de un recolector es un error en lugar de datos."""
+    if isinstance(valor, dict):
+        return 'error' in valor
+    if isinstance(valor, list):
+        return bool(valor) and all(isinstance(v, dict) and 'error' in v for v in valor)
+    return False
+
+
+def secciones_validas(datos: Dict[str, Any]) -> List[str]:
+    """
+    Secciones presentes en los datos sin ningún recolector con error. Las
+    que fallaron no se envían ni se registran, para no reemplazar en Odoo
+    los datos buenos del escaneo anterior.
+    """
+    validas = []
+    for seccion, claves in SECCIONES.items():
+        presentes = [clave for clave in claves if clave in datos]
+        if presentes and not any(es_error(datos[clave]) for clave in presentes):
+            validas.append(seccion)
+    return validas
+
+
+class AlmacenHuellas:
+    """
+    Guarda en disco la huella (hash del contenido) de cada sección del último
+    escaneo aceptado por Odoo, para enviar solo las secciones que cambian.
+    """
+    def __init__(self, ruta: str = 'huellas_scan.json'):
+        self.ruta = ruta
+        self.huellas: Dict[str, Dict[str, str]] = self._cargar()
+
+    def _cargar(self) -> Dict[str, Dict[str, str]]:
+        if not os.path.exists(self.ruta):
+            return {}
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"No se pudo leer el almacén de huellas '{self.ruta}': {e}. Se enviará el escaneo completo.")
+            return {}
+
+    @staticmethod
+    def calcular(datos: Dict[str, Any]) -> Dict[str, str]:
+        """Huella de cada sección recolectada sin errores."""
+        huellas = {}
+        for seccion in secciones_validas(datos):
+            contenido = {clave: datos[clave] for clave in SECCIONES[seccion] if clave in datos}
+            serializado = json.dumps(_sin_volatiles(contenido), sort_keys=True, default=str)
+            huellas[seccion] = hashlib.sha256(serializado.encode('utf-8')).hexdigest()
+        return huellas
+
+    def secciones_cambiadas(self, id_activo: str, huellas: Dict[str, str]) -> List[str]:
+        """Secciones cuya huella difiere de la última aceptada para el activo."""
+        anteriores = self.huellas.get(id_activo, {})
+        return [seccion for seccion, huella in huellas.items() if anteriores.get(seccion) != huella]
+
+    def guardar(self, id_activo: str, huellas: Dict[str, str]):
+        """Registra las huellas aceptadas por Odoo para el activo."""
+        self.huellas[id_activo] = dict(huellas)
+        ruta_temporal = f"{self.ruta}.tmp"
+        try:
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump(self.huellas, f, indent=2)
+            os.replace(ruta_temporal, self.ruta)
+        except OSError as e:
+            logging.warning(f"No se pudo guardar el almacén de huellas '{self.ruta}': {e}")
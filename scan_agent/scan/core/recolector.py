@@ -9,17 +9,35 @@ from ..hardware.placamadre import RecolectorPlacaMadre
 from .exportador import ExportadorOdoo
 from ..sistema.os import RecolectorOS
 from ..sistema.programas import RecolectorProgramas
-import wmi
+from . import contexto
+from .huellas import es_error
+from concurrent.futures import ThreadPoolExecutor, wait
 import platform
 import hashlib
 import logging
+import time
+
+# Segundos que se reutiliza el resultado de los recolectores de datos que
+# casi nunca cambian; el resto se consulta en cada escaneo
+TTL_RECOLECTORES = {
+    "placa_madre": 24 * 3600,
+    "cpu": 24 * 3600,
+    "ram": 24 * 3600,
+    "gpu": 6 * 3600,
+}
+
+# Tiempo máximo de espera por recolector en cada escaneo (segundos)
+TIMEOUT_RECOLECTOR = 120
 
 class GestorTI:
-    def __init__(self, software_installed=False, network_installed=False):
+    def __init__(self, software_installed=False, network_installed=False, timeout=TIMEOUT_RECOLECTOR):
         """
         Inicializa el gestor y decide qué recolectores usar
         basado en los módulos instalados en Odoo.
         """
+        self.software_installed = software_installed
+        self.network_installed = network_installed
+        self.timeout = timeout
         self.recolectores = {
             # Los de hardware siempre se recolectan
             "placa_madre": RecolectorPlacaMadre(),
@@ -46,32 +64,115 @@ class GestorTI:
 
         self.exportador = None
 
+        # Los hilos se mantienen entre escaneos para reutilizar su conexión WMI
+        self._ejecutor = ThreadPoolExecutor(
+            max_workers=len(self.recolectores),
+            thread_name_prefix="recolector",
+            initializer=contexto.inicializar_hilo,
+        )
+        self._cache = {}        # nombre -> (instante, resultado)
+        self._pendientes = {}   # nombre -> future que superó el tiempo de espera
+        self._id_pc = None
+        self.tiempos = {}       # nombre -> segundos del último escaneo
+
     def set_exportador(self, exportador: ExportadorOdoo):
         """Asigna una instancia pre-configurada y probada del exportador."""
         self.exportador = exportador
 
     def recolectar_todo(self):
+        """
+        Ejecuta los recolectores en paralelo. Los de datos estables reutilizan
+        su último resultado mientras no venza su TTL, y los que superan el
+        tiempo de espera se reportan como error sin bloquear al resto.
+        """
+        contexto.nuevo_escaneo()
+        inicio = time.monotonic()
         resultados = {}
-        for nombre, recolector in self.recolectores.items():
-            try:
-                if nombre == "perifericos":
-                    perifericos = recolector.obtener_info()
-                    resultados[nombre] = [self._generar_id_periferico(p) for p in perifericos]      
-                elif nombre == "ram":
-                    # Crear conexión WMI
-                    c = wmi.WMI()
-
-                    # Extraer serial de la motherboard y guardar en variable
-                    motherboard_serial = next((board.SerialNumber.strip() for board in c.Win32_BaseBoard()), "UNKNOWN")
-                    pc_identifier = f"{platform.node()}_{motherboard_serial}"
-                    ram = recolector.obtener_info()
-                    resultados[nombre] = [self._generar_id_local_ram(p, pc_identifier) for p in ram]     
-                else:
-                    resultados[nombre] = recolector.obtener_info()
-            except Exception as e:
-                resultados[nombre] = {"error": str(e)}
-        return resultados
+        futuros = {}
+        for nombre in self.recolectores:
+            en_cache = self._cache.get(nombre)
+            if en_cache and inicio - en_cache[0] < TTL_RECOLECTORES.get(nombre, 0):
+                resultados[nombre] = en_cache[1]
+                self.tiempos[nombre] = 0.0
+                continue
+            pendiente = self._pendientes.pop(nombre, None)
+            if pendiente and not pendiente.done():
+                # Sigue ocupado desde un escaneo anterior: no se lanza otra vez
+                self._pendientes[nombre] = pendiente
+                resultados[nombre] = {"error": "El recolector no terminó en el escaneo anterior."}
+                continue
+            if pendiente and self._fue_lento(pendiente):
+                # Terminó después del tiempo de espera: se usa su resultado y
+                # se lanza la siguiente ejecución sin esperarla, para que los
+                # recolectores más lentos que el límite también aporten datos
+                futuros[nombre] = pendiente
+                self._pendientes[nombre] = self._ejecutor.submit(self._ejecutar_recolector, nombre)
+                continue
+            futuros[nombre] = self._ejecutor.submit(self._ejecutar_recolector, nombre)
+
+        wait(futuros.values(), timeout=self.timeout)
+        agotados = set()
+        for nombre, futuro in futuros.items():
+            if not futuro.done():
+                logging.warning(f"El recolector '{nombre}' superó el tiempo de espera ({self.timeout} s).")
+                self._pendientes[nombre] = futuro
+                resultados[nombre] = {"error": f"Tiempo de espera agotado ({self.timeout} s)"}
+                agotados.add(nombre)
+                continue
+            resultado, self.tiempos[nombre] = futuro.result()
+            resultados[nombre] = resultado
+            if nombre in TTL_RECOLECTORES and not es_error(resultado):
+                self._cache[nombre] = (inicio, resultado)
+
+        logging.info("Tiempos de recolección: " + ", ".join(
+            f"{nombre} >{self.timeout} s" if nombre in agotados else f"{nombre} {self.tiempos[nombre]:.2f} s"
+            for nombre in self.recolectores if nombre in agotados or nombre in self.tiempos
+        ) + f" (total {time.monotonic() - inicio:.2f} s)")
+        # Se conserva el orden de los recolectores en los datos enviados
+        return {nombre: resultados[nombre] for nombre in self.recolectores}
+
+    def _ejecutar_recolector(self, nombre):
+        """
+        Ejecuta un recolector y devuelve su resultado (o el error) y su
+        duración.
+        """
+        inicio = time.monotonic()
+        recolector = self.recolectores[nombre]
+        try:
+            if nombre == "perifericos":
+                perifericos = recolector.obtener_info()
+                resultado = [self._generar_id_periferico(p) for p in perifericos]
+            elif nombre == "ram":
+                pc_identifier = self._obtener_id_pc()
+                ram = recolector.obtener_info()
+                resultado = [self._generar_id_local_ram(p, pc_identifier) for p in ram]
+            else:
+                resultado = recolector.obtener_info()
+        except Exception as e:
+            resultado = {"error": str(e)}
+        return resultado, time.monotonic() - inicio
+
+    def _fue_lento(self, futuro):
+        """Indica si una ejecución terminada duró más que el tiempo de espera."""
+        return futuro.result()[1] > self.timeout
+
+    def _obtener_id_pc(self):
+        """
+        Nombre del equipo y serial de la placa madre, consultado una sola vez.
+        El serial solo se lee por WMI en Windows; en el resto de sistemas se
+        usa "UNKNOWN".
+        """
+        if self._id_pc is None:
+            motherboard_serial = "UNKNOWN"
+            if platform.system() == "Windows":
+                c = contexto.obtener_wmi()
+                motherboard_serial = next((board.SerialNumber.strip() for board in c.Win32_BaseBoard()), "UNKNOWN")
+            self._id_pc = f"{platform.node()}_{motherboard_serial}"
+        return self._id_pc
 
+    def cerrar(self):
+        """Libera los hilos de recolección."""
+        self._ejecutor.shutdown(wait=False)
 
     def _generar_id_local_ram(self, ram, motherboard_serial):
         """
@@ -1,7 +1,7 @@
 import platform
 import psutil
-import subprocess
 import re
+from ..core.contexto import obtener_wmi, salida_comando
 
 class RecolectorCPU:
     def obtener_info(self):
@@ -27,8 +27,7 @@ class RecolectorCPU:
     def _obtener_info_windows(self):
         """Obtiene información detallada del CPU en Windows usando WMI"""
         try:
-            import wmi
-            c = wmi.WMI()
+            c = obtener_wmi()
             cpu = c.Win32_Processor()[0]  # Tomamos el primer procesador
             
             return {
@@ -106,7 +105,7 @@ class RecolectorCPU:
     def _obtener_frecuencia_max_linux(self):
         """Obtiene la frecuencia máxima del CPU en Linux"""
         try:
-            output = subprocess.check_output("lscpu", shell=True, text=True)
+            output = salida_comando("lscpu")
             for line in output.splitlines():
                 if "CPU max MHz" in line:
                     return line.split(":")[1].strip()
@@ -128,7 +127,7 @@ class RecolectorCPU:
     def _obtener_cache_linux(self, nivel):
         """Obtiene tamaño de caché específico en Linux"""
         try:
-            output = subprocess.check_output(f"lscpu", shell=True, text=True)
+            output = salida_comando("lscpu")
             for line in output.splitlines():
                 if f"{nivel} cache" in line:
                     size = line.split(":")[1].strip()
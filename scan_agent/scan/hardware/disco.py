@@ -3,6 +3,7 @@ import subprocess
 import re
 import psutil
 import json
+from ..core.contexto import obtener_wmi
 
 class RecolectorDiscos:
     def obtener_info(self):
@@ -46,8 +47,7 @@ class RecolectorDiscos:
     def _obtener_info_windows(self):
         """Obtiene información detallada de discos en Windows usando WMI"""
         try:
-            import wmi
-            c = wmi.WMI()
+            c = obtener_wmi()
             discos = []
             
             # Obtener discos físicos
@@ -2,6 +2,7 @@ import platform
 import subprocess
 import re
 import json
+from ..core.contexto import obtener_wmi
 
 class RecolectorGPU:
     def obtener_info(self):
@@ -26,8 +27,7 @@ class RecolectorGPU:
     def _obtener_info_windows(self):
         """Obtiene información de GPU en Windows usando WMI"""
         try:
-            import wmi
-            c = wmi.WMI()
+            c = obtener_wmi()
             gpus = []
             
             # Obtener adaptadores de video
@@ -1,6 +1,7 @@
 import platform
 import subprocess
 import re
+from ..core.contexto import obtener_wmi
 
 class RecolectorPlacaMadre:
     def obtener_info(self):
@@ -18,8 +19,7 @@ class RecolectorPlacaMadre:
         }
 
     def _obtener_info_windows(self):
-        import wmi
-        c = wmi.WMI()
+        c = obtener_wmi()
         
         info = {}
         
@@ -2,6 +2,7 @@ import psutil
 import platform
 import subprocess
 import re
+from ..core.contexto import obtener_wmi
 
 class RecolectorRAM:
     def obtener_info(self):
@@ -20,8 +21,7 @@ class RecolectorRAM:
         }]
 
     def _obtener_info_windows(self):
-        import wmi
-        c = wmi.WMI()
+        c = obtener_wmi()
         modulos = []
         
         
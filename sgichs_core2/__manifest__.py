@@ -8,7 +8,7 @@
     'author': "Tu Nombre",
     'website': "https://www.tuweb.com",
     'category': 'IT/Infrastructure',
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.2.0',
     'depends': ['base', 'mail'],
     'data': [
         'security/ir.model.access.csv',
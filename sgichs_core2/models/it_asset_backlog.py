@@ -33,6 +33,11 @@ class ITAssetBacklog(models.Model):
         tracking=True
     )
     raw_data = fields.Text(string="Datos en Bruto (JSON)")
+    scan_fingerprints = fields.Text(
+        string="Huellas del Escaneo (JSON)",
+        help="Huella de cada sección del último escaneo recibido del agente."
+    )
+    last_scan_date = fields.Datetime(string="Último Escaneo", readonly=True)
     status = fields.Selection(
         [('pending', 'Pendiente de Aprobación'),
          ('processed', 'Procesado'),
@@ -58,7 +63,8 @@ class ITAssetBacklog(models.Model):
                 data = json.loads(vals['raw_data'])
                 
                 # --- Procesar IPs si el módulo de red está instalado ---
-                if hasattr(self, 'ip_ids') and 'red' in data:
+                # (salvo que ya vengan resueltas, p. ej. desde ingest_scan)
+                if hasattr(self, 'ip_ids') and 'red' in data and 'ip_ids' not in vals:
                     ip_address_model = self.env['it.ip.address']
                     ip_ids = []
                     for net_interface in data.get('red', []):
@@ -114,6 +120,115 @@ class ITAssetBacklog(models.Model):
         vals = self._process_incoming_data(vals)
         return super(ITAssetBacklog, self).write(vals)
 
+    # --- INGESTA DESDE EL AGENTE ---
+
+    @api.model
+    def ingest_scan(self, payload):
+        """
+        Punto de entrada único del agente de inventario. Recibe el escaneo
+        completo y, en una sola transacción, actualiza o crea el registro del
+        backlog junto con los registros relacionados que aporten los módulos
+        instalados (componentes, IPs, software).
+
+        Si el agente envía 'fingerprints' ({sección: hash}), el escaneo es
+        parcial: solo incluye las secciones indicadas en 'sections' y sus
+        datos en 'raw_data_update', que se combinan con los ya guardados. Las
+        secciones cuya huella no coincide con la guardada y que no se enviaron
+        se devuelven en 'missing_sections' para que el agente las reenvíe. Un
+        escaneo sin secciones solo registra la fecha del escaneo.
+
+        :param payload: diccionario con 'name', 'description', 'type' y
+            'raw_data', más las listas 'components', 'ips' y 'software'
+        :return: diccionario con los ids resueltos ('backlog_id', ...)
+        """
+        result = {}
+        if not payload.get('name'):
+            raise UserError(_("El escaneo no incluye el identificador único del activo."))
+        backlog = self.search([('name', '=', payload['name'])], limit=1)
+        fingerprints = payload.get('fingerprints')
+        if fingerprints is not None:
+            stored = json.loads(backlog.scan_fingerprints or '{}')
+            sent = set(payload.get('sections', []))
+            missing = sorted(
+                section for section, fingerprint in fingerprints.items()
+                if section not in sent and stored.get(section) != fingerprint
+            )
+            if missing:
+                result['missing_sections'] = missing
+                if not backlog:
+                    # Nada que combinar: se espera al escaneo completo sin
+                    # crear todavía componentes, IPs ni software
+                    return result
+        vals = self._prepare_ingest_vals(payload, result)
+        if fingerprints is not None:
+            accepted = {
+                section: fingerprint for section, fingerprint in fingerprints.items()
+                if section not in missing
+            }
+            vals['scan_fingerprints'] = json.dumps(dict(stored, **accepted), sort_keys=True)
+            if payload.get('raw_data_update'):
+                raw_data = json.loads(backlog.raw_data or '{}')
+                raw_data.update(payload['raw_data_update'])
+                vals['raw_data'] = json.dumps(raw_data, indent=2, default=str)
+        vals['last_scan_date'] = fields.Datetime.now()
+        if backlog:
+            backlog.write(vals)
+        else:
+            backlog = self.create(vals)
+        result['backlog_id'] = backlog.id
+        return result
+
+    @api.model
+    def _prepare_ingest_vals(self, payload, result):
+        """
+        Valores del backlog a partir del escaneo. Los módulos que añaden
+        relaciones al backlog extienden este método para resolver sus
+        registros y añadir sus ids a ``result``.
+        """
+        return {
+            key: payload[key]
+            for key in ('name', 'description', 'type', 'raw_data')
+            if key in payload
+        }
+
+    @api.model
+    def _upsert_records(self, model_name, key_fields, vals_list):
+        """
+        Actualiza o crea en bloque registros identificados por ``key_fields``.
+        Los existentes se buscan con una sola consulta y solo se escriben si
+        algún valor cambia; los que faltan se crean con una sola llamada.
+
+        :return: registros resueltos, sin duplicados
+        """
+        Model = self.env[model_name]
+        vals_by_key = {}
+        for vals in vals_list:
+            key = tuple(vals.get(field) for field in key_fields)
+            if all(key):
+                vals_by_key[key] = vals
+        if not vals_by_key:
+            return Model.browse()
+        domain = [
+            (field, 'in', list({key[index] for key in vals_by_key}))
+            for index, field in enumerate(key_fields)
+        ]
+        records = Model.browse()
+        for record in Model.search(domain):
+            key = tuple(record[field] for field in key_fields)
+            vals = vals_by_key.pop(key, None)
+            if vals is None:
+                continue
+            changes = {
+                field: value for field, value in vals.items()
+                if record._fields[field].convert_to_write(record[field], record) != value
+            }
+            if changes:
+                record.write(changes)
+            records |= record
+        if vals_by_key:
+            records |= Model.create(list(vals_by_key.values()))
+        return records
+
     # --- MÉTODOS DE ACCIÓN ---
     def action_approve(self):
         raise NotImplementedError(_("La lógica de aprobación no está implementada en el core. Instale el módulo correspondiente (ej. sgichs_hardware)."))
@@ -21,6 +21,16 @@ class ITAssetBacklog(models.Model):
     )
     analysis_report = fields.Html(string="Informe de Análisis de Cambios", readonly=True)
 
+    @api.model
+    def _prepare_ingest_vals(self, payload, result):
+        vals = super()._prepare_ingest_vals(payload, result)
+        if 'components' in payload:
+            # Componentes identificados por su número de serie
+            components = self._upsert_records('it.component', ['serial_number'], payload['components'])
+            result['component_ids'] = components.ids
+            vals['components_ids'] = [(6, 0, components.ids)]
+        return vals
+
     @api.depends('name')
     def _compute_existing_hardware(self):
         """Busca si ya existe un hardware con el mismo identificador único (Nº Inventario)."""
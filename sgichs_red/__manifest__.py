@@ -7,7 +7,7 @@
     'author': "Tu Nombre",
     'website': "https://www.tuweb.com",
     'category': 'IT/Infrastructure',
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.1.0',
     'depends': ['sgichs_core2', 'sgichs_hardware'],
     'data': [
         'security/ir.model.access.csv',
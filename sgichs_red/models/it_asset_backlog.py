@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields
+from odoo import models, fields, api
 
 class ITAssetBacklog(models.Model):
     _inherit = 'it.asset.backlog'
@@ -10,4 +10,13 @@ class ITAssetBacklog(models.Model):
         'backlog_id',
         'ip_id',
         string='IPs Detectadas'
-    )
\ No newline at end of file
+    )
+
+    @api.model
+    def _prepare_ingest_vals(self, payload, result):
+        vals = super()._prepare_ingest_vals(payload, result)
+        if 'ips' in payload:
+            ips = self._upsert_records('it.ip.address', ['address'], payload['ips'])
+            result['ip_ids'] = ips.ids
+            vals['ip_ids'] = [(6, 0, ips.ids)]
+        return vals
@@ -4,7 +4,7 @@
     'author': 'Tu Nombre',
     'website': 'https://www.tudominio.com',
     'category': 'IT/Software',
-    'version': '16.0.1.0.0',
+    'version': '16.0.1.1.0',
     'depends': ['sgichs_core2'],
     'data': [
         'security/ir.model.access.csv',
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields
+from odoo import models, fields, api
 
 class ITAssetBacklog(models.Model):
     _inherit = 'it.asset.backlog'
@@ -10,4 +10,14 @@ class ITAssetBacklog(models.Model):
         'backlog_id',
         'software_id',
         string='Software Detectado'
-    )
\ No newline at end of file
+    )
+
+    @api.model
+    def _prepare_ingest_vals(self, payload, result):
+        vals = super()._prepare_ingest_vals(payload, result)
+        if 'software' in payload:
+            # Programas identificados por el par (nombre, versión)
+            software = self._upsert_records('it.asset.software', ['name', 'version'], payload['software'])
+            result['software_ids'] = software.ids
+            vals['software_ids'] = [(6, 0, software.ids)]
+        return vals
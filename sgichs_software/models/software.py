@@ -76,14 +76,15 @@ class Software(models.Model):
             'asset_ref': asset_ref,
         })
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         try:
-            record = super().create(vals)
-            # Operación: Creación (título "Añadido de Software")
-            record._log_incident('info', f"Software creado: {record.name} v{record.version} (subtipo: {record.subtype})", operation='create')
-            _logger.info(f"Software creado exitosamente: {record.name}")
-            return record
+            records = super().create(vals_list)
+            for record in records:
+                # Operación: Creación (título "Añadido de Software")
+                record._log_incident('info', f"Software creado: {record.name} v{record.version} (subtipo: {record.subtype})", operation='create')
+                _logger.info(f"Software creado exitosamente: {record.name}")
+            return records
         except Exception as e:
             _logger.error(f"Error al crear software: {str(e)}")
             raise
@@ -1,11 +1,12 @@
 # Copyright 2022 CreuBlanca
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-import json
-
-from odoo import fields, models
+from odoo import api, fields, models
 from odoo.exceptions import AccessError
 
+# Number of revisions after which the clients are asked for a snapshot
+SNAPSHOT_THRESHOLD = 200
+
 
 class SpreadsheetAbstract(models.AbstractModel):
     _name = "spreadsheet.abstract"
@@ -20,6 +21,9 @@ class SpreadsheetAbstract(models.AbstractModel):
     )
 
     def get_spreadsheet_data(self):
+        """Snapshot of the spreadsheet plus the revisions made since then. A
+        snapshot is requested from the client once the revisions pass the
+        threshold, so that they are folded into a new raw state."""
         self.ensure_one()
         mode = "normal"
         try:
@@ -27,22 +31,68 @@ class SpreadsheetAbstract(models.AbstractModel):
             self.check_access_rule("write")
         except AccessError:
             mode = "readonly"
+        revisions = self._get_spreadsheet_revisions()
         return {
             "name": self.name,
             "spreadsheet_raw": self.spreadsheet_raw,
-            "revisions": [
-                {
-                    "type": revision.type,
-                    "clientId": revision.client_id,
-                    "nextRevisionId": revision.next_revision_id,
-                    "serverRevisionId": revision.server_revision_id,
-                    "commands": json.loads(revision.commands),
-                }
-                for revision in self.spreadsheet_revision_ids
-            ],
+            "revisions": revisions,
             "mode": mode,
+            "snapshot_requested": mode == "normal"
+            and len(revisions) >= self._get_spreadsheet_snapshot_threshold(),
         }
 
+    def _get_spreadsheet_revisions(self):
+        self.ensure_one()
+        Revision = self.env["spreadsheet.oca.revision"].with_context(bin_size=False)
+        return [
+            {
+                "type": revision["type"],
+                "clientId": revision["client_id"],
+                "nextRevisionId": revision["next_revision_id"],
+                "serverRevisionId": revision["server_revision_id"],
+                "commands": Revision._decode_commands(revision),
+            }
+            for revision in Revision.search_read(
+                [("model", "=", self._name), ("res_id", "=", self.id)],
+                [
+                    "type",
+                    "client_id",
+                    "next_revision_id",
+                    "server_revision_id",
+                    "commands",
+                    "commands_data",
+                ],
+                order="id",
+            )
+        ]
+
+    @api.model
+    def _get_spreadsheet_snapshot_threshold(self):
+        return int(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("spreadsheet_oca.snapshot_threshold", SNAPSHOT_THRESHOLD)
+        )
+
+    def _get_spreadsheet_server_revision_id(self):
+        """Id of the last revision accepted by the server"""
+        self.ensure_one()
+        revision = self.env["spreadsheet.oca.revision"].search(
+            [("model", "=", self._name), ("res_id", "=", self.id)],
+            order="id desc",
+            limit=1,
+        )
+        if revision:
+            return revision.next_revision_id
+        return (self.spreadsheet_raw or {}).get("revisionId")
+
+    def _lock_spreadsheet(self):
+        """Serialize the messages of the spreadsheet, so that a snapshot
+        never drops a revision stored meanwhile"""
+        self.env.cr.execute(
+            "SELECT id FROM %s WHERE id = %%s FOR UPDATE" % self._table, (self.id,)
+        )
+
     def open_spreadsheet(self):
         self.ensure_one()
         return {
@@ -55,8 +105,13 @@ class SpreadsheetAbstract(models.AbstractModel):
         self.ensure_one()
         channel = (self.env.cr.dbname, "spreadsheet_oca", self._name, self.id)
         message.update({"res_model": self._name, "res_id": self.id})
+        if message["type"] == "SNAPSHOT":
+            return self._snapshot_spreadsheet(message)
+        result = True
         if message["type"] in ["REVISION_UNDONE", "REMOTE_REVISION", "REVISION_REDONE"]:
-            self.env["spreadsheet.oca.revision"].create(
+            self._lock_spreadsheet()
+            Revision = self.env["spreadsheet.oca.revision"]
+            Revision.create(
                 {
                     "model": self._name,
                     "res_id": self.id,
@@ -64,13 +119,48 @@ class SpreadsheetAbstract(models.AbstractModel):
                     "client_id": message.get("clientId"),
                     "next_revision_id": message["nextRevisionId"],
                     "server_revision_id": message["serverRevisionId"],
-                    "commands": json.dumps(message.get("commands", [])),
+                    "commands_data": Revision._encode_commands(
+                        message.get("commands", [])
+                    ),
                 }
             )
+            threshold = self._get_spreadsheet_snapshot_threshold()
+            count = Revision.search_count(
+                [("model", "=", self._name), ("res_id", "=", self.id)]
+            )
+            if threshold and count % threshold == 0:
+                # The sender folds the revisions into a new snapshot
+                result = {"snapshot_requested": True}
         self.env["bus.bus"]._sendone(channel, "spreadsheet_oca", message)
+        return result
+
+    def _snapshot_spreadsheet(self, message):
+        """Replace the raw data by the snapshot sent by a client and drop the
+        revisions it folds. The snapshot is refused when it was not taken on
+        the last revision accepted by the server."""
+        self.ensure_one()
+        self._lock_spreadsheet()
+        if message["serverRevisionId"] != self._get_spreadsheet_server_revision_id():
+            return False
+        data = dict(message["data"], revisionId=message["nextRevisionId"])
+        self.write({"spreadsheet_raw": data})
+        channel = (self.env.cr.dbname, "spreadsheet_oca", self._name, self.id)
+        self.env["bus.bus"]._sendone(
+            channel,
+            "spreadsheet_oca",
+            {
+                "type": "SNAPSHOT_CREATED",
+                "serverRevisionId": message["serverRevisionId"],
+                "nextRevisionId": message["nextRevisionId"],
+                "res_model": self._name,
+                "res_id": self.id,
+            },
+        )
         return True
 
     def write(self, vals):
         if "spreadsheet_raw" in vals:
-            self.spreadsheet_revision_ids.unlink()
+            self.env["spreadsheet.oca.revision"].search(
+                [("model", "=", self._name), ("res_id", "in", self.ids)]
+            ).unlink()
         return super().write(vals)
@@ -1,7 +1,11 @@
 # Copyright 2022 CreuBlanca
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import fields, models
+import base64
+import json
+import zlib
+
+from odoo import api, fields, models
 
 
 class SpreadsheetOcaRevision(models.Model):
@@ -15,4 +19,23 @@ class SpreadsheetOcaRevision(models.Model):
     client_id = fields.Char()
     server_revision_id = fields.Char()
     next_revision_id = fields.Char()
+    # Plain JSON commands of the revisions stored before compression
     commands = fields.Char()
+    commands_data = fields.Binary(
+        attachment=False, help="zlib compressed JSON commands of the revision"
+    )
+
+    @api.model
+    def _encode_commands(self, commands):
+        return base64.b64encode(zlib.compress(json.dumps(commands).encode("UTF-8")))
+
+    @api.model
+    def _decode_commands(self, values):
+        """Commands of a revision read with ``commands`` and ``commands_data``"""
+        if values.get("commands_data"):
+            return json.loads(
+                zlib.decompress(base64.b64decode(values["commands_data"])).decode(
+                    "UTF-8"
+                )
+            )
+        return json.loads(values.get("commands") or "[]")
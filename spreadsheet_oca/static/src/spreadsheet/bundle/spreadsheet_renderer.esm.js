@@ -43,7 +43,13 @@ class SpreadsheetTransportService {
         }
     }
     sendMessage(message) {
-        this.orm.call(this.model, "send_spreadsheet_message", [[this.res_id], message]);
+        this.orm
+            .call(this.model, "send_spreadsheet_message", [[this.res_id], message])
+            .then((result) => {
+                if (result && result.snapshot_requested && this.onSnapshotRequested) {
+                    this.onSnapshotRequested();
+                }
+            });
     }
     onNewMessage(id, callback) {
         this.listeners.push({id, callback});
@@ -59,6 +65,13 @@ export class SpreadsheetRenderer extends Component {
         this.bus_service = useService("bus_service");
         this.user = useService("user");
         const dataSources = new DataSources(this.orm);
+        const transportService = new SpreadsheetTransportService(
+            this.orm,
+            this.bus_service,
+            this.props.model,
+            this.props.res_id
+        );
+        transportService.onSnapshotRequested = this.snapshot.bind(this);
         this.state = useState({
             dialogDisplayed: false,
             dialogTitle: "Spreadsheet",
@@ -69,12 +82,7 @@ export class SpreadsheetRenderer extends Component {
             migrate(this.props.record.spreadsheet_raw),
             {
                 evalContext: {env: this.env, orm: this.orm},
-                transportService: new SpreadsheetTransportService(
-                    this.orm,
-                    this.bus_service,
-                    this.props.model,
-                    this.props.res_id
-                ),
+                transportService,
                 client: {
                     id: uuidGenerator.uuidv4(),
                     name: this.user.name,
@@ -92,6 +100,9 @@ export class SpreadsheetRenderer extends Component {
             await loadSpreadsheetDependencies();
             await dataSources.waitForAllLoaded();
             await this.env.importData(this.spreadsheet_model);
+            if (this.props.record.snapshot_requested) {
+                this.snapshot();
+            }
         });
         useSetupAction({
             beforeLeave: () => this.onSpreadsheetSaved(),
@@ -101,6 +112,15 @@ export class SpreadsheetRenderer extends Component {
             this.spreadsheet_model.dispatch("EVALUATE_CELLS", {sheetId});
         });
     }
+    /**
+     * Fold the revisions into a new snapshot stored by the server
+     */
+    snapshot() {
+        if (this.props.record.mode === "readonly") {
+            return;
+        }
+        this.spreadsheet_model.session.snapshot(this.spreadsheet_model.exportData());
+    }
     closeDialog() {
         this.state.dialogDisplayed = false;
         this.state.dialogTitle = "Spreadsheet";
@@ -0,0 +1,92 @@
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl.html).
+from bisect import bisect_right
+
+from odoo.tools import float_is_zero
+
+# Positions in the candidate arrays handled by ``fifo_vacuum_match``
+CREATE_DATE, ID, REMAINING_QTY, REMAINING_VALUE, ROUND = range(5)
+
+
+def fifo_vacuum_match(negatives, candidates, rounding, prepare_update=None):
+    """Match the negative layers of one product against its candidates.
+
+    Both sequences are sorted by ``(create_date, id)``. A negative layer can
+    only take from candidates created after it, so a single pointer moving
+    forward over the candidates is enough: everything behind it is either
+    too old for the next negative layers or already exhausted.
+
+    :param negatives: ``(create_date, id, qty_to_take)`` tuples
+    :param candidates: mutable ``[create_date, id, remaining_qty,
+        remaining_value, round]`` lists, ``round`` being the currency
+        rounding function of the layer. They are updated in place.
+    :param rounding: rounding of the product unit of measure
+    :param prepare_update: optional callable receiving ``(negative_id,
+        candidate_id, qty_taken, value_taken, candidate_vals)`` and
+        returning the values to write on the candidate
+    :return: list of ``(negative_id, qty_taken, value_taken, taken_data,
+        candidate_vals)``, ``candidate_vals`` mapping the id of every touched
+        candidate to the values to write on it
+    """
+    keys = [(candidate[CREATE_DATE], candidate[ID]) for candidate in candidates]
+    count = len(candidates)
+    start = 0
+    result = []
+    for create_date, negative_id, qty_to_take in negatives:
+        start = max(start, bisect_right(keys, (create_date, negative_id)))
+        while start < count and not candidates[start][REMAINING_QTY] > 0:
+            start += 1
+        if start == count:
+            break
+        qty_taken_on_candidates = 0
+        tmp_value = 0
+        taken_data = {}
+        candidate_vals = {}
+        for index in range(start, count):
+            candidate = candidates[index]
+            if not candidate[REMAINING_QTY] > 0:
+                continue
+            qty_taken_on_candidate = min(candidate[REMAINING_QTY], qty_to_take)
+            qty_taken_on_candidates += qty_taken_on_candidate
+            candidate_unit_cost = candidate[REMAINING_VALUE] / candidate[REMAINING_QTY]
+            value_taken_on_candidate = candidate[ROUND](
+                qty_taken_on_candidate * candidate_unit_cost
+            )
+            taken_data[candidate[ID]] = {
+                "quantity": qty_taken_on_candidate,
+                "value": value_taken_on_candidate,
+            }
+            vals = {
+                "remaining_qty": candidate[REMAINING_QTY] - qty_taken_on_candidate,
+                "remaining_value": candidate[REMAINING_VALUE]
+                - value_taken_on_candidate,
+            }
+            if prepare_update:
+                vals = prepare_update(
+                    negative_id,
+                    candidate[ID],
+                    qty_taken_on_candidate,
+                    value_taken_on_candidate,
+                    vals,
+                )
+            candidate[REMAINING_QTY] = vals.get(
+                "remaining_qty", candidate[REMAINING_QTY]
+            )
+            candidate[REMAINING_VALUE] = vals.get(
+                "remaining_value", candidate[REMAINING_VALUE]
+            )
+            candidate_vals[candidate[ID]] = vals
+
+            qty_to_take -= qty_taken_on_candidate
+            tmp_value += value_taken_on_candidate
+            if float_is_zero(qty_to_take, precision_rounding=rounding):
+                break
+        result.append(
+            (
+                negative_id,
+                qty_taken_on_candidates,
+                tmp_value,
+                taken_data,
+                candidate_vals,
+            )
+        )
+    return result
@@ -9,6 +9,8 @@ from odoo.tools import float_is_zero
 from odoo.addons.stock_account.models.product import ProductProduct
 from odoo.addons.stock_account.models.stock_move import StockMove
 
+from .fifo_vacuum import fifo_vacuum_match
+
 
 # flake8: noqa: C901
 def post_load_hook():
@@ -128,161 +130,148 @@ def post_load_hook():
         if company is None:
             company = self.env.company
         ValuationLayer = self.env["stock.valuation.layer"]
-        svls_to_vacuum_by_product = defaultdict(lambda: ValuationLayer)
-        res = ValuationLayer.sudo().read_group(
+        # Work on plain (create_date, id, quantities) arrays instead of
+        # records: see fifo_vacuum_match
+        negatives_by_product = defaultdict(list)
+        negative_rows = ValuationLayer.sudo().search_read(
             [
                 ("product_id", "in", self.ids),
                 ("remaining_qty", "<", 0),
                 ("stock_move_id", "!=", False),
                 ("company_id", "=", company.id),
             ],
-            ["ids:array_agg(id)", "create_date:min"],
-            ["product_id"],
-            orderby="create_date, id",
+            ["product_id", "create_date", "remaining_qty"],
+            order="create_date, id",
         )
+        if not negative_rows:
+            return
         min_create_date = datetime.max
-        for group in res:
-            svls_to_vacuum_by_product[group["product_id"][0]] = ValuationLayer.browse(
-                group["ids"]
+        for row in negative_rows:
+            negatives_by_product[row["product_id"][0]].append(
+                (row["create_date"], row["id"], abs(row["remaining_qty"]))
             )
-            min_create_date = min(min_create_date, group["create_date"])
-        all_candidates_by_product = defaultdict(lambda: ValuationLayer)
+            min_create_date = min(min_create_date, row["create_date"])
         domain = [
-            ("product_id", "in", self.ids),
+            ("product_id", "in", list(negatives_by_product)),
             ("remaining_qty", ">", 0),
             ("company_id", "=", company.id),
             ("create_date", ">=", min_create_date),
         ]
         if self.env.context.get("use_past_svl", False):
             domain = domain[:2]
-        res = ValuationLayer.sudo().read_group(
+        candidates_by_product = defaultdict(list)
+        rounding_by_company = {}
+        for row in ValuationLayer.sudo().search_read(
             domain,
-            ["ids:array_agg(id)"],
-            ["product_id"],
-            orderby="id",
-        )
-        for group in res:
-            all_candidates_by_product[group["product_id"][0]] = ValuationLayer.browse(
-                group["ids"]
+            [
+                "product_id",
+                "company_id",
+                "create_date",
+                "remaining_qty",
+                "remaining_value",
+            ],
+            order="create_date, id",
+        ):
+            company_id = row["company_id"][0]
+            if company_id not in rounding_by_company:
+                rounding_by_company[company_id] = (
+                    self.env["res.company"].browse(company_id).currency_id.round
+                )
+            candidates_by_product[row["product_id"][0]].append(
+                [
+                    row["create_date"],
+                    row["id"],
+                    row["remaining_qty"],
+                    row["remaining_value"],
+                    rounding_by_company[company_id],
+                ]
+            )
+
+        def prepare_update(negative_id, candidate_id, qty, value, vals):
+            return self._run_fifo_vacuum_prepare_candidate_update(
+                ValuationLayer.browse(negative_id),
+                ValuationLayer.browse(candidate_id),
+                qty,
+                value,
+                vals,
             )
 
         new_svl_vals_real_time = []
         new_svl_vals_manual = []
         real_time_svls_to_vacuum = ValuationLayer
-
+        candidate_vals = {}
+        vacuumed = []
         for product in self:
-            all_candidates = all_candidates_by_product[product.id]
-            current_real_time_svls = ValuationLayer
-            for svl_to_vacuum in svls_to_vacuum_by_product[product.id]:
-                # We don't use search to avoid executing _flush_search and to decrease interaction with DB
-                candidates = all_candidates.filtered(
-                    lambda r: r.create_date > svl_to_vacuum.create_date
-                    or r.create_date == svl_to_vacuum.create_date
-                    and r.id > svl_to_vacuum.id
+            matches = fifo_vacuum_match(
+                negatives_by_product[product.id],
+                candidates_by_product[product.id],
+                product.uom_id.rounding,
+                prepare_update,
+            )
+            for negative_id, qty_taken, tmp_value, taken_data, vals in matches:
+                for candidate_id, candidate_update in vals.items():
+                    candidate_vals.setdefault(candidate_id, {}).update(candidate_update)
+                vacuumed.append(
+                    (product, negative_id, qty_taken, tmp_value, taken_data)
                 )
-                if not candidates:
-                    break
-                qty_to_take_on_candidates = abs(svl_to_vacuum.remaining_qty)
-                qty_taken_on_candidates = 0
-                tmp_value = 0
-                taken_data = {}
-                for candidate in candidates:
-                    qty_taken_on_candidate = min(
-                        candidate.remaining_qty, qty_to_take_on_candidates
-                    )
-                    qty_taken_on_candidates += qty_taken_on_candidate
-
-                    taken_data[candidate.id] = {"quantity": qty_taken_on_candidate}
-
-                    candidate_unit_cost = (
-                        candidate.remaining_value / candidate.remaining_qty
-                    )
-                    value_taken_on_candidate = (
-                        qty_taken_on_candidate * candidate_unit_cost
-                    )
-                    value_taken_on_candidate = candidate.currency_id.round(
-                        value_taken_on_candidate
-                    )
-
-                    taken_data[candidate.id].update(
-                        {
-                            "value": value_taken_on_candidate,
-                        }
-                    )
 
-                    new_remaining_value = (
-                        candidate.remaining_value - value_taken_on_candidate
-                    )
-
-                    candidate_vals = {
-                        "remaining_qty": candidate.remaining_qty
-                        - qty_taken_on_candidate,
-                        "remaining_value": new_remaining_value,
-                    }
-                    # Start Hook
-                    candidate_vals = self._run_fifo_vacuum_prepare_candidate_update(
-                        svl_to_vacuum,
-                        candidate,
-                        qty_taken_on_candidate,
-                        value_taken_on_candidate,
-                        candidate_vals,
-                    )
-                    # End Hook
-                    candidate.write(candidate_vals)
-                    if not (candidate.remaining_qty > 0):
-                        all_candidates -= candidate
-
-                    qty_to_take_on_candidates -= qty_taken_on_candidate
-                    tmp_value += value_taken_on_candidate
-                    if float_is_zero(
-                        qty_to_take_on_candidates,
-                        precision_rounding=product.uom_id.rounding,
-                    ):
-                        break
+        # Update the candidates in bulk: exhausted layers share the same
+        # remaining values and are written together.
+        candidate_ids_by_vals = defaultdict(list)
+        for candidate_id, vals in candidate_vals.items():
+            if set(vals) == {"remaining_qty", "remaining_value"}:
+                key = (vals["remaining_qty"], vals["remaining_value"])
+                candidate_ids_by_vals[key].append(candidate_id)
+            else:
+                ValuationLayer.browse(candidate_id).write(vals)
+        for (
+            remaining_qty,
+            remaining_value,
+        ), candidate_ids in candidate_ids_by_vals.items():
+            ValuationLayer.browse(candidate_ids).write(
+                {"remaining_qty": remaining_qty, "remaining_value": remaining_value}
+            )
 
-                # Get the estimated value we will correct.
-                remaining_value_before_vacuum = (
-                    svl_to_vacuum.unit_cost * qty_taken_on_candidates
-                )
-                new_remaining_qty = (
-                    svl_to_vacuum.remaining_qty + qty_taken_on_candidates
-                )
-                corrected_value = remaining_value_before_vacuum - tmp_value
-                svl_to_vacuum.with_context(taken_data=taken_data).write(
-                    {
-                        "remaining_qty": new_remaining_qty,
-                    }
-                )
+        for product, negative_id, qty_taken, tmp_value, taken_data in vacuumed:
+            svl_to_vacuum = ValuationLayer.browse(negative_id)
+            # Get the estimated value we will correct.
+            remaining_value_before_vacuum = svl_to_vacuum.unit_cost * qty_taken
+            new_remaining_qty = svl_to_vacuum.remaining_qty + qty_taken
+            corrected_value = remaining_value_before_vacuum - tmp_value
+            svl_to_vacuum.with_context(taken_data=taken_data).write(
+                {
+                    "remaining_qty": new_remaining_qty,
+                }
+            )
 
-                # Don't create a layer or an accounting entry if the corrected value is zero.
-                if svl_to_vacuum.currency_id.is_zero(corrected_value):
-                    continue
+            # Don't create a layer or an accounting entry if the corrected value is zero.
+            if svl_to_vacuum.currency_id.is_zero(corrected_value):
+                continue
 
-                corrected_value = svl_to_vacuum.currency_id.round(corrected_value)
+            corrected_value = svl_to_vacuum.currency_id.round(corrected_value)
 
-                move = svl_to_vacuum.stock_move_id
-                new_svl_vals = (
-                    new_svl_vals_real_time
-                    if product.valuation == "real_time"
-                    else new_svl_vals_manual
-                )
-                new_svl_vals.append(
-                    {
-                        "product_id": product.id,
-                        "value": corrected_value,
-                        "unit_cost": 0,
-                        "quantity": 0,
-                        "remaining_qty": 0,
-                        "stock_move_id": move.id,
-                        "company_id": move.company_id.id,
-                        "description": "Revaluation of %s (negative inventory)"
-                        % (move.picking_id.name or move.name),
-                        "stock_valuation_layer_id": svl_to_vacuum.id,
-                    }
-                )
-                if product.valuation == "real_time":
-                    current_real_time_svls |= svl_to_vacuum
-            real_time_svls_to_vacuum |= current_real_time_svls
+            move = svl_to_vacuum.stock_move_id
+            new_svl_vals = (
+                new_svl_vals_real_time
+                if product.valuation == "real_time"
+                else new_svl_vals_manual
+            )
+            new_svl_vals.append(
+                {
+                    "product_id": product.id,
+                    "value": corrected_value,
+                    "unit_cost": 0,
+                    "quantity": 0,
+                    "remaining_qty": 0,
+                    "stock_move_id": move.id,
+                    "company_id": move.company_id.id,
+                    "description": "Revaluation of %s (negative inventory)"
+                    % (move.picking_id.name or move.name),
+                    "stock_valuation_layer_id": svl_to_vacuum.id,
+                }
+            )
+            if product.valuation == "real_time":
+                real_time_svls_to_vacuum |= svl_to_vacuum
         ValuationLayer.sudo().create(new_svl_vals_manual)
         vacuum_svls = ValuationLayer.sudo().create(new_svl_vals_real_time)
 
@@ -0,0 +1 @@
+from . import test_fifo_vacuum
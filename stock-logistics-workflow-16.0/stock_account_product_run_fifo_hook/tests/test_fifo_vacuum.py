@@ -0,0 +1,85 @@
+# License LGPL-3.0 or later (https://www.gnu.org/licenses/lgpl.html).
+import logging
+import time
+from datetime import datetime, timedelta
+
+from odoo.tests.common import TransactionCase
+
+from ..fifo_vacuum import REMAINING_QTY, REMAINING_VALUE, fifo_vacuum_match
+
+_logger = logging.getLogger(__name__)
+
+
+def _round(value):
+    return round(value, 2)
+
+
+class TestFifoVacuum(TransactionCase):
+    def _history(self, size):
+        """Synthetic layer history alternating an out move of 3 units
+        (negative stock) and an in move of 2 units at a growing cost"""
+        start = datetime(2020, 1, 1)
+        negatives = []
+        candidates = []
+        for index in range(size):
+            date = start + timedelta(minutes=index)
+            negatives.append((date, 2 * index + 1, 3.0))
+            candidates.append([date, 2 * index + 2, 2.0, 2.0 * (10 + index), _round])
+        return negatives, candidates
+
+    def test_match_respects_dates(self):
+        date = datetime(2020, 1, 1)
+        later = date + timedelta(days=1)
+        negatives = [(date, 2, 5.0), (later, 4, 1.0)]
+        candidates = [
+            [date, 1, 10.0, 100.0, _round],  # Older than the first negative
+            [date, 3, 4.0, 20.0, _round],
+            [later, 5, 2.0, 12.0, _round],
+        ]
+        result = fifo_vacuum_match(negatives, candidates, 0.01)
+        self.assertEqual(len(result), 2)
+        negative_id, qty_taken, value, taken_data, vals = result[0]
+        self.assertEqual(negative_id, 2)
+        self.assertEqual(qty_taken, 5.0)
+        self.assertEqual(value, 26.0)
+        self.assertEqual(set(taken_data), {3, 5})
+        self.assertEqual(vals[3], {"remaining_qty": 0.0, "remaining_value": 0.0})
+        self.assertEqual(vals[5], {"remaining_qty": 1.0, "remaining_value": 6.0})
+        # The second negative only sees the candidate created after it
+        negative_id, qty_taken, value, taken_data, vals = result[1]
+        self.assertEqual((negative_id, qty_taken, value), (4, 1.0, 6.0))
+        self.assertEqual(set(taken_data), {5})
+        self.assertEqual(candidates[0][REMAINING_QTY], 10.0)
+        self.assertEqual(candidates[2][REMAINING_QTY], 0.0)
+
+    def test_match_hook(self):
+        date = datetime(2020, 1, 1)
+        calls = []
+
+        def prepare_update(negative_id, candidate_id, qty, value, vals):
+            calls.append((negative_id, candidate_id, qty, value))
+            return dict(vals, remaining_value=0.0)
+
+        candidates = [[date, 2, 4.0, 40.0, _round]]
+        fifo_vacuum_match([(date, 1, 1.0)], candidates, 0.01, prepare_update)
+        self.assertEqual(calls, [(1, 2, 1.0, 10.0)])
+        self.assertEqual(candidates[0][REMAINING_VALUE], 0.0)
+
+    def test_match_benchmark(self):
+        """Matching must stay linear on long layer histories"""
+        timings = []
+        for size in (2000, 20000):
+            negatives, candidates = self._history(size)
+            start = time.perf_counter()
+            result = fifo_vacuum_match(negatives, candidates, 0.01)
+            timings.append(time.perf_counter() - start)
+            # Every in move ends up taken by the negatives created before it
+            self.assertEqual(sum(row[1] for row in result), 2.0 * size)
+            self.assertFalse(any(c[REMAINING_QTY] for c in candidates))
+        _logger.info(
+            "FIFO vacuum matching: %d layers in %.3fs, %d layers in %.3fs",
+            2000,
+            timings[0],
+            20000,
+            timings[1],
+        )
@@ -21,7 +21,7 @@
 #############################################################################
 
 import datetime
-from dateutil.relativedelta import relativedelta
+import threading
 from odoo import _, api, models, fields,Command, SUPERUSER_ID
 from odoo.exceptions import UserError
 
@@ -90,6 +90,10 @@ class SubscriptionPackage(models.Model):
     _rec_name = 'name'
     _inherit = ['mail.thread', 'mail.activity.mixin']
 
+    # Number of subscriptions (or partners, when invoicing) handled between
+    # two commits of the billing run
+    _billing_run_batch_size = 500
+
     @api.model
     def _read_group_stage_ids(self, categories, domain, order):
         """ Read all the stages and display it in the kanban view,
@@ -311,77 +315,156 @@ class SubscriptionPackage(models.Model):
         """ Button to close subscription package """
         stage = self.env['subscription.package.stage'].search(
             [('category', '=', 'closed')], limit=1).id
-        for sub in self:
-            values = {'stage_id': stage, 'to_renew': False}
-            sub.write(values)
+        self.write({'stage_id': stage, 'to_renew': False})
         return True
 
     @api.model
     def close_limit_cron(self):
-        """ It Checks renew date, close date. It will send mail when renew date """
-        pending_subscriptions = self.env['subscription.package'].search(
-            [('stage_category', '=', 'progress')])
+        """ Daily billing run: it refreshes close dates, queues renewal
+        alerts, invoices due subscriptions per partner and closes the
+        expired ones. Every step selects its subscriptions with SQL and
+        commits per chunk, so an interrupted run can simply be restarted."""
         today_date = fields.Date.today()
-        pending_subscription = False
-        close_subscription = False
-        subscriptions_to_invoice_by_partner = dict()
-        for pending_subscription in pending_subscriptions:
-            if pending_subscription.start_date:
-                pending_subscription.close_date = pending_subscription.start_date + relativedelta(
-                    days=pending_subscription.plan_id.days_to_end)
-            difference = (pending_subscription.close_date -
-                          pending_subscription.start_date).days / 10
-            renew_date = pending_subscription.close_date - relativedelta(
-                days=difference)
-            if today_date == renew_date:
-                pending_subscription.to_renew = True
-                self.env.ref(
-                    'subscription_package.mail_template_subscription_renew').send_mail(
-                    pending_subscription.id, force_send=True)
-                pending_subscription.write({'to_renew': False,
-                                            'start_date': fields.Date.today()})    
-            if pending_subscription.next_invoice_date <= today_date:                
-                if pending_subscription.plan_id.invoice_mode == 'draft_invoice':
-                    this_products_line = []
-                    for rec in pending_subscription.product_line_ids:
-                        rec_list = Command.create({'product_id': rec.product_id.id,
-                                           'quantity': 1, 'sale_line_ids': [Command.set(rec.order_line_id.mapped('id'))]})                                          
-                        this_products_line.append(rec_list)
-                    
-                    invoice_partner = pending_subscription.partner_id 
-                    if not invoice_partner.id in subscriptions_to_invoice_by_partner:
-                        subscriptions_to_invoice_by_partner[invoice_partner.id] = dict(subscriptions=pending_subscription, lines=this_products_line, currency=pending_subscription.partner_id.currency_id.id)
-                    else:
-                        subscriptions_to_invoice_by_partner[invoice_partner.id]['subscriptions'] |=  pending_subscription
-                        subscriptions_to_invoice_by_partner[invoice_partner.id]['lines'] += this_products_line
-                        
-        for partner_id, invoice_data in subscriptions_to_invoice_by_partner.items():
-            subscriptions = invoice_data.get('subscriptions')
-            self.env['account.move'].create(
-                {
+        self._billing_run_update_close_date()
+        self._billing_run_renew(today_date)
+        self._billing_run_invoice(today_date)
+        self._billing_run_close(today_date)
+        return True
+
+    def _billing_run_commit(self):
+        """ Commit the current chunk, except when running tests """
+        if not getattr(threading.current_thread(), 'testing', False):
+            self.env.cr.commit()  # pylint: disable=invalid-commit
+
+    def _billing_run_split(self, ids):
+        """ Split a list of ids in chunks of ``_billing_run_batch_size`` """
+        size = self._billing_run_batch_size
+        for index in range(0, len(ids), size):
+            yield ids[index:index + size]
+
+    def _billing_run_update_close_date(self):
+        """ Set the close date of every running subscription from its start
+        date and the plan duration in a single statement """
+        self.flush_model(['start_date', 'plan_id', 'stage_category'])
+        self.env['subscription.package.plan'].flush_model(['days_to_end'])
+        self.env.cr.execute("""
+            WITH target AS (
+                SELECT sp.id,
+                       sp.start_date + COALESCE(plan.days_to_end, 0)
+                           AS close_date
+                  FROM subscription_package sp
+             LEFT JOIN subscription_package_plan plan
+                       ON plan.id = sp.plan_id
+                 WHERE sp.stage_category = 'progress'
+                   AND sp.start_date IS NOT NULL
+            )
+            UPDATE subscription_package sp
+               SET close_date = target.close_date
+              FROM target
+             WHERE sp.id = target.id
+               AND sp.close_date IS DISTINCT FROM target.close_date
+        """)
+        self.invalidate_model(['close_date'])
+
+    def _billing_run_renew(self, today_date):
+        """ Queue the renewal alert of the subscriptions reaching their renew
+        date (the last tenth of the plan duration) and restart them """
+        self.flush_model(['start_date', 'plan_id', 'stage_category'])
+        self.env.cr.execute("""
+            SELECT sp.id
+              FROM subscription_package sp
+         LEFT JOIN subscription_package_plan plan ON plan.id = sp.plan_id
+             WHERE sp.stage_category = 'progress'
+               AND sp.start_date IS NOT NULL
+               AND sp.start_date + COALESCE(plan.days_to_end, 0)
+                   - COALESCE(plan.days_to_end, 0) / 10 = %s
+          ORDER BY sp.id
+        """, (today_date,))
+        renew_ids = [row[0] for row in self.env.cr.fetchall()]
+        template = self.env.ref(
+            'subscription_package.mail_template_subscription_renew')
+        for chunk_ids in self._billing_run_split(renew_ids):
+            subscriptions = self.browse(chunk_ids)
+            for subscription in subscriptions:
+                template.send_mail(subscription.id, force_send=False)
+            subscriptions.write({'to_renew': False, 'start_date': today_date})
+            self._billing_run_commit()
+
+    def _billing_run_invoice(self, today_date):
+        """ Create one draft invoice per partner for the subscriptions whose
+        next invoice date is reached, then move that date one period ahead """
+        self.flush_model(['next_invoice_date', 'partner_id', 'plan_id',
+                          'stage_category'])
+        self.env.cr.execute("""
+            SELECT sp.partner_id, ARRAY_AGG(sp.id ORDER BY sp.id)
+              FROM subscription_package sp
+              JOIN subscription_package_plan plan ON plan.id = sp.plan_id
+             WHERE sp.stage_category = 'progress'
+               AND sp.partner_id IS NOT NULL
+               AND sp.next_invoice_date <= %s
+               AND plan.invoice_mode = 'draft_invoice'
+          GROUP BY sp.partner_id
+          ORDER BY sp.partner_id
+        """, (today_date,))
+        partner_groups = self.env.cr.fetchall()
+        size = self._billing_run_batch_size
+        for index in range(0, len(partner_groups), size):
+            chunk = partner_groups[index:index + size]
+            subscriptions = self.browse(
+                [sub_id for dummy, sub_ids in chunk for sub_id in sub_ids])
+            partners = self.env['res.partner'].browse(
+                [partner_id for partner_id, dummy in chunk])
+            currencies = {partner.id: partner.currency_id.id
+                          for partner in partners}
+            vals_list = []
+            for partner_id, sub_ids in chunk:
+                partner_subscriptions = self.browse(sub_ids)
+                lines = [Command.create({
+                    'product_id': line.product_id.id,
+                    'quantity': 1,
+                    'sale_line_ids': [Command.set(line.order_line_id.ids)],
+                }) for line in partner_subscriptions.product_line_ids]
+                vals_list.append({
                     'move_type': 'out_invoice',
-                    'date': fields.Date.today(),
+                    'date': today_date,
                     'is_subscription': True,
-                    'subscription_ids': [Command.set(subscriptions.ids)],
-                    'invoice_date': fields.Date.today(), 
+                    'subscription_ids': [Command.set(sub_ids)],
+                    'invoice_date': today_date,
                     'state': 'draft',
                     'partner_id': partner_id,
-                    #'team_id': partner_id.team_id,
-                    'currency_id': invoice_data.get('currency'),
-                    'invoice_line_ids': invoice_data.get('lines')
+                    'currency_id': currencies[partner_id],
+                    'invoice_line_ids': lines,
                 })
-            
-            for subscription in subscriptions:
-                subscription.next_invoice_date = subscription.next_invoice_date + relativedelta(days=subscription.plan_id.renewal_time)
-
-        close_subscriptions = self.env['subscription.package'].search(
-            [('stage_category', '=', 'progress'), ('to_renew', '=', True)])
-        for close_subscription in close_subscriptions:
-            close_subscription.close_date = close_subscription.start_date + relativedelta(
-                days=close_subscription.plan_id.days_to_end)
-            if today_date >= close_subscription.close_date:
-                close_subscription.set_close()
-        return True
+            self.env['account.move'].create(vals_list)
+            self.env.cr.execute("""
+                UPDATE subscription_package sp
+                   SET next_invoice_date = sp.next_invoice_date
+                       + COALESCE(plan.renewal_time, 0)
+                  FROM subscription_package_plan plan
+                 WHERE plan.id = sp.plan_id
+                   AND sp.id IN %s
+            """, (tuple(subscriptions.ids),))
+            self.invalidate_model(['next_invoice_date'])
+            self._billing_run_commit()
+
+    def _billing_run_close(self, today_date):
+        """ Close the subscriptions flagged to renew whose close date is
+        over """
+        self.flush_model(['start_date', 'plan_id', 'stage_category',
+                          'to_renew'])
+        self.env.cr.execute("""
+            SELECT sp.id
+              FROM subscription_package sp
+         LEFT JOIN subscription_package_plan plan ON plan.id = sp.plan_id
+             WHERE sp.stage_category = 'progress'
+               AND sp.to_renew
+               AND sp.start_date + COALESCE(plan.days_to_end, 0) <= %s
+          ORDER BY sp.id
+        """, (today_date,))
+        close_ids = [row[0] for row in self.env.cr.fetchall()]
+        for chunk_ids in self._billing_run_split(close_ids):
+            self.browse(chunk_ids).set_close()
+            self._billing_run_commit()
 
     @api.depends('product_line_ids.total_amount')
     def _compute_total_recurring_price(self):